@@ -1,8 +1,12 @@
-import os
+import ast
 import sys
 import logging
+import argparse
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from code_analyzer.utils.parallel import DEFAULT_CHUNK_SIZE, iter_chunk_results
+from code_analyzer.utils.discovery import DiscoveryService
+from code_analyzer.utils.ignore import IgnoreMatcher, load_ignore_matcher
 
 # Set up logging
 logging.basicConfig(
@@ -15,12 +19,74 @@ def get_current_directory() -> Path:
     """Get the directory where the script is being run from."""
     return Path.cwd()
 
-def analyze_directory(directory_path: Path) -> bool:
+# Hidden files and directories; the directory's .codeA.ignore is applied after
+HIDDEN_PATTERNS = [".*"]
+
+def iter_directory_files(directory_path: Path, matcher: Optional[IgnoreMatcher] = None) -> Iterator[str]:
+    """Yield files under a directory, pruning hidden and ignored directories."""
+    matcher = matcher or load_ignore_matcher(directory_path, HIDDEN_PATTERNS)
+    for file in matcher.walk(directory_path):
+        yield str(file)
+
+def analyze_file(file_path: str) -> Dict[str, Any]:
+    """
+    Analyze a single file.
+    
+    Args:
+        file_path: Path of the file to analyze
+        
+    Returns:
+        Dict with size and line counts, plus structure counts for Python files
+    """
+    result: Dict[str, Any] = {"file": file_path, "status": "completed"}
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        result["size"] = len(raw)
+        result["lines"] = raw.count(b"\n")
+
+        if file_path.endswith('.py'):
+            tree = ast.parse(raw)
+            counts = {"classes": 0, "functions": 0, "imports": 0}
+            for node in ast.walk(tree):
+                if isinstance(node, ast.ClassDef):
+                    counts["classes"] += 1
+                elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    counts["functions"] += 1
+                elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                    counts["imports"] += 1
+            result.update(counts)
+
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+
+    return result
+
+def analyze_files(file_paths: List[str]) -> List[Dict[str, Any]]:
+    """Analyze a chunk of files; runs inside a worker process."""
+    return [analyze_file(path) for path in file_paths]
+
+def analyze_directory(
+    directory_path: Path,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+    changed_only: bool = False
+) -> bool:
     """
     Analyze the contents of the given directory.
     
+    Files are fanned out to a process pool in chunks and results are
+    streamed back as each chunk finishes.
+    
     Args:
         directory_path: Path object pointing to directory to analyze
+        workers: Number of worker processes (defaults to CPU count)
+        chunk_size: Number of files sent to a worker at a time
+        on_result: Optional callback invoked with each file result
+        changed_only: Only analyze files added or changed since the last such
+            run; files that fail are analyzed again next time
         
     Returns:
         bool: True if analysis successful, False otherwise
@@ -34,18 +100,37 @@ def analyze_directory(directory_path: Path) -> bool:
             logger.error(f"Path is not a directory: {directory_path}")
             return False
 
-        # Walk through the directory
-        for root, dirs, files in os.walk(directory_path):
-            root_path = Path(root)
-            logger.info(f"Analyzing {root_path}...")
-            
-            # Filter out hidden directories
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                if not file.startswith('.'):
-                    logger.info(f"Processing file: {file}")
-                    # Add your analysis logic here
+        processed = 0
+        failed = 0
+        discovery = None
+        if changed_only:
+            discovery = DiscoveryService(directory_path,
+                                         load_ignore_matcher(directory_path, HIDDEN_PATTERNS))
+            diff = discovery.changes()
+            logger.info(f"{len(diff.modified)} files added or changed, {len(diff.deleted)} deleted")
+            files = [str(info.path) for info in diff.modified]
+        else:
+            files = iter_directory_files(directory_path)
+
+        succeeded = []
+        try:
+            for result in iter_chunk_results(analyze_files, files, workers, chunk_size):
+                processed += 1
+                if result["status"] == "failed":
+                    failed += 1
+                    logger.debug(f"Failed to process {result['file']}: {result['error']}")
+                else:
+                    succeeded.append(result["file"])
+                    logger.debug(f"Processed file: {result['file']}")
+
+                if on_result:
+                    on_result(result)
+        finally:
+            # Record only what was analyzed, even if the run stops early
+            if discovery is not None:
+                discovery.commit(diff, succeeded)
+
+        logger.info(f"Processed {processed} files ({failed} failed)")
                     
     except Exception as e:
         logger.error(f"Error analyzing directory: {e}", exc_info=True)
@@ -53,14 +138,30 @@ def analyze_directory(directory_path: Path) -> bool:
         
     return True
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Analyze a directory')
+    parser.add_argument('path', nargs='?', default=None,
+                        help='Directory to analyze (default: current directory)')
+    parser.add_argument('--workers', '-w', type=int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f'Files per worker batch (default: {DEFAULT_CHUNK_SIZE})')
+    parser.add_argument('--changed', action='store_true',
+                        help='Only analyze files added or changed since the last --changed run')
+    return parser.parse_args(argv)
+
 def main() -> None:
+    args = parse_args()
     try:
-        # Get the current working directory
-        current_dir = get_current_directory()
+        # Analyze the requested path or the current working directory
+        current_dir = Path(args.path) if args.path else get_current_directory()
         logger.info(f"Starting analysis in: {current_dir}")
         
         # Run the analysis
-        success = analyze_directory(current_dir)
+        success = analyze_directory(current_dir, workers=args.workers,
+                                    chunk_size=args.chunk_size,
+                                    changed_only=args.changed)
         
         if not success:
             logger.error("Analysis failed")
@@ -1,7 +1,9 @@
 """Database management commands."""
 import click
 from loguru import logger
-from code_analyzer.crews.models.base import init_db
+from code_analyzer.models.base import init_db, get_session
+from code_analyzer.models.db_manager import DatabaseManager
+from code_analyzer.monitoring.rollups import compact_rollups
 from alembic import command
 from alembic.config import Config
 
@@ -38,4 +40,37 @@ def reset():
         
     except Exception as e:
         logger.error(f"❌ Database reset failed: {e}")
-        raise click.ClickException(str(e)) 
\ No newline at end of file
+        raise click.ClickException(str(e)) 
+
+@db.command()
+def explain():
+    """Show query plans for the dashboard and manager queries."""
+    try:
+        plans = DatabaseManager().explain_hot_queries()
+    except Exception as e:
+        logger.error(f"❌ Explain failed: {e}")
+        raise click.ClickException(str(e))
+    
+    full_scans = 0
+    for name, steps in plans.items():
+        click.echo(name)
+        for step in steps:
+            # "SCAN <table>" without an index is a full table scan
+            is_full_scan = step.startswith("SCAN") and "INDEX" not in step
+            full_scans += is_full_scan
+            click.echo(f"  {'⚠️ ' if is_full_scan else ''}{step}")
+    if full_scans:
+        logger.warning(f"{full_scans} full table scan(s) found")
+
+@db.command("compact-rollups")
+def compact_rollups_command():
+    """Fold new log entries into the analytics rollups."""
+    session = get_session()
+    try:
+        added = compact_rollups(session)
+        logger.info(f"✅ Added {added} log entries to rollups")
+    except Exception as e:
+        logger.error(f"❌ Rollup compaction failed: {e}")
+        raise click.ClickException(str(e))
+    finally:
+        session.close()
@@ -7,6 +7,7 @@ from pathlib import Path
 from loguru import logger
 from pydantic import BaseModel
 from code_analyzer.crews.base_crew import BaseCrew
+from code_analyzer.utils.analysis_cache import content_hash, get_analysis_cache
 
 class ClassAnalysis(BaseModel):
     """Class structure analysis results"""
@@ -29,16 +30,25 @@ class FunctionAnalysis(BaseModel):
 class ASTAnalyzer(BaseCrew):
     """Crew for analyzing Python code structure"""
     
+    # Bump when the summary format changes so cached results are not reused
+    CACHE_VERSION = "1"
+    
     def __init__(self, target_path: str):
         super().__init__("ASTAnalyzer", target_path)
         self.analysis_results = {}
+        self.cache = get_analysis_cache()
     
     async def analyze_file(self, file_path: str) -> Dict[str, Any]:
         """Analyze a Python file's structure"""
         async with self.managed_operation():
             try:
-                # Read and parse file
-                content = await self.read_file(file_path)
+                # Read file and reuse the cached summary if unchanged
+                content = Path(file_path).read_text()
+                digest = content_hash(content)
+                cached = self.cache.get("ast_summary", self.CACHE_VERSION, digest)
+                if cached is not None:
+                    return {**cached, "file": file_path, "timestamp": self.get_timestamp()}
+                
                 tree = ast.parse(content)
                 
                 # Analyze components
@@ -50,15 +60,16 @@ class ASTAnalyzer(BaseCrew):
                 # Calculate metrics
                 metrics = await self._calculate_metrics(tree)
                 
-                return {
-                    "file": file_path,
-                    "classes": classes,
-                    "functions": functions,
+                summary = {
+                    "classes": [c.model_dump() for c in classes],
+                    "functions": [f.model_dump() for f in functions],
                     "imports": imports,
                     "patterns": patterns,
-                    "metrics": metrics,
-                    "timestamp": self.get_timestamp()
+                    "metrics": metrics
                 }
+                self.cache.set("ast_summary", self.CACHE_VERSION, digest, summary)
+                
+                return {**summary, "file": file_path, "timestamp": self.get_timestamp()}
                 
             except Exception as e:
                 self.logger.error(f"Analysis failed for {file_path}: {e}")
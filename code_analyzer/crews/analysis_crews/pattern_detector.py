@@ -1,7 +1,8 @@
 """Pattern detection using AST helpers."""
 from typing import Dict, Any, List
-from code_analyzer.utils.ast_helpers import parse_code_safely, get_node_name
+from code_analyzer.utils.ast_helpers import parse_code_safely, get_node_name, DetectionEngine
 from code_analyzer.models.db_manager import DatabaseManager
+from code_analyzer.utils.analysis_cache import AnalysisCache, content_hash, get_analysis_cache
 from loguru import logger
 import ast
 
@@ -15,43 +16,217 @@ class PatternMatch:
         self.description = description
         self.suggestion = suggestion
 
+class CodeSmellDetector:
+    """Detects long methods and functions with too many parameters."""
+
+    def __init__(self):
+        self.matches: List[PatternMatch] = []
+
+    def register(self, engine: DetectionEngine) -> None:
+        engine.register(ast.FunctionDef, self.visit_function)
+
+    def visit_function(self, node: ast.FunctionDef, engine: DetectionEngine) -> None:
+        # Long method detection
+        if len(node.body) > 20:
+            self.matches.append(PatternMatch(
+                type="code_smell",
+                name="long_method",
+                location={"function": node.name},
+                confidence=0.9,
+                description="Method is too long (>20 lines)",
+                suggestion="Consider breaking into smaller functions"
+            ))
+
+        # Too many parameters
+        if len(node.args.args) > 5:
+            self.matches.append(PatternMatch(
+                type="code_smell",
+                name="too_many_parameters",
+                location={"function": node.name},
+                confidence=0.8,
+                description=f"Function has {len(node.args.args)} parameters",
+                suggestion="Consider using a configuration object"
+            ))
+
+class DesignPatternDetector:
+    """Detects singleton and factory classes.
+
+    Evidence found anywhere in a class body (including nested classes)
+    is credited to every enclosing class, then evaluated when the class
+    is exited. Matches are reported in class definition order.
+    """
+
+    def __init__(self):
+        self._slots: List[List[PatternMatch]] = []
+        self._evidence: Dict[int, Dict[str, Any]] = {}
+
+    @property
+    def matches(self) -> List[PatternMatch]:
+        return [match for slot in self._slots for match in slot]
+
+    def register(self, engine: DetectionEngine) -> None:
+        engine.register(ast.ClassDef, self.enter_class)
+        engine.register(ast.Name, self.visit_name)
+        engine.register(ast.FunctionDef, self.visit_function)
+        engine.register_exit(ast.ClassDef, self.exit_class)
+
+    def enter_class(self, node: ast.ClassDef, engine: DetectionEngine) -> None:
+        self._slots.append([])
+        self._evidence[id(node)] = {
+            "slot": len(self._slots) - 1,
+            "has_instance": False,
+            "has_get_instance": False,
+            "create_methods": 0
+        }
+
+    def visit_name(self, node: ast.Name, engine: DetectionEngine) -> None:
+        if node.id == "_instance":
+            for cls in engine.class_stack:
+                self._evidence[id(cls)]["has_instance"] = True
+
+    def visit_function(self, node: ast.FunctionDef, engine: DetectionEngine) -> None:
+        is_get_instance = node.name == "getInstance"
+        is_creator = node.name.startswith(('create', 'make', 'build'))
+        if not (is_get_instance or is_creator):
+            return
+        for cls in engine.class_stack:
+            evidence = self._evidence[id(cls)]
+            if is_get_instance:
+                evidence["has_get_instance"] = True
+            if is_creator:
+                evidence["create_methods"] += 1
+
+    def exit_class(self, node: ast.ClassDef, engine: DetectionEngine) -> None:
+        evidence = self._evidence.pop(id(node))
+        matches = self._slots[evidence["slot"]]
+
+        # Singleton detection
+        if evidence["has_instance"] and evidence["has_get_instance"]:
+            matches.append(PatternMatch(
+                type="design_pattern",
+                name="singleton",
+                location={"class": node.name},
+                confidence=0.9,
+                description="Singleton pattern detected",
+                suggestion="Ensure global state is necessary"
+            ))
+
+        # Factory detection
+        if evidence["create_methods"] > 0:
+            matches.append(PatternMatch(
+                type="design_pattern",
+                name="factory",
+                location={"class": node.name},
+                confidence=0.85,
+                description="Factory pattern detected",
+                suggestion="Good for object creation abstraction"
+            ))
+
+class AntiPatternDetector:
+    """Detects god classes."""
+
+    def __init__(self):
+        self.matches: List[PatternMatch] = []
+
+    def register(self, engine: DetectionEngine) -> None:
+        engine.register(ast.ClassDef, self.visit_class)
+
+    def visit_class(self, node: ast.ClassDef, engine: DetectionEngine) -> None:
+        # God class detection
+        if len(node.body) > 30:
+            self.matches.append(PatternMatch(
+                type="anti_pattern",
+                name="god_class",
+                location={"class": node.name},
+                confidence=0.7,
+                description="Class is too large (>30 methods/attributes)",
+                suggestion="Split into smaller, focused classes"
+            ))
+
+class MetricsDetector:
+    """Counts classes and methods and accumulates a complexity score."""
+
+    def __init__(self):
+        self.class_count = 0
+        self.method_count = 0
+        self.complexity = 0.0
+
+    def register(self, engine: DetectionEngine) -> None:
+        engine.register(ast.ClassDef, self.visit_class)
+        engine.register(ast.FunctionDef, self.visit_function)
+        for branch in (ast.If, ast.While, ast.For):
+            engine.register(branch, self.visit_branch)
+
+    def visit_class(self, node: ast.ClassDef, engine: DetectionEngine) -> None:
+        self.class_count += 1
+
+    def visit_function(self, node: ast.FunctionDef, engine: DetectionEngine) -> None:
+        self.method_count += 1
+        self.complexity += len(node.args.args) * 0.1
+
+    def visit_branch(self, node: ast.AST, engine: DetectionEngine) -> None:
+        self.complexity += 1
+
+    def results(self) -> Dict[str, Any]:
+        return {
+            "class_count": self.class_count,
+            "method_count": self.method_count,
+            "complexity_score": round(self.complexity, 2)
+        }
+
 class PatternDetector:
     """Detects code patterns and anti-patterns"""
-    
+
+    # Bump when detector output changes so cached results are not reused
+    CACHE_VERSION = "2"
+
+    def __init__(self, cache: AnalysisCache = None):
+        self.cache = cache or get_analysis_cache()
+
     async def analyze_patterns(self, code: str) -> Dict[str, Any]:
         """Analyze code for patterns"""
         try:
+            digest = content_hash(code)
+            cached = self.cache.get("patterns", self.CACHE_VERSION, digest)
+            if cached is not None:
+                return cached
+
             tree = parse_code_safely(code)
             if not tree:
                 raise ValueError("Failed to parse code")
-            
-            # Detect all patterns
-            code_smells = await self._detect_code_smells(tree)
-            design_patterns = await self._detect_design_patterns(tree)
-            anti_patterns = await self._detect_anti_patterns(tree)
-            
+
+            # Detect all patterns in a single traversal
+            smells = CodeSmellDetector()
+            design = DesignPatternDetector()
+            anti = AntiPatternDetector()
+            metrics = MetricsDetector()
+            DetectionEngine([smells, design, anti, metrics]).run(tree)
+
             results = {
-                "code_smells": [self._pattern_to_dict(p) for p in code_smells],
-                "design_patterns": [self._pattern_to_dict(p) for p in design_patterns],
-                "anti_patterns": [self._pattern_to_dict(p) for p in anti_patterns],
-                "metrics": await self._calculate_metrics(tree)
+                "code_smells": [self._pattern_to_dict(p) for p in smells.matches],
+                "design_patterns": [self._pattern_to_dict(p) for p in design.matches],
+                "anti_patterns": [self._pattern_to_dict(p) for p in anti.matches],
+                "metrics": metrics.results()
             }
-            
+
             # Save to database
             db = DatabaseManager()
             db.save_crew_output(
                 crew_name="pattern_detector",
-                output_type="pattern_analysis",
-                status="completed",
-                results=results
+                output={
+                    "output_type": "pattern_analysis",
+                    "status": "completed",
+                    "results": results
+                }
             )
-            
+
+            self.cache.set("patterns", self.CACHE_VERSION, digest, results)
             return results
-            
+
         except Exception as e:
             logger.error(f"Pattern analysis failed: {e}")
             return {"status": "failed", "error": str(e)}
-    
+
     def _pattern_to_dict(self, pattern: PatternMatch) -> Dict[str, Any]:
         """Convert pattern to dictionary."""
         return {
@@ -62,127 +237,27 @@ class PatternDetector:
             "description": pattern.description,
             "suggestion": pattern.suggestion
         }
-    
+
     async def _detect_code_smells(self, tree: ast.AST) -> List[PatternMatch]:
         """Detect code smells in AST."""
-        smells = []
-        
-        for node in ast.walk(tree):
-            # Long method detection
-            if isinstance(node, ast.FunctionDef) and len(node.body) > 20:
-                smells.append(PatternMatch(
-                    type="code_smell",
-                    name="long_method",
-                    location={"function": node.name},
-                    confidence=0.9,
-                    description="Method is too long (>20 lines)",
-                    suggestion="Consider breaking into smaller functions"
-                ))
-            
-            # Too many parameters
-            if isinstance(node, ast.FunctionDef) and len(node.args.args) > 5:
-                smells.append(PatternMatch(
-                    type="code_smell",
-                    name="too_many_parameters",
-                    location={"function": node.name},
-                    confidence=0.8,
-                    description=f"Function has {len(node.args.args)} parameters",
-                    suggestion="Consider using a configuration object"
-                ))
-        
-        return smells
-    
+        detector = CodeSmellDetector()
+        DetectionEngine([detector]).run(tree)
+        return detector.matches
+
     async def _detect_design_patterns(self, tree: ast.AST) -> List[PatternMatch]:
         """Detect design patterns in AST."""
-        patterns = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # Singleton detection
-                if self._is_singleton(node):
-                    patterns.append(PatternMatch(
-                        type="design_pattern",
-                        name="singleton",
-                        location={"class": node.name},
-                        confidence=0.9,
-                        description="Singleton pattern detected",
-                        suggestion="Ensure global state is necessary"
-                    ))
-                
-                # Factory detection
-                if self._is_factory(node):
-                    patterns.append(PatternMatch(
-                        type="design_pattern",
-                        name="factory",
-                        location={"class": node.name},
-                        confidence=0.85,
-                        description="Factory pattern detected",
-                        suggestion="Good for object creation abstraction"
-                    ))
-        
-        return patterns
-    
+        detector = DesignPatternDetector()
+        DetectionEngine([detector]).run(tree)
+        return detector.matches
+
     async def _detect_anti_patterns(self, tree: ast.AST) -> List[PatternMatch]:
         """Detect anti-patterns in AST."""
-        patterns = []
-        
-        for node in ast.walk(tree):
-            # God class detection
-            if isinstance(node, ast.ClassDef) and len(node.body) > 30:
-                patterns.append(PatternMatch(
-                    type="anti_pattern",
-                    name="god_class",
-                    location={"class": node.name},
-                    confidence=0.7,
-                    description="Class is too large (>30 methods/attributes)",
-                    suggestion="Split into smaller, focused classes"
-                ))
-        
-        return patterns
-    
-    def _is_singleton(self, node: ast.ClassDef) -> bool:
-        """Check if class follows singleton pattern."""
-        has_instance = False
-        has_get_instance = False
-        
-        for child in ast.walk(node):
-            if isinstance(child, ast.Name) and child.id == "_instance":
-                has_instance = True
-            if isinstance(child, ast.FunctionDef) and child.name == "getInstance":
-                has_get_instance = True
-                
-        return has_instance and has_get_instance
-    
-    def _is_factory(self, node: ast.ClassDef) -> bool:
-        """Check if class follows factory pattern."""
-        create_methods = 0
-        
-        for child in ast.walk(node):
-            if isinstance(child, ast.FunctionDef) and (
-                child.name.startswith('create') or 
-                child.name.startswith('make') or
-                child.name.startswith('build')
-            ):
-                create_methods += 1
-                
-        return create_methods > 0
-    
+        detector = AntiPatternDetector()
+        DetectionEngine([detector]).run(tree)
+        return detector.matches
+
     async def _calculate_metrics(self, tree: ast.AST) -> Dict[str, Any]:
         """Calculate code metrics."""
-        return {
-            "class_count": len([n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)]),
-            "method_count": len([n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)]),
-            "complexity_score": self._calculate_complexity(tree)
-        }
-    
-    def _calculate_complexity(self, tree: ast.AST) -> float:
-        """Calculate code complexity score."""
-        complexity = 0
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.If, ast.While, ast.For)):
-                complexity += 1
-            elif isinstance(node, ast.FunctionDef):
-                complexity += len(node.args.args) * 0.1
-                
-        return round(complexity, 2)
+        detector = MetricsDetector()
+        DetectionEngine([detector]).run(tree)
+        return detector.results()
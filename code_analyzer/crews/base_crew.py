@@ -52,8 +52,8 @@ class BaseCrew:
                 file_obj.close()
                 
     async def throttle(self):
-        """Throttle operations if CPU is high."""
-        if self.resource_monitor.check_resources()["cpu_percent"] > 80:
+        """Throttle operations if CPU has been high for the last few seconds."""
+        if self.resource_monitor.cpu_percentile(50, seconds=5) > 80:
             await asyncio.sleep(0.1)
             
     async def cleanup(self):
@@ -3,38 +3,128 @@ IMPORTANT: DO NOT MODIFY WITHOUT PERMISSION
 Contact: THE AI RE INVESTOR (405-963-2596)
 """
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from loguru import logger
 from openai import AsyncOpenAI
 import asyncio
+import json
 from .base_crew import BaseCrew
+from code_analyzer.utils.analysis_cache import content_hash, get_analysis_cache
+from code_analyzer.utils.chunker import Chunk, chunk_prompt, chunk_source, estimate_tokens, merge_chunk_results
+from code_analyzer.utils.discovery import DiscoveryService, FileInfo
+from code_analyzer.utils.ignore import DEFAULT_PATTERNS, load_ignore_matcher
+from code_analyzer.utils.prompt_batcher import (
+    BATCH_SYSTEM_PROMPT, SMALL_FILE_TOKENS, BatchItem, batch_limits,
+    build_batch_prompt, pack_items, parse_batch_response
+)
 import pendulum
 
+CONFIG_PATH = Path("configs/ai_models.json")
+SYSTEM_PROMPT = "You are a code analysis expert."
+# Files read and looked up in the cache together
+READ_BATCH = 100
+
+def _read_texts(paths: List[Path]) -> List[Any]:
+    """Read files as text; an unreadable file gives its exception instead."""
+    contents: List[Any] = []
+    for path in paths:
+        try:
+            contents.append(path.read_text())
+        except (OSError, UnicodeDecodeError) as e:
+            contents.append(e)
+    return contents
+
 class CodeAnalysisCrew(BaseCrew):
     """Crew for analyzing code with resource management."""
     
+    MODEL = "gpt-3.5-turbo"
+    TIER = "fast"
+    # Bump when the prompt changes so cached responses are not reused
+    PROMPT_VERSION = "1"
+    
     def __init__(self, target_path: str):
         super().__init__("CodeAnalysis", target_path)
         self._client = None
+        self._request_slots: Optional[asyncio.Semaphore] = None
+        self.cache = get_analysis_cache()
+        self.concurrent_requests = self._load_concurrency()
+        # Prompt tokens per request: small files are packed up to it and
+        # larger files are split into AST-aligned chunks that fit it
+        self.batching = True
+        self.batch_tokens, self.batch_files = self._load_batch_limits()
         self.logger.info("Initialized CodeAnalysis crew")
         
-    async def analyze_directory(self, directory_path: str) -> Dict[str, Any]:
-        """Analyze a directory of code with proper resource management."""
+    def _load_concurrency(self) -> int:
+        """Get the in-flight request limit from configs/ai_models.json."""
+        try:
+            config = json.loads(CONFIG_PATH.read_text())
+            phase = config.get("analysis_phases", {}).get("initial_scan", {})
+            return max(1, int(phase.get("concurrent_requests", 1)))
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load concurrency config, using 1: {e}")
+            return 1
+
+    def _load_batch_limits(self):
+        """Get the per-request token budget and file count for batched prompts."""
+        try:
+            config = json.loads(CONFIG_PATH.read_text())
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not load batch config, using defaults: {e}")
+            config = {}
+        return batch_limits(config, self.TIER)
+        
+    async def analyze_directory(self, directory_path: str, changed_only: bool = False) -> Dict[str, Any]:
+        """Analyze a directory of code with proper resource management.
+        
+        Runs a three-stage pipeline: a reader feeds file contents into a
+        bounded queue, ``concurrent_requests`` request workers send them to
+        the model, and a writer collects results as they complete. Small
+        files are packed into shared requests (see utils.prompt_batcher)
+        and large ones are analyzed in chunks (see utils.chunker).
+        With ``changed_only``, only files added or changed since the last
+        such run are analyzed; files whose analysis fails are analyzed
+        again next time.
+        """
         async with self.managed_operation():
             try:
                 directory = Path(directory_path)
                 if not directory.exists():
                     raise ValueError(f"Directory not found: {directory}")
                 
-                results = []
-                for file_path in directory.rglob('*.py'):
-                    await self.throttle()  # Throttle between files
-                    
-                    async with self.managed_file(file_path) as f:
-                        content = f.read()
-                        result = await self._analyze_content(content, str(file_path))
-                        results.append(result)
+                discovery = DiscoveryService(directory, load_ignore_matcher(directory, DEFAULT_PATTERNS),
+                                             suffixes={'.py'})
+                diff = None
+                if changed_only:
+                    diff = await asyncio.to_thread(discovery.changes)
+                    discovered = diff.modified
+                else:
+                    discovered = await asyncio.to_thread(discovery.scan)
+
+                self._request_slots = asyncio.Semaphore(self.concurrent_requests)
+                files: asyncio.Queue = asyncio.Queue(maxsize=self.concurrent_requests * 2)
+                completed: asyncio.Queue = asyncio.Queue()
+                results: List[Dict[str, Any]] = []
+                
+                writer = asyncio.create_task(self._write_results(completed, results))
+                workers = [
+                    asyncio.create_task(self._request_files(files, completed))
+                    for _ in range(self.concurrent_requests)
+                ]
+                try:
+                    await self._read_files(discovered, files, completed)
+                    for _ in workers:
+                        await files.put(None)
+                    await asyncio.gather(*workers)
+                finally:
+                    for worker in workers:
+                        worker.cancel()
+                    await completed.put(None)
+                    await writer
+                    if diff is not None:
+                        succeeded = [r["file"] for r in results if r["status"] == "completed"]
+                        await asyncio.to_thread(discovery.commit, diff, succeeded)
                 
+                results.sort(key=lambda r: r.pop("_index"))
                 return {
                     "status": "completed",
                     "files_analyzed": len(results),
@@ -50,28 +140,148 @@ class CodeAnalysisCrew(BaseCrew):
                     "timestamp": self.get_timestamp()
                 }
                 
+    async def _read_files(self, discovered: List[FileInfo], files: asyncio.Queue,
+                          completed: asyncio.Queue) -> None:
+        """Reader stage: queue file contents, blocking while the queue is full.
+
+        Files are read in groups of READ_BATCH and looked up in the cache
+        with one query per group; hits complete without a request.
+        """
+        cache_version = f"{self.MODEL}:{self.PROMPT_VERSION}"
+        # Small files are collected into a window and packed into batches
+        window: List[BatchItem] = []
+        window_tokens = 0
+        for start in range(0, len(discovered), READ_BATCH):
+            group = [info.path for info in discovered[start:start + READ_BATCH]]
+            contents = await asyncio.to_thread(_read_texts, group)
+            digests = [content_hash(c) if isinstance(c, str) else None for c in contents]
+            cached = await asyncio.to_thread(
+                self.cache.get_many, "llm", cache_version, [d for d in digests if d]
+            )
+            for index, file_path, content, digest in zip(
+                    range(start, start + len(group)), group, contents, digests):
+                if not isinstance(content, str):
+                    self.logger.error(f"Could not read {file_path}: {content}")
+                    await completed.put({
+                        "_index": index,
+                        "file": str(file_path),
+                        "status": "failed",
+                        "error": str(content)
+                    })
+                    continue
+                if digest in cached:
+                    await completed.put({
+                        "_index": index,
+                        "file": str(file_path),
+                        "analysis": cached[digest],
+                        "status": "completed"
+                    })
+                    continue
+                item = BatchItem(index, str(file_path), content)
+                if not self.batching or item.tokens >= SMALL_FILE_TOKENS:
+                    await files.put([item])
+                    continue
+                window.append(item)
+                window_tokens += item.tokens
+                if (window_tokens >= self.batch_tokens * self.concurrent_requests
+                        or len(window) >= self.batch_files * self.concurrent_requests):
+                    await self._put_batches(window, files)
+                    window, window_tokens = [], 0
+        await self._put_batches(window, files)
+
+    async def _put_batches(self, items: List[BatchItem], files: asyncio.Queue) -> None:
+        """Pack a window of small files and queue the batches."""
+        for batch in pack_items(items, self.batch_tokens, self.batch_files):
+            await files.put(batch)
+                
+    async def _request_files(self, files: asyncio.Queue, completed: asyncio.Queue) -> None:
+        """Request stage: analyze queued batches until a stop marker arrives."""
+        while True:
+            item = await files.get()
+            if item is None:
+                return
+            if len(item) == 1:
+                results = [await self._analyze_content(item[0].content, item[0].file)]
+            else:
+                results = await self._analyze_batch(item)
+            for batch_item, result in zip(item, results):
+                result["_index"] = batch_item.index
+                await completed.put(result)
+                
+    async def _write_results(self, completed: asyncio.Queue,
+                             results: List[Dict[str, Any]]) -> None:
+        """Writer stage: collect results in completion order."""
+        while True:
+            result = await completed.get()
+            if result is None:
+                return
+            results.append(result)
+            self.logger.debug(f"Analyzed {result['file']} ({result['status']})")
+                
+    async def _analyze_batch(self, items: List[BatchItem]) -> List[Dict[str, Any]]:
+        """Analyze several small files in one request, in the order given.
+
+        Files missing from the response (or the whole batch, if the request
+        fails) are retried one request each.
+        """
+        cache_version = f"{self.MODEL}:{self.PROMPT_VERSION}"
+        ids, prompt = build_batch_prompt(items)
+        analyses: Dict[str, Any] = {}
+        try:
+            text = await self._complete(BATCH_SYSTEM_PROMPT, prompt,
+                                        response_format={"type": "json_object"})
+            analyses = parse_batch_response(text or "", ids)
+        except Exception as e:
+            self.logger.error(f"Batch analysis of {len(items)} files failed: {e}")
+
+        results: List[Optional[Dict[str, Any]]] = []
+        retries = []
+        for section_id, item in zip(ids, items):
+            if section_id in analyses:
+                self.cache.set("llm", cache_version, content_hash(item.content), analyses[section_id])
+                results.append({
+                    "file": item.file,
+                    "analysis": analyses[section_id],
+                    "status": "completed"
+                })
+            else:
+                retries.append((len(results), item))
+                results.append(None)
+
+        if retries:
+            self.logger.warning(f"Retrying {len(retries)} of {len(items)} batched files individually")
+            retried = await asyncio.gather(*(
+                self._analyze_content(item.content, item.file) for _, item in retries
+            ))
+            for (position, _), result in zip(retries, retried):
+                results[position] = result
+        return results
+            
     async def _analyze_content(self, content: str, file_path: str) -> Dict[str, Any]:
         """Analyze file content with throttling."""
         try:
-            await self.throttle()  # Throttle before API call
+            cache_version = f"{self.MODEL}:{self.PROMPT_VERSION}"
+            digest = content_hash(content)
+            cached = self.cache.get("llm", cache_version, digest)
+            if cached is not None:
+                return {
+                    "file": file_path,
+                    "analysis": cached,
+                    "status": "completed"
+                }
             
-            if not self._client:
-                self._client = AsyncOpenAI()
-                
-            response = await self._client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{
-                    "role": "system",
-                    "content": "You are a code analysis expert."
-                }, {
-                    "role": "user",
-                    "content": f"Analyze this code:\n\n{content}"
-                }]
-            )
+            if estimate_tokens(content) > self.batch_tokens:
+                result = await self._analyze_chunked(content, file_path)
+                if result["status"] == "completed":
+                    self.cache.set("llm", cache_version, digest, result["analysis"])
+                return result
+            
+            analysis = await self._complete(SYSTEM_PROMPT, f"Analyze this code:\n\n{content}")
+            self.cache.set("llm", cache_version, digest, analysis)
             
             return {
                 "file": file_path,
-                "analysis": response.choices[0].message.content,
+                "analysis": analysis,
                 "status": "completed"
             }
             
@@ -81,4 +291,53 @@ class CodeAnalysisCrew(BaseCrew):
                 "file": file_path,
                 "status": "failed",
                 "error": str(e)
-            }
\ No newline at end of file
+            }
+
+    async def _analyze_chunked(self, content: str, file_path: str) -> Dict[str, Any]:
+        """Analyze a file too large for one request as parallel chunks, then merge."""
+        chunks = await asyncio.to_thread(chunk_source, content, self.batch_tokens)
+        self.logger.info(f"Analyzing {file_path} in {len(chunks)} chunks")
+        results = await asyncio.gather(*(
+            self._analyze_chunk(file_path, chunk, position, len(chunks))
+            for position, chunk in enumerate(chunks, 1)
+        ))
+        return merge_chunk_results(file_path, chunks, results)
+
+    async def _analyze_chunk(self, file_path: str, chunk: Chunk, position: int,
+                             total: int) -> Dict[str, Any]:
+        """Analyze one chunk; cached by its code and header so unchanged parts are reused."""
+        cache_version = f"{self.MODEL}:{self.PROMPT_VERSION}"
+        digest = content_hash(f"{chunk.header}\0{chunk.prefix}\0{chunk.text}")
+        cached = self.cache.get("llm_chunk", cache_version, digest)
+        if cached is not None:
+            return {"analysis": cached, "status": "completed"}
+        try:
+            analysis = await self._complete(SYSTEM_PROMPT, chunk_prompt(file_path, chunk, position, total))
+        except Exception as e:
+            self.logger.error(f"Chunk {position}/{total} of {file_path} failed: {e}")
+            return {"status": "failed", "error": str(e)}
+        self.cache.set("llm_chunk", cache_version, digest, analysis)
+        return {"analysis": analysis, "status": "completed"}
+
+    async def _complete(self, system: str, prompt: str, **kwargs) -> str:
+        """Send one chat completion, throttled and within the request slots."""
+        await self.throttle()  # Throttle before API call
+        
+        if not self._client:
+            self._client = AsyncOpenAI()
+        if not self._request_slots:
+            self._request_slots = asyncio.Semaphore(self.concurrent_requests)
+            
+        async with self._request_slots:
+            response = await self._client.chat.completions.create(
+                model=self.MODEL,
+                messages=[{
+                    "role": "system",
+                    "content": system
+                }, {
+                    "role": "user",
+                    "content": prompt
+                }],
+                **kwargs
+            )
+        return response.choices[0].message.content
@@ -1,80 +1,170 @@
-from collections import deque
+"""Tier-aware scheduling of files for analysis.
+
+Files are assigned a tier (``fast``/``balanced``/``depth``) by complexity
+and kept in a per-tier heap ordered by deadline, then priority, then
+arrival. ``process_queues`` runs a worker pool per tier and shares capacity
+between tiers with weighted fair queuing on estimated tokens: each dispatch
+advances its tier's virtual finish time by ``tokens / weight``, and the
+tier whose next item would finish first goes next.
+
+Rate limit budget is taken before a file is dispatched. When every
+eligible tier is out of budget the scheduler sleeps until the earliest
+bucket refill (or until a running file finishes) instead of polling.
+"""
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from loguru import logger
 import asyncio
+import heapq
+import itertools
+import math
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.complexity import score_files
 from .rate_limit import RateLimitHandler
 
+TIERS = ["fast", "balanced", "depth"]
+DEFAULT_TIER_WEIGHTS = {"fast": 4, "balanced": 2, "depth": 1}
+# Rough size of a token, used to estimate a file's rate limit cost
+CHARS_PER_TOKEN = 4
+
+
+@dataclass(order=True)
+class QueueItem:
+    """A queued file; items sort by deadline, then priority, then arrival."""
+    deadline: float
+    neg_priority: int
+    seq: int
+    file: Path = field(compare=False)
+    tier: str = field(compare=False)
+    tokens: int = field(compare=False)
+
+
 class AnalysisQueue:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, rate_handler: Optional[RateLimitHandler] = None,
+                 processor: Optional[Callable[[Path, Dict], Awaitable[Any]]] = None,
+                 cache: Optional[AnalysisCache] = None, workers: Optional[int] = None):
         """Initialize analysis queue.
         
         Args:
             config: Configuration dictionary
+            rate_handler: Rate limit handler (a new one by default)
+            processor: Coroutine analyzing one file with a provider
+            cache: Cache for complexity metrics (the shared one by default)
+            workers: Processes used to score files (defaults to CPU count)
         """
-        self.queues = {
-            "fast": deque(),
-            "balanced": deque(),
-            "depth": deque()
-        }
+        self.queues: Dict[str, List[QueueItem]] = {tier: [] for tier in TIERS}
         self.config = config
-        self.rate_handler = RateLimitHandler()
+        self.rate_handler = rate_handler or RateLimitHandler()
+        self.processor = processor or self._process_file
+        self.cache = cache
+        self.workers = workers
+        self._seq = itertools.count()
+        # Weighted fair queuing state: system virtual time and per-tier finish tags
+        self._virtual_time = 0.0
+        self._finish = {tier: 0.0 for tier in TIERS}
         
-    def add_files(self, files: List[Path]):
-        """Add files to appropriate queues based on complexity"""
+    def add_files(self, files: List[Path], priority: int = 0,
+                  deadline: Optional[float] = None):
+        """Add files to appropriate queues based on complexity.
+
+        Within a tier, files with an earlier ``deadline`` (loop time) go
+        first, then higher ``priority``, then arrival order.
+        """
+        scores = self._score_files(files)
         for file in files:
-            complexity = self._analyze_complexity(file)
-            tier = self._determine_tier(complexity)
-            self.queues[tier].append(file)
+            tier = self._determine_tier(scores[file])
+            item = QueueItem(
+                deadline if deadline is not None else math.inf, -priority, next(self._seq),
+                file, tier, self._estimate_tokens(file)
+            )
+            heapq.heappush(self.queues[tier], item)
             
         logger.info(f"Added {len(files)} files to analysis queues")
-        
-    async def process_queues(self):
-        """Process all queues with rate limiting."""
-        default_config = {
-            "batch_size": 10,
-            "concurrent_requests": 1
-        }
-        
-        while any(self.queues.values()):
-            for tier in self.queues:
-                if self.queues[tier]:
-                    # Get config with defaults
-                    phase_config = self.config.get("analysis_phases", {}).get(tier, default_config)
-                    batch_size = phase_config.get("batch_size", default_config["batch_size"])
-                    batch = [self.queues[tier].popleft() 
-                            for _ in range(min(batch_size, len(self.queues[tier])))]
-                            
-                    provider = self.rate_handler.get_available_provider(tier)
-                    if provider:
-                        await self._process_batch(batch, provider)
+
+    def _phase_config(self, tier: str) -> Dict:
+        return self.config.get("analysis_phases", {}).get(tier, {})
+
+    def _weight(self, tier: str) -> float:
+        return self._phase_config(tier).get("weight", DEFAULT_TIER_WEIGHTS[tier])
+
+    def _pool_size(self, tier: str) -> int:
+        return max(1, self._phase_config(tier).get("concurrent_requests", 1))
+
+    def _next_finish(self, tier: str) -> float:
+        """Virtual finish time of the tier's head item if dispatched now."""
+        head = self.queues[tier][0]
+        return max(self._virtual_time, self._finish[tier]) + head.tokens / self._weight(tier)
+
+    async def process_queues(self) -> List[Any]:
+        """Process all queues with rate limiting; returns results in completion order."""
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Future, QueueItem] = {}
+        busy = {tier: 0 for tier in TIERS}
+        results: List[Any] = []
+
+        while running or any(self.queues.values()):
+            wake_at = math.inf
+            blocked = set()
+            while True:
+                eligible = [
+                    tier for tier in TIERS
+                    if self.queues[tier] and tier not in blocked and busy[tier] < self._pool_size(tier)
+                ]
+                if not eligible:
+                    break
+                tier = min(eligible, key=self._next_finish)
+                item = self.queues[tier][0]
+                # The limiter may wait on another process's SQLite lock
+                provider, wait = await asyncio.to_thread(self.rate_handler.reserve, tier, item.tokens)
+                if provider is None:
+                    blocked.add(tier)
+                    wake_at = min(wake_at, loop.time() + wait)
+                    continue
+
+                start = max(self._virtual_time, self._finish[tier])
+                self._finish[tier] = start + item.tokens / self._weight(tier)
+                self._virtual_time = start
+                heapq.heappop(self.queues[tier])
+                if loop.time() > item.deadline:
+                    logger.warning(f"Deadline missed for {item.file}")
+                busy[tier] += 1
+                running[asyncio.ensure_future(self.processor(item.file, provider))] = item
+
+            timeout = None if wake_at == math.inf else max(0.0, wake_at - loop.time())
+            if running:
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    item = running.pop(task)
+                    busy[item.tier] -= 1
+                    if task.exception() is not None:
+                        logger.error(f"Error processing {item.file}: {task.exception()}")
                     else:
-                        # Re-add to queue if no provider available
-                        self.queues[tier].extend(batch)
-                        await asyncio.sleep(1)
+                        results.append(task.result())
+            elif timeout is not None:
+                await asyncio.sleep(timeout)
+            else:
+                # Only tiers without any provider are left
+                logger.error(f"No providers for queued tiers: {sorted(blocked)}")
+                break
+        return results
+
+    def _estimate_tokens(self, file: Path) -> int:
+        try:
+            return max(1, file.stat().st_size // CHARS_PER_TOKEN)
+        except OSError:
+            return 1
                         
+    def _score_files(self, files: List[Path]) -> Dict[Path, float]:
+        """Complexity scores for a batch of files (cached, scored in parallel)."""
+        metrics = score_files(files, cache=self.cache, workers=self.workers)
+        return {file: result["score"] for file, result in metrics.items()}
+
     def _analyze_complexity(self, file: Path) -> float:
-        """Analyze file complexity with encoding detection."""
-        try:
-            # Try UTF-8 first
-            with open(file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except UnicodeDecodeError:
-            # Fallback to detected encoding
-            import chardet
-            with open(file, 'rb') as f:
-                raw = f.read()
-                encoding = chardet.detect(raw)['encoding'] or 'utf-8'
-            with open(file, 'r', encoding=encoding) as f:
-                content = f.read()
-        
-        # Simple complexity score based on file size and content
-        score = len(content) / 1000  # Size factor
-        score += content.count("class ") * 2  # Class complexity
-        score += content.count("def ") * 1.5  # Function complexity
-        score += content.count("async ") * 1.5  # Async complexity
-        
-        return score
+        """Complexity score from structural metrics (see utils.complexity)."""
+        return self._score_files([file])[file]
         
     def _determine_tier(self, complexity: float) -> str:
         """Determine processing tier based on complexity score"""
@@ -84,23 +174,13 @@ class AnalysisQueue:
             return "balanced"
         return "depth" 
 
-    async def _process_batch(self, batch: List[Path], provider: Dict) -> None:
-        """Process a batch of files.
+    async def _process_file(self, file: Path, provider: Dict) -> Dict:
+        """Process one file with a provider whose rate limit budget is already taken.
         
         Args:
-            batch: List of files to process
+            file: File to process
             provider: AI provider configuration
         """
-        logger.info(f"Processing batch of {len(batch)} files with {provider['name']}")
-        
-        for file in batch:
-            try:
-                # Process file using the provider
-                await self.rate_handler.handle_request(provider["name"], 0)  # Token count will be added later
-                
-                # Add your file processing logic here
-                logger.info(f"Processed {file}")
-                
-            except Exception as e:
-                logger.error(f"Error processing {file}: {e}")
-                continue 
\ No newline at end of file
+        # Add your file processing logic here
+        logger.info(f"Processed {file} with {provider['name']}/{provider['model']}")
+        return {"file": str(file), "provider": provider["model"], "status": "completed"}
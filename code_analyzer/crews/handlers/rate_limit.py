@@ -1,29 +1,22 @@
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 import json
 from pathlib import Path
-import asyncio
 from loguru import logger
-import pendulum
 from code_analyzer.utils.rate_monitor import RateMonitor
+from code_analyzer.utils.rate_limits import TokenBucketLimiter, get_rate_limiter, provider_key
 
 class RateLimitHandler:
-    """Smart rate limit handler with tiered model approach."""
+    """Smart rate limit handler with tiered model approach.
+
+    Limits are enforced by the shared token-bucket limiter, so every
+    handler (in any process) draws from the same per-model budgets.
+    """
     
-    def __init__(self):
+    def __init__(self, limiter: Optional[TokenBucketLimiter] = None,
+                 monitor: Optional[RateMonitor] = None):
         self.config = self._load_config()
-        self.monitor = RateMonitor()
-        self.usage = {
-            "gpt-3.5-turbo": {
-                "tokens": 0,
-                "last_reset": pendulum.now(),
-                "requests": []
-            },
-            "gpt-4": {
-                "tokens": 0,
-                "last_reset": pendulum.now(),
-                "requests": []
-            }
-        }
+        self.monitor = monitor or RateMonitor()
+        self.limiter = limiter or get_rate_limiter()
         
     def _load_config(self) -> Dict:
         """Load AI model configuration."""
@@ -61,56 +54,37 @@ class RateLimitHandler:
             cost=cost
         )
         
-        # Check rate limits
-        while not self._can_make_request(model["name"], content_length):
-            wait_time = self._get_wait_time(model["name"])
-            logger.info(f"Rate limit reached for {model['name']}, waiting {wait_time}s")
-            await asyncio.sleep(wait_time)
-        
-        # Track usage
-        self._track_request(model["name"], content_length)
+        # Wait for the request and token budgets, then take them
+        waited = await self.limiter.acquire(provider_key(model), content_length)
+        if waited:
+            logger.debug(f"Waited {waited:.2f}s for {provider_key(model)}")
 
-    def _can_make_request(self, model: str, tokens: int) -> bool:
+    def _can_make_request(self, provider: Dict, tokens: int) -> bool:
         """Check if request can be made within rate limits."""
-        now = pendulum.now()
-        usage = self.usage[model]
-        
-        # Reset if minute has passed
-        if (now - usage["last_reset"]).total_seconds() >= 60:
-            usage["tokens"] = 0
-            usage["last_reset"] = now
-            usage["requests"] = []
-        
-        # Check token limit
-        limit = self.config["model_tiers"]["fast"]["providers"][0]["rate_limit"] \
-            if "3.5" in model else self.config["model_tiers"]["depth"]["providers"][0]["rate_limit"]
-            
-        return (usage["tokens"] + tokens) <= limit
+        return self.limiter.wait_time(provider_key(provider), tokens) == 0
 
-    def _track_request(self, model: str, tokens: int) -> None:
-        """Track request usage."""
-        usage = self.usage[model]
-        usage["tokens"] += tokens
-        usage["requests"].append({
-            "tokens": tokens,
-            "timestamp": pendulum.now().isoformat()
-        })
+    def _get_wait_time(self, provider: Dict, tokens: int = 0) -> float:
+        """Seconds until a request of this size is allowed."""
+        return self.limiter.wait_time(provider_key(provider), tokens)
 
-    def _get_wait_time(self, model: str) -> int:
-        """Calculate wait time until next request allowed."""
-        now = pendulum.now()
-        usage = self.usage[model]
-        seconds_since_reset = (now - usage["last_reset"]).total_seconds()
-        
-        if seconds_since_reset >= 60:
-            return 0
-            
-        return int(60 - seconds_since_reset)
-
-    def get_available_provider(self) -> Dict:
-        """Get available provider based on rate limits."""
-        for tier in ["fast", "balanced", "depth"]:
-            for provider in self.config["model_tiers"][tier]["providers"]:
-                if self._can_make_request(provider["name"], 0):
+    def get_available_provider(self, tier: Optional[str] = None, tokens: int = 0) -> Optional[Dict]:
+        """Get available provider based on rate limits, from one tier or any."""
+        tiers = [tier] if tier else ["fast", "balanced", "depth"]
+        for name in tiers:
+            for provider in self.config["model_tiers"][name]["providers"]:
+                if self._can_make_request(provider, tokens):
                     return provider
-        return None
\ No newline at end of file
+        return None
+
+    def reserve(self, tier: str, tokens: int) -> Tuple[Optional[Dict], float]:
+        """Take budget for one request from the first free provider in a tier.
+
+        Returns (provider, 0), or (None, seconds until a provider frees up).
+        """
+        wait = float("inf")
+        for provider in self.config["model_tiers"][tier]["providers"]:
+            provider_wait = self.limiter.try_acquire(provider_key(provider), tokens)
+            if provider_wait == 0:
+                return provider, 0.0
+            wait = min(wait, provider_wait)
+        return None, wait
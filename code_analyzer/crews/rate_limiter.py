@@ -2,35 +2,37 @@
 IMPORTANT: DO NOT MODIFY WITHOUT PERMISSION
 Contact: THE AI RE INVESTOR (405-963-2596)
 """
-from typing import Dict
-import asyncio
+from typing import Dict, Optional
 import time
 from loguru import logger
+from code_analyzer.utils.rate_limits import RateLimit, TokenBucketLimiter, get_rate_limiter
 
 class RateLimiter:
-    """Rate limiting for API calls."""
+    """Rate limiting for API calls, backed by the shared token-bucket limiter."""
     
-    def __init__(self):
-        self.last_call = 0
-        self.calls_per_minute = 50  # Default limit
-        self.min_interval = 60.0 / self.calls_per_minute
+    def __init__(self, key: str = "default", calls_per_minute: int = 50,
+                 tokens_per_minute: Optional[int] = None,
+                 limiter: Optional[TokenBucketLimiter] = None):
+        self.key = key
+        self.limiter = limiter or get_rate_limiter()
+        # Configured provider limits win; otherwise register our own
+        if key not in self.limiter.limits:
+            self.limiter.set_limit(key, RateLimit(calls_per_minute, tokens_per_minute))
         self.token_usage = {}
         
     async def should_wait(self) -> bool:
         """Check if we need to wait."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call
-        return time_since_last < self.min_interval
+        return self.limiter.wait_time(self.key) > 0
         
     async def wait(self):
-        """Wait if needed."""
-        if await self.should_wait():
-            wait_time = self.min_interval - (time.time() - self.last_call)
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+        """Wait if needed, then take one request from the budget."""
+        waited = await self.limiter.acquire(self.key)
+        if waited:
+            logger.debug(f"Rate limiting: waited {waited:.2f}s")
             
     def track_usage(self, tokens: int):
         """Track token usage."""
+        self.limiter.consume(self.key, tokens)
         current_minute = int(time.time() / 60)
         if current_minute not in self.token_usage:
             self.token_usage = {current_minute: tokens}
@@ -43,4 +45,4 @@ class RateLimiter:
         return {
             "current_minute_tokens": self.token_usage.get(current_minute, 0),
             "total_tokens": sum(self.token_usage.values())
-        } 
\ No newline at end of file
+        } 
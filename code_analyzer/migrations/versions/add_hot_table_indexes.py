@@ -0,0 +1,39 @@
+"""Add indexes for dashboard and manager queries
+
+Revision ID: add_hot_table_indexes
+Revises: initial_setup
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'add_hot_table_indexes'
+down_revision = 'initial_setup'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns); log_entries may be created by create_all
+# rather than a migration, so tables that are missing are skipped.
+INDEXES = [
+    ('idx_log_entries_timestamp', 'log_entries', ['timestamp']),
+    ('idx_log_entries_level_timestamp', 'log_entries', ['level', 'timestamp']),
+    ('idx_log_entries_crew_name_timestamp', 'log_entries', ['crew_name', 'timestamp']),
+    ('idx_crew_outputs_crew_name_timestamp', 'crew_outputs', ['crew_name', 'timestamp']),
+]
+
+def _existing_tables():
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+def upgrade():
+    tables = _existing_tables()
+    for name, table, columns in INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+def downgrade():
+    tables = _existing_tables()
+    for name, table, _ in reversed(INDEXES):
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,29 @@
+"""Add byte-offset checkpoints for the log bulk loader
+
+Revision ID: add_log_import_checkpoints
+Revises: add_log_rollups
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'add_log_import_checkpoints'
+down_revision = 'add_log_rollups'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'log_import_checkpoints',
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('offset', sa.Integer(), nullable=False),
+        sa.Column('fingerprint', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('path'),
+        if_not_exists=True
+    )
+
+def downgrade():
+    op.drop_table('log_import_checkpoints')
@@ -0,0 +1,38 @@
+"""Add log rollup tables for analytics
+
+Revision ID: add_log_rollups
+Revises: add_hot_table_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = 'add_log_rollups'
+down_revision = 'add_hot_table_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'log_rollups',
+        sa.Column('granularity', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('level', sa.String(), nullable=False),
+        sa.Column('crew_name', sa.String(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('granularity', 'bucket_start', 'level', 'crew_name'),
+        if_not_exists=True
+    )
+    op.create_table(
+        'rollup_watermarks',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('last_id', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        if_not_exists=True
+    )
+
+def downgrade():
+    op.drop_table('rollup_watermarks')
+    op.drop_table('log_rollups')
@@ -1,5 +1,6 @@
 """Models package initialization."""
 from .base import Base, init_db, get_session
-from .log_entry import LogEntry
+from .log_entry import LogEntry, LogImportCheckpoint
+from .log_rollup import LogRollup, RollupWatermark
 
-__all__ = ['Base', 'init_db', 'get_session', 'LogEntry'] 
\ No newline at end of file
+__all__ = ['Base', 'init_db', 'get_session', 'LogEntry', 'LogImportCheckpoint', 'LogRollup', 'RollupWatermark'] 
\ No newline at end of file
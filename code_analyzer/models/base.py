@@ -2,9 +2,11 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.sqlite_profile import apply_sqlite_profile
 
 DATABASE_URL = 'sqlite:///code_analyzer.db'
 engine = create_engine(DATABASE_URL)
+apply_sqlite_profile(engine)
 SessionLocal = sessionmaker(bind=engine)
 Base = declarative_base()
 
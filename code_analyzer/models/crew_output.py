@@ -1,12 +1,15 @@
 """Models for crew outputs and analysis results."""
-from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
 from datetime import datetime
 from code_analyzer.models.base import Base
 
 class CrewOutput(Base):
     """Base model for crew outputs."""
     __tablename__ = 'crew_outputs'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        Index('idx_crew_outputs_crew_name_timestamp', 'crew_name', 'timestamp'),
+        {'extend_existing': True}
+    )
     
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -1,5 +1,5 @@
 """Database manager module."""
-from sqlalchemy import inspect, text
+from sqlalchemy import inspect, text, insert, select, func
 from typing import Dict, Any, List
 from loguru import logger
 from datetime import datetime
@@ -8,6 +8,21 @@ from datetime import datetime
 from code_analyzer.models.base import get_session
 from code_analyzer.models.crew_output import CrewOutput, ErrorHandlingResult, CodeAnalysisResult
 from code_analyzer.models.log_entry import LogEntry
+from code_analyzer.models.log_rollup import LogRollup
+
+def hot_queries() -> Dict[str, Any]:
+    """Queries run on every dashboard request or by the manager, keyed by name."""
+    return {
+        "dashboard.recent_logs": select(LogEntry).order_by(LogEntry.timestamp.desc()).limit(10),
+        "dashboard.analytics": select(LogRollup.level, LogRollup.crew_name, func.sum(LogRollup.count))
+            .where(LogRollup.granularity == "hour", LogRollup.bucket_start >= datetime(2024, 1, 1))
+            .group_by(LogRollup.level, LogRollup.crew_name),
+        "rollups.compact_batch": select(LogEntry.level, LogEntry.crew_name, func.count(LogEntry.id))
+            .where(LogEntry.id > 0, LogEntry.id <= 50000)
+            .group_by(LogEntry.level, LogEntry.crew_name),
+        "manager.crew_outputs": select(CrewOutput).where(CrewOutput.crew_name == "example"),
+        "manager.recent_logs": select(LogEntry).order_by(LogEntry.timestamp.desc()).limit(100),
+    }
 
 class DatabaseManager:
     """Manager for database operations."""
@@ -118,6 +133,33 @@ class DatabaseManager:
         self.session.commit()
         return log
 
+    def save_log_entries(self, entries: List[Dict[str, Any]]) -> int:
+        """Save many log entries in a single transaction.
+        
+        Each entry is a dict of LogEntry columns (timestamp, level, message,
+        crew_name, extra_data).
+        """
+        if not entries:
+            return 0
+        try:
+            self.session.execute(insert(LogEntry), entries)
+            self.session.commit()
+            return len(entries)
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def explain(self, statement) -> List[str]:
+        """Get the SQLite query plan for a statement, one line per step."""
+        bind = self.session.get_bind()
+        compiled = statement.compile(bind, compile_kwargs={"literal_binds": True})
+        rows = self.session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")).all()
+        return [row[-1] for row in rows]
+
+    def explain_hot_queries(self) -> Dict[str, List[str]]:
+        """Get query plans for every query in hot_queries()."""
+        return {name: self.explain(statement) for name, statement in hot_queries().items()}
+
     def get_recent_logs(self, limit: int = 100) -> List[LogEntry]:
         """Get recent log entries."""
         return self.session.query(LogEntry).order_by(
@@ -75,4 +75,16 @@ class TestResult(Base):
     error_message = Column(Text, nullable=True)
     test_data = Column(JSON)  # Store coverage, etc.
     
-    event = relationship("DevelopmentEvent", back_populates="test_results")
\ No newline at end of file
+    event = relationship("DevelopmentEvent", back_populates="test_results")
+
+
+class HistoryCheckpoint(Base):
+    """Last item ingested from a history source, for incremental collection."""
+    __tablename__ = 'history_checkpoints'
+    
+    source = Column(String, primary_key=True)  # e.g. 'git:/path/to/repo'
+    last_sha = Column(String)  # HEAD of the last completed run
+    # Run in progress: its HEAD and how many commits of last_sha..target_sha are in
+    target_sha = Column(String, nullable=True)
+    position = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
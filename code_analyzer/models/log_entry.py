@@ -1,11 +1,18 @@
 """Log entry model."""
-from sqlalchemy import Column, Integer, String, DateTime, JSON, func
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index, func
 from datetime import datetime
 from code_analyzer.models.base import Base
 
 class LogEntry(Base):
     """Log entry model."""
     __tablename__ = 'log_entries'
+    __table_args__ = (
+        # Recent logs (ORDER BY timestamp DESC LIMIT n)
+        Index('idx_log_entries_timestamp', 'timestamp'),
+        # Per-level and per-crew counts and time-bounded filters
+        Index('idx_log_entries_level_timestamp', 'level', 'timestamp'),
+        Index('idx_log_entries_crew_name_timestamp', 'crew_name', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -24,3 +31,15 @@ class LogEntry(Base):
             'crew_name': self.crew_name,
             'metadata': self.extra_data or {}
         }
+
+
+class LogImportCheckpoint(Base):
+    """How far a log file has been bulk-loaded into log_entries."""
+    __tablename__ = 'log_import_checkpoints'
+    
+    path = Column(String, primary_key=True)
+    # Byte offset just past the last imported line
+    offset = Column(Integer, nullable=False, default=0)
+    # Hash of the file's first line; a change means the file was replaced
+    fingerprint = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,20 @@
+"""Pre-aggregated log counts for the analytics dashboard."""
+from sqlalchemy import Column, Integer, String, DateTime
+from code_analyzer.models.base import Base
+
+class LogRollup(Base):
+    """Log entry counts per time bucket, level and crew."""
+    __tablename__ = 'log_rollups'
+    
+    granularity = Column(String, primary_key=True)  # 'minute' or 'hour'
+    bucket_start = Column(DateTime, primary_key=True)
+    level = Column(String, primary_key=True)
+    crew_name = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+class RollupWatermark(Base):
+    """Highest log entry id folded into the rollups."""
+    __tablename__ = 'rollup_watermarks'
+    
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
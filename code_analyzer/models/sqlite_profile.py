@@ -0,0 +1,56 @@
+"""SQLite performance profile applied to every new connection."""
+import os
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# WAL lets the dashboard read while crews write; NORMAL sync is safe with WAL
+# (a power loss may drop the last commits but never corrupts the database).
+DEFAULT_PROFILE = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,           # ms to wait on a locked database
+    "cache_size": -64000,           # negative = KiB, so ~64 MB page cache
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY"
+}
+
+ENV_PREFIX = "SQLITE_"
+
+
+def load_profile(overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Build the pragma profile from defaults, environment and overrides.
+    
+    Each pragma can be overridden with an environment variable such as
+    ``SQLITE_SYNCHRONOUS=FULL``; ``SQLITE_PROFILE=off`` disables the profile.
+    """
+    if os.getenv(f"{ENV_PREFIX}PROFILE", "").lower() == "off":
+        return {}
+    profile = dict(DEFAULT_PROFILE)
+    for pragma in DEFAULT_PROFILE:
+        value = os.getenv(f"{ENV_PREFIX}{pragma.upper()}")
+        if value is not None:
+            profile[pragma] = value
+    if overrides:
+        profile.update(overrides)
+    return profile
+
+
+def apply_sqlite_profile(engine: Engine, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Set the profile's pragmas on each connection the engine opens."""
+    if engine.dialect.name != "sqlite":
+        return {}
+    profile = load_profile(overrides)
+    if not profile:
+        return profile
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma, value in profile.items():
+                cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
+
+    return profile
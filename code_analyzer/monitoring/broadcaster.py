@@ -0,0 +1,95 @@
+"""Fan-out of new log entries to dashboard WebSocket clients."""
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+from sqlalchemy import func
+from loguru import logger
+from code_analyzer.models import LogEntry, get_session
+
+
+class LogBroadcaster:
+    """Tail new log rows once and push them to every subscriber.
+
+    A single task polls for rows with an id above the last one seen, so the
+    database sees one indexed query per interval however many clients are
+    connected. Each subscriber gets a bounded queue; when a slow client's
+    queue is full its oldest pending message is dropped.
+    """
+
+    def __init__(self, poll_interval: float = 1.0, queue_size: int = 100,
+                 batch_limit: int = 500, session_factory: Callable = get_session):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.batch_limit = batch_limit
+        self.session_factory = session_factory
+        self.last_id: Optional[int] = None
+        self.dropped = 0
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client and start tailing if it is the first one."""
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        """Remove a client; tailing stops after the last one leaves."""
+        self._subscribers.discard(queue)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+            # The next subscriber starts from the newest row, not from here
+            self.last_id = None
+
+    def publish(self, message: Dict[str, Any]):
+        """Queue a message for every subscriber without waiting on any of them."""
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest message for slow clients
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    async def _run(self):
+        """Poll for new rows and publish them as deltas."""
+        try:
+            if self.last_id is None:
+                self.last_id = await asyncio.to_thread(self._max_id)
+            while True:
+                try:
+                    entries = await asyncio.to_thread(self._fetch_new)
+                    if entries:
+                        self.last_id = entries[-1]["id"]
+                        # Newest first, matching how the dashboard prepends rows
+                        self.publish({"type": "logs", "data": entries[::-1]})
+                        if len(entries) == self.batch_limit:
+                            continue  # More rows are waiting
+                except Exception as e:
+                    logger.error(f"Log broadcast failed: {e}")
+                await asyncio.sleep(self.poll_interval)
+        except asyncio.CancelledError:
+            pass
+
+    def _max_id(self) -> int:
+        session = self.session_factory()
+        try:
+            return session.query(func.max(LogEntry.id)).scalar() or 0
+        finally:
+            session.close()
+
+    def _fetch_new(self) -> List[Dict[str, Any]]:
+        session = self.session_factory()
+        try:
+            rows = session.query(LogEntry)\
+                .filter(LogEntry.id > self.last_id)\
+                .order_by(LogEntry.id)\
+                .limit(self.batch_limit)\
+                .all()
+            return [row.to_dict() for row in rows]
+        finally:
+            session.close()
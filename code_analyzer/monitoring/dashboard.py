@@ -1,14 +1,51 @@
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import func
 from loguru import logger
 from code_analyzer.models import LogEntry, get_session
+from code_analyzer.monitoring.broadcaster import LogBroadcaster
+from code_analyzer.monitoring.rollups import compact_rollups, rollup_summary
+from contextlib import asynccontextmanager, suppress
+from datetime import datetime
+from typing import Any, Dict, Optional
 import os
 import asyncio
 from fastapi import WebSocketDisconnect
 
-app = FastAPI()
+# Seconds between folding new log entries into the analytics rollups
+COMPACT_INTERVAL = 30.0
+
+def compact_once() -> int:
+    """Fold new log entries into the rollups with a session of its own."""
+    session = get_session()
+    try:
+        return compact_rollups(session)
+    finally:
+        session.close()
+
+async def compact_periodically(interval: float = COMPACT_INTERVAL):
+    """Keep the rollups current off the event loop, so /analytics only reads."""
+    while True:
+        try:
+            added = await asyncio.to_thread(compact_once)
+            if added:
+                logger.debug(f"Compacted {added} log entries into rollups")
+        except Exception as e:
+            logger.error(f"Rollup compaction failed: {e}")
+        await asyncio.sleep(interval)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    compactor = asyncio.create_task(compact_periodically())
+    try:
+        yield
+    finally:
+        compactor.cancel()
+        with suppress(asyncio.CancelledError):
+            await compactor
+
+app = FastAPI(lifespan=lifespan)
+broadcaster = LogBroadcaster()
 
 # Setup templates and static files
 templates = Jinja2Templates(directory="code_analyzer/monitoring/templates")
@@ -76,30 +113,30 @@ async def get_logs():
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates."""
+    """WebSocket endpoint pushing new log entries as they arrive."""
     await websocket.accept()
-    try:
+    queue = broadcaster.subscribe()
+    
+    async def send_updates():
         while True:
-            session = get_session()
-            try:
-                logs = session.query(LogEntry)\
-                    .order_by(LogEntry.timestamp.desc())\
-                    .limit(5)\
-                    .all()
-                
-                await websocket.send_json({
-                    "type": "logs",
-                    "data": [log.to_dict() for log in logs]
-                })
-            finally:
-                session.close()
+            await websocket.send_json(await queue.get())
             
-            await asyncio.sleep(1)  # Add delay to prevent rapid updates
+    async def wait_for_disconnect():
+        # Nothing is expected from the client; this returns when it leaves
+        while True:
+            await websocket.receive_text()
             
-    except WebSocketDisconnect:
-        pass  # Client disconnected
-    except Exception as e:
-        logger.error(f"WebSocket error: {e}")
+    tasks = [asyncio.create_task(send_updates()), asyncio.create_task(wait_for_disconnect())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error and not isinstance(error, WebSocketDisconnect):
+                logger.error(f"WebSocket error: {error}")
+    finally:
+        for task in tasks:
+            task.cancel()
+        broadcaster.unsubscribe(queue)
 
 @app.get("/DEV-NOW")
 async def dev_now(request: Request):
@@ -146,30 +183,31 @@ async def timeline(request: Request):
         session.close()
 
 @app.get("/analytics")
-async def analytics(request: Request):
-    """Analytics view."""
+async def analytics(request: Request, start: Optional[datetime] = None, end: Optional[datetime] = None):
+    """Analytics view, optionally limited to [start, end).
+
+    Reads rollup buckets only; compact_periodically keeps them current.
+    """
+    summary = await asyncio.to_thread(_rollup_summary, start, end)
+    return templates.TemplateResponse(
+        "analytics.html",
+        {
+            "request": request,
+            "total_logs": summary["total"],
+            "level_counts": summary["levels"],
+            "crew_stats": [
+                {"crew_name": crew_name, "total_ops": count}
+                for crew_name, count in summary["crews"]
+            ],
+            "start": start,
+            "end": end
+        }
+    )
+
+def _rollup_summary(start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
     session = get_session()
     try:
-        # Get analytics data
-        total_logs = session.query(func.count(LogEntry.id)).scalar()
-        level_counts = session.query(
-            LogEntry.level, 
-            func.count(LogEntry.id).label('count')
-        ).group_by(LogEntry.level).all()
-        
-        crew_stats = session.query(
-            LogEntry.crew_name,
-            func.count(LogEntry.id).label('total_ops')
-        ).group_by(LogEntry.crew_name).all()
-        
-        return templates.TemplateResponse(
-            "analytics.html",
-            {
-                "request": request,
-                "total_logs": total_logs,
-                "level_counts": dict(level_counts),
-                "crew_stats": crew_stats
-            }
-        )
+        return rollup_summary(session, start, end)
     finally:
-        session.close() 
\ No newline at end of file
+        session.close()
+
@@ -1,14 +1,21 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.pool import QueuePool
 from datetime import datetime
 from pathlib import Path
+import threading
+from code_analyzer.models.sqlite_profile import apply_sqlite_profile
 
 Base = declarative_base()
 
 class APICall(Base):
     """Track API calls and usage."""
     __tablename__ = 'api_calls'
+    __table_args__ = (
+        Index('idx_api_calls_timestamp', 'timestamp'),
+        Index('idx_api_calls_model_timestamp', 'model', 'timestamp'),
+    )
     
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -45,17 +52,52 @@ class TestRun(Base):
     duration = Column(Float)
     log_path = Column(String)
 
+DB_PATH = Path("crews/crew-output/monitoring.db")
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+_engine = None
+_init_lock = threading.Lock()
+Session = scoped_session(sessionmaker())
+
+def get_engine():
+    """Get the process-wide monitoring engine, creating the schema once."""
+    global _engine
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                engine = create_engine(
+                    f'sqlite:///{DB_PATH}',
+                    poolclass=QueuePool,
+                    pool_size=POOL_SIZE,
+                    max_overflow=MAX_OVERFLOW,
+                    connect_args={"check_same_thread": False}
+                )
+                apply_sqlite_profile(engine)
+                Base.metadata.create_all(engine)
+                # create_all skips indexes on tables that already exist
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(engine, checkfirst=True)
+                Session.configure(bind=engine)
+                _engine = engine
+    return _engine
+
 def init_db():
     """Initialize database."""
-    db_path = Path("crews/crew-output/monitoring.db")
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    engine = create_engine(f'sqlite:///{db_path}')
-    Base.metadata.create_all(engine)
-    return engine
+    return get_engine()
 
 def get_session():
-    """Get database session."""
-    engine = init_db()
-    Session = sessionmaker(bind=engine)
-    return Session() 
\ No newline at end of file
+    """Get the database session for the current thread."""
+    get_engine()
+    return Session()
+
+def dispose_engine():
+    """Close pooled connections and forget the engine (e.g. after changing DB_PATH)."""
+    global _engine
+    with _init_lock:
+        Session.remove()
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
@@ -0,0 +1,152 @@
+"""Incremental log rollups backing the analytics dashboard.
+
+``compact_rollups`` folds log entries above the stored watermark into
+per-minute and per-hour counts by level and crew. ``rollup_summary`` then
+answers total/level/crew questions for any time range by reading buckets:
+whole hours from the hour rollup and the partial hours at either end from
+the minute rollup.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from loguru import logger
+from code_analyzer.models import LogEntry, LogRollup, RollupWatermark
+
+WATERMARK = "log_entries"
+BATCH_SIZE = 50000
+UNKNOWN_LEVEL = "UNKNOWN"
+DEFAULT_CREW = "system"
+
+
+def floor_minute(value: datetime) -> datetime:
+    return value.replace(second=0, microsecond=0)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def ceil_hour(value: datetime) -> datetime:
+    floored = floor_hour(value)
+    return floored if floored == value else floored + timedelta(hours=1)
+
+
+def compact_rollups(session, batch_size: int = BATCH_SIZE) -> int:
+    """Fold new log entries into the rollups and return how many were added.
+
+    Each batch moves the watermark with a compare-and-set in the same
+    transaction as the counts, so concurrent compactors never double count:
+    the loser's update matches no row and its batch is rolled back.
+    """
+    session.execute(
+        insert(RollupWatermark).values(name=WATERMARK, last_id=0).on_conflict_do_nothing()
+    )
+    session.commit()
+
+    high = session.scalar(select(func.max(LogEntry.id))) or 0
+    added = 0
+    while True:
+        last_id = session.scalar(
+            select(RollupWatermark.last_id).where(RollupWatermark.name == WATERMARK)
+        )
+        if last_id >= high:
+            break
+        upper = min(last_id + batch_size, high)
+        claimed = session.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == WATERMARK, RollupWatermark.last_id == last_id)
+            .values(last_id=upper)
+        ).rowcount
+        if not claimed:
+            session.rollback()
+            continue
+
+        group = (
+            func.strftime('%Y-%m-%d %H:%M', LogEntry.timestamp),
+            func.coalesce(LogEntry.level, UNKNOWN_LEVEL),
+            func.coalesce(LogEntry.crew_name, DEFAULT_CREW)
+        )
+        rows = session.execute(
+            select(*group, func.count(LogEntry.id))
+            .where(LogEntry.id > last_id, LogEntry.id <= upper, LogEntry.timestamp.isnot(None))
+            .group_by(*group)
+        ).all()
+
+        counts = defaultdict(int)
+        for bucket, level, crew_name, count in rows:
+            bucket_start = datetime.strptime(bucket, '%Y-%m-%d %H:%M')
+            counts[("minute", bucket_start, level, crew_name)] += count
+            counts[("hour", floor_hour(bucket_start), level, crew_name)] += count
+            added += count
+        _add_counts(session, counts)
+        session.commit()
+
+    if added:
+        logger.debug(f"Compacted {added} log entries into rollups")
+    return added
+
+
+def _add_counts(session, counts: Dict[Tuple, int]):
+    """Upsert bucket counts, adding to existing buckets."""
+    if not counts:
+        return
+    statement = insert(LogRollup)
+    statement = statement.on_conflict_do_update(
+        index_elements=["granularity", "bucket_start", "level", "crew_name"],
+        set_={"count": LogRollup.count + statement.excluded.count}
+    )
+    session.execute(statement, [
+        {"granularity": g, "bucket_start": b, "level": level, "crew_name": crew, "count": count}
+        for (g, b, level, crew), count in counts.items()
+    ])
+
+
+def _bucket_ranges(start: Optional[datetime], end: Optional[datetime]) -> List[Tuple]:
+    """Split [start, end) into (granularity, from, to) bucket ranges."""
+    if start is None and end is None:
+        return [("hour", None, None)]
+    start = floor_minute(start) if start else None
+    end = floor_minute(end) if end else None
+    hour_start = ceil_hour(start) if start else None
+    hour_end = floor_hour(end) if end else None
+    if hour_start and hour_end and hour_start >= hour_end:
+        return [("minute", start, end)]
+
+    ranges = [("hour", hour_start, hour_end)]
+    if start and start < hour_start:
+        ranges.append(("minute", start, hour_start))
+    if end and hour_end < end:
+        ranges.append(("minute", hour_end, end))
+    return ranges
+
+
+def rollup_summary(session, start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Dict[str, Any]:
+    """Get total, per-level and per-crew counts for [start, end) at minute resolution."""
+    conditions = []
+    for granularity, low, high in _bucket_ranges(start, end):
+        clauses = [LogRollup.granularity == granularity]
+        if low is not None:
+            clauses.append(LogRollup.bucket_start >= low)
+        if high is not None:
+            clauses.append(LogRollup.bucket_start < high)
+        conditions.append(and_(*clauses))
+
+    rows = session.execute(
+        select(LogRollup.level, LogRollup.crew_name, func.sum(LogRollup.count))
+        .where(or_(*conditions))
+        .group_by(LogRollup.level, LogRollup.crew_name)
+    ).all()
+
+    levels = defaultdict(int)
+    crews = defaultdict(int)
+    for level, crew_name, count in rows:
+        levels[level] += count
+        crews[crew_name] += count
+    return {
+        "total": sum(levels.values()),
+        "levels": dict(levels),
+        "crews": sorted(crews.items(), key=lambda item: -item[1])
+    }
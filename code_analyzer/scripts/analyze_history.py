@@ -9,76 +9,84 @@ from rich.table import Table
 from code_analyzer.models.db_manager import DatabaseManager
 from code_analyzer.models.crew_output import CrewOutput
 from code_analyzer.models.log_entry import LogEntry
+from code_analyzer.utils.git_history import CommitTable, load_commit_table
+from code_analyzer.utils.git_analytics import vectorized_git_patterns
+from code_analyzer.utils.log_scanner import scan_logs
+from typing import Any, Dict
 
 console = Console()
 
+def git_patterns_from_table(table: CommitTable) -> Dict[str, Any]:
+    """Count commits by author, hour, weekday and file with Python loops."""
+    commit_analysis = {
+        "total_commits": len(table),
+        "authors": defaultdict(int),
+        "file_changes": defaultdict(int),
+        "commit_times": defaultdict(int),
+        "commit_days": defaultdict(int)
+    }
+
+    for row in range(len(table)):
+        # Author analysis
+        commit_analysis["authors"][table.authors[table.author_ids[row]]] += 1
+        
+        # Time analysis
+        dt = datetime.fromtimestamp(table.timestamps[row])
+        commit_analysis["commit_times"][dt.hour] += 1
+        commit_analysis["commit_days"][dt.strftime("%A")] += 1
+        
+    # File changes
+    for file_id in table.file_ids:
+        commit_analysis["file_changes"][table.paths[file_id]] += 1
+    return commit_analysis
+
 class DevelopmentAnalyzer:
-    def __init__(self):
+    # NumPy mode also adds churn, hotspots and rolling activity
+    vectorized = False
+
+    def __init__(self, vectorized: bool = False):
         self.db = DatabaseManager()
         self.repo = git.Repo(".")
         self.analysis = defaultdict(dict)
+        self.vectorized = vectorized
 
     def analyze_git_patterns(self):
         """Analyze git commit patterns."""
-        commits = list(self.repo.iter_commits())
-        
-        # Analyze commit patterns
-        commit_analysis = {
-            "total_commits": len(commits),
-            "authors": defaultdict(int),
-            "file_changes": defaultdict(int),
-            "commit_times": defaultdict(int),
-            "commit_days": defaultdict(int)
-        }
-
-        for commit in commits:
-            # Author analysis
-            commit_analysis["authors"][commit.author.name] += 1
-            
-            # Time analysis
-            dt = datetime.fromtimestamp(commit.committed_date)
-            commit_analysis["commit_times"][dt.hour] += 1
-            commit_analysis["commit_days"][dt.strftime("%A")] += 1
-            
-            # File changes
-            for file in commit.stats.files:
-                commit_analysis["file_changes"][file] += 1
-
-        self.analysis["git"] = commit_analysis
+        table = load_commit_table(self.repo.working_dir)
+        if self.vectorized:
+            self.analysis["git"] = vectorized_git_patterns(table)
+        else:
+            self.analysis["git"] = git_patterns_from_table(table)
 
     def analyze_logs(self):
         """Analyze log patterns."""
         log_dir = Path("code_analyzer/core/output/logs")
-        log_analysis = {
-            "total_logs": 0,
-            "levels": defaultdict(int),
-            "crews": defaultdict(int),
-            "errors": [],
-            "warnings": []
+        log_files = sorted(log_dir.glob("*.log")) if log_dir.exists() else []
+        aggregate, throughput = scan_logs(log_files)
+
+        def sampled(level):
+            sample = aggregate.samples.get(level)
+            return sample.items if sample else []
+
+        def top(level):
+            counter = aggregate.top_messages.get(level)
+            return counter.most_common() if counter else []
+
+        # errors/warnings are bounded samples; *_count has the exact totals
+        self.analysis["logs"] = {
+            "total_logs": aggregate.total_lines,
+            "levels": defaultdict(int, aggregate.levels),
+            "crews": defaultdict(int, aggregate.crews),
+            "errors": sampled("ERROR"),
+            "warnings": sampled("WARNING"),
+            "error_count": aggregate.levels.get("ERROR", 0),
+            "warning_count": aggregate.levels.get("WARNING", 0),
+            "top_errors": top("ERROR"),
+            "top_warnings": top("WARNING"),
+            "bytes_scanned": aggregate.bytes_scanned,
+            "mb_per_second": round(throughput, 2)
         }
 
-        if log_dir.exists():
-            for log_file in log_dir.glob("*.log"):
-                with open(log_file) as f:
-                    for line in f:
-                        log_analysis["total_logs"] += 1
-                        parts = line.split("|")
-                        if len(parts) >= 4:
-                            level = parts[1].strip()
-                            message = parts[2].strip()
-                            log_analysis["levels"][level] += 1
-                            
-                            if "crew_name" in parts[3]:
-                                crew = parts[3].split("crew_name")[1].split('"')[2]
-                                log_analysis["crews"][crew] += 1
-                            
-                            if level == "ERROR":
-                                log_analysis["errors"].append(message)
-                            elif level == "WARNING":
-                                log_analysis["warnings"].append(message)
-
-        self.analysis["logs"] = log_analysis
-
     def analyze_crew_performance(self):
         """Analyze crew performance patterns."""
         crew_analysis = defaultdict(lambda: {
@@ -178,5 +186,9 @@ class DevelopmentAnalyzer:
             json.dump(self.analysis, f, indent=2)
 
 if __name__ == "__main__":
-    analyzer = DevelopmentAnalyzer()
+    import argparse
+    parser = argparse.ArgumentParser(description="Analyze development history")
+    parser.add_argument("--vectorized", action="store_true",
+                        help="Use NumPy git analytics (adds churn, hotspots, rolling activity)")
+    analyzer = DevelopmentAnalyzer(vectorized=parser.parse_args().vectorized)
     analyzer.analyze_all() 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Benchmark analyzer.analyze_directory throughput on a synthetic tree."""
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from code_analyzer.analyzer import analyze_directory
+
+MODULE_TEMPLATE = '''"""Synthetic module {index}."""
+import os
+import sys
+
+
+class Model{index}:
+    """Synthetic class."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def compute(self, factor):
+        if factor > 1:
+            return self.value * factor
+        return self.value
+
+
+def helper_{index}(items):
+    total = 0
+    for item in items:
+        total += item
+    return total
+'''
+
+
+def generate_tree(root: Path, file_count: int, files_per_dir: int = 100) -> None:
+    """Generate a synthetic package tree with ``file_count`` Python modules."""
+    for index in range(file_count):
+        package = root / f"pkg_{index // files_per_dir}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"module_{index}.py").write_text(MODULE_TEMPLATE.format(index=index))
+
+
+def run_benchmark(file_count: int, worker_counts, chunk_size: int) -> None:
+    """Time analyze_directory for each worker count and print files/sec."""
+    root = Path(tempfile.mkdtemp(prefix="code_analyzer_bench_"))
+    try:
+        generate_tree(root, file_count)
+        print(f"Generated {file_count} files in {root}")
+        print(f"{'workers':>8} {'seconds':>10} {'files/sec':>12}")
+
+        for workers in worker_counts:
+            processed = []
+            start = time.perf_counter()
+            analyze_directory(root, workers=workers, chunk_size=chunk_size,
+                              on_result=processed.append)
+            elapsed = time.perf_counter() - start
+            print(f"{workers:>8} {elapsed:>10.2f} {len(processed) / elapsed:>12.0f}")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark directory analysis throughput")
+    parser.add_argument("--files", type=int, default=5000, help="Number of synthetic files")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, os.cpu_count() or 1}),
+                        help="Worker counts to compare")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Files per worker batch")
+    args = parser.parse_args()
+    run_benchmark(args.files, args.workers, args.chunk_size)
@@ -0,0 +1,69 @@
+"""Benchmark complexity pre-scoring: substring counts against cached tokenize metrics."""
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import List
+from loguru import logger
+from code_analyzer.crews.handlers.analysis_queue import AnalysisQueue
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.complexity import score_files
+
+FUNCTION = 'def handler_{i}(value):\n    """Return value; a def in a docstring."""\n    if value:\n        return value\n\n'
+CLASS = "class Model{i}:\n    async def run(self):\n        pass\n\n"
+DOC_HEAVY = '"""\nUsage: class X / def y / async z, repeated.\n"""\n# class def async\n'
+
+
+def generate_files(root: Path, count: int, rng: random.Random) -> List[Path]:
+    files = []
+    for i in range(count):
+        parts = [DOC_HEAVY * rng.randrange(0, 8)]
+        parts += [FUNCTION.format(i=j) for j in range(rng.randrange(0, 12))]
+        parts += [CLASS.format(i=j) for j in range(rng.randrange(0, 4))]
+        path = root / f"m_{i}.py"
+        path.write_text("".join(parts) or "x = 1\n")
+        files.append(path)
+    return files
+
+
+def legacy_score(file: Path) -> float:
+    """The previous _analyze_complexity, minus the chardet fallback."""
+    content = file.read_text(encoding="utf-8")
+    score = len(content) / 1000
+    score += content.count("class ") * 2
+    score += content.count("def ") * 1.5
+    score += content.count("async ") * 1.5
+    return score
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark complexity pre-scoring")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    logger.remove()
+    workdir = Path(tempfile.mkdtemp(prefix="complexity-bench-"))
+    try:
+        (workdir / "src").mkdir()
+        files = generate_files(workdir / "src", args.files, random.Random(0))
+        tier = AnalysisQueue._determine_tier
+
+        start = time.perf_counter()
+        legacy = {file: legacy_score(file) for file in files}
+        print(f"{'substring counts':<18} {time.perf_counter() - start:7.2f}s")
+
+        cache = AnalysisCache(workdir / "cache.db")
+        for label in ["tokenize (cold)", "tokenize (warm)"]:
+            start = time.perf_counter()
+            scores = score_files(files, cache=cache, workers=args.workers)
+            print(f"{label:<18} {time.perf_counter() - start:7.2f}s")
+        cache.close()
+
+        moved = sum(tier(None, legacy[f]) != tier(None, scores[f]["score"]) for f in files)
+        print(f"{moved} of {len(files)} files change tier once strings and comments are ignored")
+    finally:
+        shutil.rmtree(workdir)
@@ -0,0 +1,77 @@
+"""Benchmark CostEstimator: serial estimate against fast mode (cold and warm)
+and a cold stratified sample."""
+import time
+import argparse
+import tempfile
+from pathlib import Path
+import tiktoken
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.cost_estimator import CostEstimator
+
+
+def generate_tree(root: Path, files: int, ignored_files: int):
+    functions = [f"def function_{i}(value):\n    return value * {i} + len('{i}')\n\n" for i in range(160)]
+    source = "".join(functions[:40])
+    for i in range(files):
+        package = root / f"pkg_{i % 50}"
+        package.mkdir(parents=True, exist_ok=True)
+        # Sizes from one function to 160, so files fall into every tier
+        body = "".join(functions[:1 + (i * 37) % 160])
+        (package / f"module_{i}.py").write_text(f"# module {i}\n{body}")
+    for i in range(ignored_files):
+        package = root / ".venv" / "lib" / f"dep_{i % 200}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"vendored_{i}.py").write_text(source)
+
+
+def offline_encoding() -> tiktoken.Encoding:
+    """Byte-level stand-in when the real BPE files cannot be downloaded."""
+    return tiktoken.Encoding(name="bytes", pat_str=r"\w+|\s+|[^\w\s]+",
+                             mergeable_ranks={bytes([i]): i for i in range(256)}, special_tokens={})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark CostEstimator fast mode")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--ignored-files", type=int, default=20000,
+                        help="Files under .venv that the walk should skip")
+    parser.add_argument("--sample", type=int, default=200, help="Files tokenized in sample mode")
+    args = parser.parse_args()
+
+    try:
+        tiktoken.encoding_for_model("gpt-3.5-turbo")
+    except Exception:
+        print("tiktoken encodings unavailable offline, using a byte-level encoding")
+        encoding = offline_encoding()
+        tiktoken.encoding_for_model = lambda model: encoding
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "project"
+        generate_tree(root, args.files, args.ignored_files)
+        estimator = CostEstimator(cache=AnalysisCache(Path(tmp) / "cache.db"))
+
+        timings = {}
+        for mode, fast in [("serial", False), ("fast cold", True), ("fast warm", True)]:
+            start = time.perf_counter()
+            estimate = estimator.estimate_project(str(root), fast=fast)
+            timings[mode] = time.perf_counter() - start
+            assert estimate["summary"]["total_files"] == args.files
+        exact = estimate["summary"]
+
+        estimator.cache.clear()
+        start = time.perf_counter()
+        sampled = estimator.estimate_project(str(root), sample=args.sample)
+        timings["sample cold"] = time.perf_counter() - start
+
+    print(f"{args.files} files, {args.ignored_files} ignored under .venv")
+    for mode, seconds in timings.items():
+        print(f"{mode:>11} {seconds:>8.2f}s")
+    margins = sampled["sample"]["margins"]
+    print(f"sampled {sampled['sample']['sampled_files']} files: "
+          f"tokens {sampled['summary']['total_tokens']} ± {margins['total_tokens']:.0f} "
+          f"(exact {exact['total_tokens']}), "
+          f"cost ${sampled['summary']['estimated_cost']:.2f} ± {margins['estimated_cost']:.2f} "
+          f"(exact ${exact['estimated_cost']:.2f})")
+    print(f"cold speedup: {timings['serial'] / timings['fast cold']:.1f}x, "
+          f"warm speedup: {timings['serial'] / timings['fast warm']:.1f}x, "
+          f"sample speedup: {timings['serial'] / timings['sample cold']:.1f}x")
@@ -0,0 +1,73 @@
+"""Benchmark file discovery: rglob + stat against scandir scans and manifest diffs."""
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from code_analyzer.utils.discovery import DiscoveryService
+from code_analyzer.utils.ignore import DEFAULT_PATTERNS, IgnoreMatcher
+
+
+def generate_tree(root: Path, packages: int, dirs: int, files: int):
+    for p in range(packages):
+        for d in range(dirs):
+            directory = root / f"pkg_{p}" / f"dir_{d}"
+            directory.mkdir(parents=True)
+            for f in range(files):
+                (directory / f"m_{f}.py").write_text(f"x = {p * d * f}\n")
+        cache = root / f"pkg_{p}" / "__pycache__"
+        cache.mkdir()
+        for f in range(files):
+            (cache / f"m_{f}.cpython-311.pyc").write_bytes(b"\0" * 16)
+
+
+def legacy_scan(root: Path, matcher: IgnoreMatcher):
+    """rglob everything, then filter and stat each path."""
+    found = []
+    for file in root.rglob("*.py"):
+        if file.is_file() and not matcher.is_ignored(file.relative_to(root)):
+            stat = file.stat()
+            found.append((file, stat.st_size, stat.st_mtime_ns))
+    return found
+
+
+def timed(label: str, func, count_of=len):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {count_of(result):>7} files  {elapsed * 1000:8.1f} ms")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark file discovery")
+    parser.add_argument("--packages", type=int, default=16)
+    parser.add_argument("--dirs", type=int, default=25)
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="discovery-bench-"))
+    try:
+        root = workdir / "tree"
+        generate_tree(root, args.packages, args.dirs, args.files)
+        matcher = IgnoreMatcher(DEFAULT_PATTERNS)
+        manifest = workdir / "manifest.json"
+
+        def discovery(workers=1):
+            return DiscoveryService(root, matcher, suffixes={".py"}, workers=workers,
+                                    manifest_path=manifest)
+
+        timed("rglob + stat", lambda: legacy_scan(root, matcher))
+        timed("scandir", lambda: discovery().scan())
+        timed(f"scandir x{args.workers}", lambda: discovery(args.workers).scan())
+        timed("changes (cold)", lambda: discovery(args.workers).changes(save=True),
+              lambda diff: len(diff.added))
+        timed("changes (warm)", lambda: discovery(args.workers).changes(save=True),
+              lambda diff: len(diff.unchanged))
+        for file in list(root.glob("pkg_0/dir_0/*.py"))[:10]:
+            file.write_text("changed = True\n")
+        timed("changes (10 edited)", lambda: discovery(args.workers).changes(save=True),
+              lambda diff: len(diff.changed))
+    finally:
+        shutil.rmtree(workdir)
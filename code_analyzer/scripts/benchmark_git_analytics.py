@@ -0,0 +1,49 @@
+"""Benchmark NumPy git analytics against the dict-based DevelopmentAnalyzer path."""
+import time
+import argparse
+from array import array
+import numpy as np
+from code_analyzer.utils.git_history import CommitTable
+from code_analyzer.utils.git_analytics import vectorized_git_patterns
+from code_analyzer.scripts.analyze_history import git_patterns_from_table
+
+
+def synthetic_table(commits: int, files_per_commit: int, authors: int, paths: int, seed: int = 0) -> CommitTable:
+    """Build a CommitTable directly from random columns (no git involved)."""
+    rng = np.random.default_rng(seed)
+    table = CommitTable()
+    table.shas = [f"{i:040x}" for i in range(commits)]
+    table.messages = [""] * commits
+    table.timestamps = array("q", np.sort(rng.integers(1_500_000_000, 1_700_000_000, commits)).tobytes())
+    table.author_ids = array("l", rng.integers(0, authors, commits).astype(np.int_).tobytes())
+    counts = rng.integers(1, files_per_commit * 2, commits)
+    table.file_offsets = array("l", np.concatenate(([0], np.cumsum(counts))).astype(np.int_).tobytes())
+    rows = int(counts.sum())
+    # Skewed path popularity so there are real hotspots
+    table.file_ids = array("l", (rng.zipf(1.3, rows) % paths).astype(np.int_).tobytes())
+    table.additions = array("l", rng.integers(0, 50, rows).astype(np.int_).tobytes())
+    table.deletions = array("l", rng.integers(0, 30, rows).astype(np.int_).tobytes())
+    table.authors = [f"author_{i}" for i in range(authors)]
+    table.paths = [f"src/module_{i}.py" for i in range(paths)]
+    return table
+
+
+def time_it(func, table: CommitTable) -> float:
+    start = time.perf_counter()
+    func(table)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark git analytics modes")
+    parser.add_argument("--files-per-commit", type=int, default=5)
+    parser.add_argument("--authors", type=int, default=200)
+    parser.add_argument("--paths", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'commits':>9} {'file rows':>10} {'dict':>8} {'numpy':>8} {'speedup':>8}")
+    for commits in [10_000, 100_000, 500_000]:
+        table = synthetic_table(commits, args.files_per_commit, args.authors, args.paths)
+        legacy = time_it(git_patterns_from_table, table)
+        vectorized = time_it(vectorized_git_patterns, table)
+        print(f"{commits:>9} {len(table.file_ids):>10} {legacy:>7.2f}s {vectorized:>7.2f}s {legacy / vectorized:>7.1f}x")
@@ -0,0 +1,107 @@
+"""Benchmark git history ingestion on a generated local repository."""
+import time
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from itertools import islice
+from datetime import datetime
+import git
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.development_timeline import DevelopmentEvent, FileChange
+from code_analyzer.scripts.collect_history import HistoryCollector
+from code_analyzer.utils import git_history
+
+
+def generate_repo(path: Path, commits: int, files: int = 200, files_per_commit: int = 3):
+    """Create a repository with ``commits`` commits using git fast-import."""
+    subprocess.run(["git", "init", "-q", "-b", "main", str(path)], check=True)
+    lines = []
+    timestamp = 1700000000
+    for i in range(commits):
+        lines.append("commit refs/heads/main")
+        lines.append(f"committer Bench <bench@example.com> {timestamp + i * 60} +0000")
+        message = f"change {i}\n"
+        lines.append(f"data {len(message)}")
+        lines.append(message)
+        for j in range(files_per_commit):
+            content = "".join(f"line {k} of commit {i}\n" for k in range((i + j) % 20 + 1))
+            lines.append(f"M 644 inline src/module_{(i * files_per_commit + j) % files}.py")
+            lines.append(f"data {len(content)}")
+            lines.append(content)
+    stream = ("\n".join(lines) + "\n").encode()
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=stream, check=True)
+    subprocess.run(["git", "checkout", "-q", "main"], cwd=path, check=True)
+
+
+def add_commits(path: Path, count: int):
+    """Append small commits on top of the generated history."""
+    for i in range(count):
+        (path / "src" / "extra.py").write_text(f"value = {i}\n")
+        subprocess.run(["git", "add", "-A"], cwd=path, check=True)
+        subprocess.run(["git", "-c", "user.name=Bench", "-c", "user.email=bench@example.com",
+                        "commit", "-q", "-m", f"extra {i}"], cwd=path, check=True)
+
+
+def legacy_collect(repo_path: Path, session, limit: int):
+    """The previous approach: commit.stats per commit, one commit at the end."""
+    repo = git.Repo(repo_path)
+    for commit in islice(repo.iter_commits(), limit):
+        event = DevelopmentEvent(
+            event_type="commit",
+            title=commit.message.split('\n')[0],
+            description=commit.message,
+            timestamp=datetime.fromtimestamp(commit.committed_date),
+            event_data={"author": commit.author.name, "hash": commit.hexsha,
+                        "branch": repo.active_branch.name}
+        )
+        for file_path, stats in commit.stats.files.items():
+            event.files_changed.append(FileChange(file_path=file_path, change_type="modify",
+                                                  change_data=stats))
+        session.add(event)
+    session.commit()
+
+
+def make_session(db_path: Path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HistoryCollector git ingestion")
+    parser.add_argument("--commits", type=int, default=20000)
+    parser.add_argument("--legacy-commits", type=int, default=1000,
+                        help="Commits ingested with commit.stats (it is much slower)")
+    parser.add_argument("--new-commits", type=int, default=20, help="Commits added for the incremental run")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo_path = Path(tmp) / "repo"
+        git_history.DEFAULT_CACHE_DIR = Path(tmp) / "cache"
+        generate_repo(repo_path, args.commits)
+
+        start = time.perf_counter()
+        legacy_collect(repo_path, make_session(Path(tmp) / "legacy.db"), args.legacy_commits)
+        legacy = args.legacy_commits / (time.perf_counter() - start)
+
+        collector = HistoryCollector(str(repo_path), chunk_size=args.chunk_size)
+        collector.db.session = make_session(Path(tmp) / "streamed.db")
+        start = time.perf_counter()
+        full = collector.collect_git_history()
+        full_elapsed = time.perf_counter() - start
+
+        add_commits(repo_path, args.new_commits)
+        start = time.perf_counter()
+        incremental = collector.collect_git_history()
+        incremental_elapsed = time.perf_counter() - start
+
+    streamed = full / full_elapsed
+    print(f"{'mode':>12} {'commits':>8} {'seconds':>8} {'commits/s':>10}")
+    print(f"{'commit.stats':>12} {args.legacy_commits:>8} {args.legacy_commits / legacy:>8.2f} {legacy:>10.0f}")
+    print(f"{'streamed':>12} {full:>8} {full_elapsed:>8.2f} {streamed:>10.0f}")
+    print(f"{'incremental':>12} {incremental:>8} {incremental_elapsed:>8.2f}")
+    print(f"speedup: {streamed / legacy:.1f}x")
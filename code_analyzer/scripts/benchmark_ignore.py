@@ -0,0 +1,81 @@
+"""Benchmark ignore matching: per-pattern fnmatch loop against the compiled matcher."""
+import time
+import random
+import fnmatch
+import argparse
+from typing import List
+from code_analyzer.utils.ignore import IgnoreMatcher
+
+
+def generate_patterns(count: int, rng: random.Random) -> List[str]:
+    patterns = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            patterns.append(f"*.ext{i}")
+        elif kind == 1:
+            patterns.append(f"/generated_{i}/")
+        elif kind == 2:
+            patterns.append(f"pkg_{i % 50}/**/fixture_{i}.json")
+        elif kind == 3:
+            patterns.append(f"build_{i}/")
+        else:
+            patterns.append(f"!keep_{rng.randrange(count)}.ext{rng.randrange(count)}")
+    return patterns
+
+
+def generate_paths(count: int, rng: random.Random) -> List[str]:
+    paths = []
+    for i in range(count):
+        depth = rng.randrange(1, 6)
+        parts = [f"pkg_{rng.randrange(60)}"] + [f"dir_{rng.randrange(30)}" for _ in range(depth - 1)]
+        extension = rng.choice(["py", "md", "json", f"ext{rng.randrange(600)}"])
+        paths.append("/".join(parts + [f"file_{i}.{extension}"]))
+    return paths
+
+
+def legacy_should_ignore(patterns: List[str], path: str) -> bool:
+    """The previous FileCounter.should_ignore loop."""
+    for pattern in patterns:
+        if pattern.startswith('!'):
+            if fnmatch.fnmatch(path, pattern[1:]):
+                return False
+        elif fnmatch.fnmatch(path, pattern):
+            return True
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compiled ignore matching")
+    parser.add_argument("--patterns", type=int, default=500)
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--legacy-paths", type=int, default=10000,
+                        help="Paths checked with the fnmatch loop (it is much slower)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    patterns = generate_patterns(args.patterns, rng)
+    paths = generate_paths(args.paths, rng)
+
+    start = time.perf_counter()
+    matcher = IgnoreMatcher(patterns)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths[:args.legacy_paths]:
+        legacy_should_ignore(patterns, path)
+    legacy = args.legacy_paths / (time.perf_counter() - start)
+
+    rates = {}
+    for name, check in [("match", matcher.match), ("is_ignored", matcher.is_ignored)]:
+        start = time.perf_counter()
+        ignored = sum(1 for path in paths if check(path))
+        rates[name] = args.paths / (time.perf_counter() - start)
+
+    print(f"{args.patterns} patterns, {args.paths} paths ({ignored} ignored), compiled in {compile_time * 1000:.0f}ms")
+    print(f"{'mode':>12} {'paths/s':>10}")
+    print(f"{'fnmatch':>12} {legacy:>10.0f}")
+    for name, rate in rates.items():
+        print(f"{name:>12} {rate:>10.0f}")
+    print(f"speedup: {rates['match'] / legacy:.0f}x (single path), "
+          f"{rates['is_ignored'] / legacy:.0f}x (with parent directories)")
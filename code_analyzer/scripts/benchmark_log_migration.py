@@ -0,0 +1,85 @@
+"""Benchmark migrate_logs: per-line ORM inserts against the chunked bulk loader."""
+import re
+import time
+import argparse
+import tempfile
+from pathlib import Path
+import pendulum
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.log_entry import LogEntry
+from migrate_logs import migrate_logs
+
+LEVELS = ["INFO", "DEBUG", "WARNING", "ERROR"]
+MESSAGES = ["Starting CodeAnalysisCrew task {i}", "crew docs wrote section {i}",
+            "the review crew scored file {i}", "Cache miss for key {i}"]
+
+
+def generate_logs(directory: Path, files: int, lines: int):
+    for n in range(files):
+        with open(directory / f"crew_{n}.log", "w") as f:
+            for i in range(lines):
+                f.write(f"2024-01-01 12:{i % 60:02d}:{i % 60:02d},{i % 1000:03d} | "
+                        f"{LEVELS[i % 4]:<8} | {MESSAGES[i % 4].format(i=i)}\n")
+
+
+def legacy_migrate(log_dir: Path, session) -> int:
+    """The previous loader: one ORM object per line, commit per file."""
+    total = 0
+    for log_file in log_dir.glob("*.log"):
+        with open(log_file) as f:
+            for line in f:
+                if match := re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) \| (\w+)\s+\| (.+)', line):
+                    timestamp, level, message = match.groups()
+                    crew = "unknown"
+                    for pattern in [r'(\w+Crew)', r'crew (\w+)', r'(\w+) crew']:
+                        if crew_match := re.search(pattern, message, re.IGNORECASE):
+                            crew = crew_match.group(1)
+                            break
+                    session.add(LogEntry(
+                        timestamp=pendulum.parse(timestamp), level=level, message=message,
+                        crew_name=crew,
+                        extra_data={"source_file": str(log_file), "migrated_at": pendulum.now().isoformat()}
+                    ))
+                    total += 1
+        session.commit()
+    return total
+
+
+def make_session(db_path: Path):
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark log migration throughput")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=50000, help="Lines per file")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp) / "logs"
+        log_dir.mkdir()
+        generate_logs(log_dir, args.files, args.lines)
+
+        start = time.perf_counter()
+        legacy = legacy_migrate(log_dir, make_session(Path(tmp) / "legacy.db"))
+        legacy_elapsed = time.perf_counter() - start
+
+        db_path = Path(tmp) / "bulk.db"
+        start = time.perf_counter()
+        bulk = migrate_logs([log_dir], make_session(db_path), args.chunk_size)
+        bulk_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rerun = migrate_logs([log_dir], make_session(db_path), args.chunk_size)
+        rerun_elapsed = time.perf_counter() - start
+
+    print(f"{'mode':>8} {'lines':>8} {'seconds':>8} {'lines/s':>10}")
+    print(f"{'legacy':>8} {legacy:>8} {legacy_elapsed:>8.2f} {legacy / legacy_elapsed:>10.0f}")
+    print(f"{'bulk':>8} {bulk:>8} {bulk_elapsed:>8.2f} {bulk / bulk_elapsed:>10.0f}")
+    print(f"{'rerun':>8} {rerun:>8} {rerun_elapsed:>8.2f}")
+    print(f"speedup: {legacy_elapsed / bulk_elapsed:.1f}x")
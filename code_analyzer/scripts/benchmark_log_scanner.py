@@ -0,0 +1,76 @@
+"""Benchmark log scanning: the old line loop against the parallel scanner."""
+import os
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from collections import defaultdict
+from code_analyzer.utils.log_scanner import scan_logs
+
+LEVELS = ["INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR"]
+CREWS = ["CodeAnalysisCrew", "DocumentationCrew", "ErrorHandlerCrew", "TestCrew"]
+
+
+def generate_logs(directory: Path, files: int, mb_per_file: int):
+    for n in range(files):
+        with open(directory / f"app_{n}.log", "w") as f:
+            i = 0
+            while f.tell() < mb_per_file * 1024 * 1024:
+                f.write(f"2024-01-01T12:{i % 60:02d}:{i % 60:02d} | {LEVELS[i % len(LEVELS)]} | "
+                        f"Processed item {i % 1000} in {i % 97}ms | "
+                        f'{{"crew_name": "{CREWS[i % len(CREWS)]}", "request": {i}}}\n')
+                i += 1
+
+
+def legacy_scan(paths):
+    """The previous analyze_logs loop, keeping every error and warning."""
+    analysis = {"total_logs": 0, "levels": defaultdict(int), "crews": defaultdict(int),
+                "errors": [], "warnings": []}
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                analysis["total_logs"] += 1
+                parts = line.split("|")
+                if len(parts) >= 4:
+                    level = parts[1].strip()
+                    message = parts[2].strip()
+                    analysis["levels"][level] += 1
+                    if "crew_name" in parts[3]:
+                        analysis["crews"][parts[3].split("crew_name")[1].split('"')[2]] += 1
+                    if level == "ERROR":
+                        analysis["errors"].append(message)
+                    elif level == "WARNING":
+                        analysis["warnings"].append(message)
+    return analysis
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel log scanning")
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--mb-per-file", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_logs(Path(tmp), args.files, args.mb_per_file)
+        paths = sorted(Path(tmp).glob("*.log"))
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+
+        start = time.perf_counter()
+        legacy = legacy_scan(paths)
+        legacy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        aggregate, throughput = scan_logs(paths, workers=args.workers)
+        scan_elapsed = time.perf_counter() - start
+
+    assert aggregate.total_lines == legacy["total_logs"]
+    assert dict(aggregate.levels) == dict(legacy["levels"])
+    assert dict(aggregate.crews) == dict(legacy["crews"])
+    kept = sum(len(s.items) for s in aggregate.samples.values())
+    print(f"input: {total_mb:.0f} MB, {legacy['total_logs']} lines, {os.cpu_count()} cores")
+    print(f"{'mode':>8} {'seconds':>8} {'MB/s':>8} {'messages kept':>14}")
+    print(f"{'legacy':>8} {legacy_elapsed:>8.2f} {total_mb / legacy_elapsed:>8.1f} "
+          f"{len(legacy['errors']) + len(legacy['warnings']):>14}")
+    print(f"{'scanner':>8} {scan_elapsed:>8.2f} {throughput:>8.1f} {kept:>14}")
+    print(f"speedup: {legacy_elapsed / scan_elapsed:.1f}x")
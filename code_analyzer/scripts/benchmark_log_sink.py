@@ -0,0 +1,63 @@
+"""Benchmark database log sinks in records/sec."""
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.db_manager import DatabaseManager
+from code_analyzer.utils.logging import DatabaseLogHandler
+
+
+def make_db(path: Path) -> DatabaseManager:
+    """DatabaseManager bound to a fresh SQLite file."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    db = DatabaseManager()
+    db.session = sessionmaker(bind=engine)()
+    return db
+
+
+def per_record_sink(db: DatabaseManager):
+    """The previous sink: one commit per record."""
+    def sink(message):
+        record = message.record
+        db.save_log_entry(
+            level=record["level"].name,
+            message=record["message"],
+            metadata={"function": record["function"], "line": record["line"]},
+            crew_name=record["extra"].get("crew_name", "system")
+        )
+    return sink
+
+
+def run(sink, count: int) -> float:
+    """Log ``count`` records through ``sink`` and return records/sec."""
+    logger.remove()
+    start = time.perf_counter()
+    sink_id = logger.add(sink, level="INFO")
+    for i in range(count):
+        logger.bind(crew_name="benchmark").info(f"benchmark record {i}")
+    logger.remove(sink_id)  # Includes the final flush for the batched sink
+    return count / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark database log sinks")
+    parser.add_argument("--records", type=int, default=20000, help="Records for the batched sink")
+    parser.add_argument("--legacy-records", type=int, default=2000,
+                        help="Records for the per-commit sink (it is much slower)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = run(per_record_sink(make_db(Path(tmp) / "legacy.db")), args.legacy_records)
+        batched = run(DatabaseLogHandler(batch_size=args.batch_size, overflow="block",
+                                         db=make_db(Path(tmp) / "batched.db")), args.records)
+
+    print(f"{'sink':>12} {'records/sec':>12}")
+    print(f"{'per-commit':>12} {legacy:>12.0f}")
+    print(f"{'batched':>12} {batched:>12.0f}")
+    print(f"speedup: {batched / legacy:.1f}x")
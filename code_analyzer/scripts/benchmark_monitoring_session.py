@@ -0,0 +1,44 @@
+"""Benchmark monitoring session acquisition latency."""
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.monitoring import models
+
+
+def legacy_session():
+    """The previous get_session: new engine and schema check per call."""
+    engine = create_engine(f'sqlite:///{models.DB_PATH}')
+    models.Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def measure(factory, iterations: int) -> float:
+    """Mean microseconds to acquire a session and run one query."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        session = factory()
+        session.execute(text("SELECT 1"))
+        session.close()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark monitoring get_session")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        models.dispose_engine()
+        models.DB_PATH = Path(tmp) / "monitoring.db"
+        legacy = measure(legacy_session, args.iterations)
+        models.get_session().close()  # Exclude one-time engine creation
+        pooled = measure(models.get_session, args.iterations)
+        models.dispose_engine()
+
+    print(f"{'get_session':>12} {'us/call':>10}")
+    print(f"{'per-call':>12} {legacy:>10.1f}")
+    print(f"{'pooled':>12} {pooled:>10.1f}")
+    print(f"speedup: {legacy / pooled:.1f}x")
@@ -0,0 +1,86 @@
+"""Benchmark single-pass pattern detection against the multi-walk approach."""
+import ast
+import time
+import argparse
+from code_analyzer.utils.ast_helpers import DetectionEngine
+from code_analyzer.crews.analysis_crews.pattern_detector import (
+    CodeSmellDetector, DesignPatternDetector, AntiPatternDetector, MetricsDetector
+)
+
+
+def generate_module(class_count: int, methods_per_class: int) -> str:
+    """Generate a large module with many classes and methods."""
+    lines = []
+    for c in range(class_count):
+        lines.append(f"class Service{c}:")
+        lines.append("    _instance = None")
+        for m in range(methods_per_class):
+            prefix = "create" if m % 10 == 0 else "handle"
+            lines.append(f"    def {prefix}_{m}(self, a, b, c, d, e, f):")
+            lines.append("        if a:")
+            lines.append("            for item in b:")
+            lines.append("                c += item")
+            lines.append("        return c")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def multi_walk(tree: ast.AST) -> int:
+    """Reproduce the previous detector: seven full walks plus one per class for each check."""
+    found = 0
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef):
+            found += len(node.body) > 20
+            found += len(node.args.args) > 5
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef):
+            has_instance = any(isinstance(n, ast.Name) and n.id == "_instance" for n in ast.walk(node))
+            has_get = any(isinstance(n, ast.FunctionDef) and n.name == "getInstance" for n in ast.walk(node))
+            found += has_instance and has_get
+            found += any(isinstance(n, ast.FunctionDef) and n.name.startswith(('create', 'make', 'build'))
+                         for n in ast.walk(node))
+    for node in ast.walk(tree):
+        found += isinstance(node, ast.ClassDef) and len(node.body) > 30
+    found += len([n for n in ast.walk(tree) if isinstance(n, ast.ClassDef)])
+    found += len([n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef)])
+    complexity = 0.0
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.If, ast.While, ast.For)):
+            complexity += 1
+        elif isinstance(node, ast.FunctionDef):
+            complexity += len(node.args.args) * 0.1
+    return found
+
+
+def single_pass(tree: ast.AST) -> int:
+    """Run all detectors through one DetectionEngine traversal."""
+    smells, design, anti, metrics = (
+        CodeSmellDetector(), DesignPatternDetector(), AntiPatternDetector(), MetricsDetector()
+    )
+    DetectionEngine([smells, design, anti, metrics]).run(tree)
+    return len(smells.matches) + len(design.matches) + len(anti.matches)
+
+
+def time_it(func, tree: ast.AST, repeat: int) -> float:
+    """Best-of-``repeat`` wall time for ``func(tree)``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(tree)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark PatternDetector traversal")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    args = parser.parse_args()
+
+    print(f"{'classes':>8} {'methods':>8} {'lines':>8} {'multi-walk':>11} {'single':>8} {'speedup':>8}")
+    for class_count, methods in [(20, 10), (100, 40), (300, 60)]:
+        source = generate_module(class_count, methods)
+        tree = ast.parse(source)
+        legacy = time_it(multi_walk, tree, args.repeat)
+        fused = time_it(single_pass, tree, args.repeat)
+        print(f"{class_count:>8} {methods:>8} {source.count(chr(10)) + 1:>8} "
+              f"{legacy:>10.3f}s {fused:>7.3f}s {legacy / fused:>7.1f}x")
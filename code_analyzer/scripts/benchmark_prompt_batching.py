@@ -0,0 +1,54 @@
+"""Compare one request per file against packed batches on a tree of small modules."""
+import time
+import random
+import argparse
+from code_analyzer.utils.prompt_batcher import (
+    BATCH_SYSTEM_PROMPT, CHARS_PER_TOKEN, SMALL_FILE_TOKENS, BatchItem,
+    build_batch_prompt, pack_items
+)
+
+SINGLE_SYSTEM_PROMPT = "You are a code analysis expert."
+# Fixed per-request cost: message framing plus the typical response preamble
+REQUEST_OVERHEAD_TOKENS = 30
+
+
+def generate_items(count: int, rng: random.Random):
+    items = []
+    for n in range(count):
+        # Mostly tiny modules (__init__, constants, small helpers), a few large ones
+        size = rng.choice([40, 120, 400, 900, 1600]) if rng.random() < 0.9 else rng.randrange(5000, 20000)
+        items.append(BatchItem(n, f"pkg/module_{n}.py", "x = 1\n" * (size // 6)))
+    return items
+
+
+def prompt_tokens(system: str, user: str) -> int:
+    return (len(system) + len(user)) // CHARS_PER_TOKEN + REQUEST_OVERHEAD_TOKENS
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark prompt batching")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--budget", type=int, default=4000, help="Prompt tokens per batch")
+    parser.add_argument("--max-files", type=int, default=50)
+    args = parser.parse_args()
+
+    items = generate_items(args.files, random.Random(0))
+    single_tokens = sum(
+        prompt_tokens(SINGLE_SYSTEM_PROMPT, f"Analyze this code:\n\n{item.content}") for item in items
+    )
+
+    start = time.perf_counter()
+    small = [item for item in items if item.tokens < SMALL_FILE_TOKENS]
+    large = [item for item in items if item.tokens >= SMALL_FILE_TOKENS]
+    batches = pack_items(small, args.budget, args.max_files)
+    elapsed = time.perf_counter() - start
+    batched_tokens = sum(
+        prompt_tokens(SINGLE_SYSTEM_PROMPT, f"Analyze this code:\n\n{item.content}") for item in large
+    ) + sum(prompt_tokens(BATCH_SYSTEM_PROMPT, build_batch_prompt(batch)[1]) for batch in batches)
+
+    requests = len(batches) + len(large)
+    print(f"files: {len(items)} ({len(small)} small)")
+    print(f"one per file:  {len(items):6d} requests  {single_tokens:9d} prompt tokens")
+    print(f"batched:       {requests:6d} requests  {batched_tokens:9d} prompt tokens  "
+          f"(packing {elapsed * 1000:.1f} ms)")
+    print(f"small files per batch: {len(small) / max(1, len(batches)):.1f}")
@@ -0,0 +1,184 @@
+"""Simulate AnalysisQueue scheduling against fake providers on a virtual clock.
+
+The event loop's clock only moves when every task is waiting, jumping
+straight to the next timer, so minutes of provider latency and rate limit
+waits run in milliseconds. The legacy policy (round-robin tier batches,
+each file awaited in turn, flat 1s retry) runs on the same workload.
+"""
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import selectors
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from statistics import mean
+from typing import Dict, List, Tuple
+from loguru import logger
+from code_analyzer.crews.handlers.analysis_queue import AnalysisQueue, TIERS
+from code_analyzer.crews.handlers.rate_limit import RateLimitHandler
+from code_analyzer.utils.rate_limits import TokenBucketLimiter, limits_from_config, provider_key
+
+SIM_CONFIG = {
+    "model_tiers": {
+        "fast": {"providers": [
+            {"name": "sim", "model": "fast-a", "rate_limit": 8000, "cost": 0.002},
+            {"name": "sim", "model": "fast-b", "rate_limit": 6000, "cost": 0.001},
+        ]},
+        "balanced": {"providers": [{"name": "sim", "model": "large", "rate_limit": 4000, "cost": 0.03}]},
+        "depth": {"providers": [{"name": "sim", "model": "large", "rate_limit": 4000, "cost": 0.03}]},
+    },
+    "analysis_phases": {
+        "fast": {"concurrent_requests": 6, "batch_size": 10},
+        "balanced": {"concurrent_requests": 3, "batch_size": 10},
+        "depth": {"concurrent_requests": 2, "batch_size": 10},
+    }
+}
+# Seconds of fixed latency, and tokens processed per second, per tier
+LATENCY = {"fast": (0.5, 2000), "balanced": (2.0, 500), "depth": (4.0, 300)}
+
+
+class VirtualClockSelector(selectors.SelectSelector):
+    """Never blocks: a select with a timeout advances the loop's clock instead."""
+
+    def __init__(self):
+        super().__init__()
+        self.loop = None
+
+    def select(self, timeout=None):
+        ready = super().select(0)
+        if not ready and timeout:
+            self.loop.now += timeout
+        return ready
+
+
+class InlineExecutor(ThreadPoolExecutor):
+    """Runs submitted calls immediately, so no virtual time passes while a
+    worker thread would still be busy."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose time() is simulated."""
+
+    def __init__(self):
+        self.now = 0.0
+        selector = VirtualClockSelector()
+        super().__init__(selector)
+        selector.loop = self
+        self.set_default_executor(InlineExecutor(max_workers=1))
+
+    def time(self) -> float:
+        return self.now
+
+
+def generate_files(root: Path, count: int, rng: random.Random) -> List[Path]:
+    files = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            body = "x = 1\n" * rng.randrange(10, 200)
+        elif kind < 0.9:
+            body = "def f():\n    pass\n" * rng.randrange(4, 9)
+        else:
+            body = "class C:\n    async def f(self):\n        pass\n" * rng.randrange(4, 12)
+        path = root / f"m_{i}.py"
+        path.write_text(body)
+        files.append(path)
+    return files
+
+
+def make_handler(loop: VirtualClockLoop, state: Path) -> RateLimitHandler:
+    limiter = TokenBucketLimiter(limits_from_config(SIM_CONFIG), path=state, clock=loop.time)
+    handler = RateLimitHandler(limiter=limiter, monitor=object())
+    handler.config = SIM_CONFIG
+    return handler
+
+
+def make_processor(loop: VirtualClockLoop, tiers: Dict[Path, str],
+                   completions: Dict[str, List[float]]):
+    async def process(file: Path, provider: Dict) -> Tuple[str, float]:
+        tier = tiers[file]
+        latency, throughput = LATENCY[tier]
+        await asyncio.sleep(latency + file.stat().st_size / 4 / throughput)
+        completions.setdefault(tier, []).append(loop.time())
+        return str(file), loop.time()
+    return process
+
+
+async def legacy_process(queue: AnalysisQueue, limiter: TokenBucketLimiter) -> None:
+    """The old loop: round-robin batches, each file awaited before the next."""
+    while any(queue.queues.values()):
+        for tier in queue.queues:
+            if not queue.queues[tier]:
+                continue
+            batch_size = SIM_CONFIG["analysis_phases"][tier]["batch_size"]
+            batch = [queue.queues[tier].pop(0) for _ in range(min(batch_size, len(queue.queues[tier])))]
+            provider = queue.rate_handler.get_available_provider(tier)
+            if provider is None:
+                queue.queues[tier].extend(batch)
+                await asyncio.sleep(1)
+                continue
+            for item in batch:
+                # The old handler waited for budget in place
+                while limiter.try_acquire(provider_key(provider), item.tokens) > 0:
+                    await asyncio.sleep(1)
+                await queue.processor(item.file, provider)
+
+
+def simulate(files: List[Path], workdir: Path, legacy: bool) -> Dict[str, float]:
+    loop = VirtualClockLoop()
+    completions: Dict[str, List[float]] = {}
+    tiers: Dict[Path, str] = {}
+    handler = make_handler(loop, workdir / f"limits_{legacy}.db")
+    queue = AnalysisQueue(SIM_CONFIG, rate_handler=handler,
+                          processor=make_processor(loop, tiers, completions))
+    queue.add_files(files)
+    for tier, items in queue.queues.items():
+        tiers.update((item.file, tier) for item in items)
+        if legacy:
+            items.sort()
+
+    start = time.perf_counter()
+    try:
+        if legacy:
+            loop.run_until_complete(legacy_process(queue, handler.limiter))
+        else:
+            loop.run_until_complete(queue.process_queues())
+    finally:
+        loop.close()
+        handler.limiter.close()
+    stats = {"makespan": loop.now, "wall": time.perf_counter() - start}
+    for tier, times in completions.items():
+        stats[f"{tier}_mean"] = mean(times)
+        stats[f"{tier}_files"] = len(times)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate analysis queue scheduling")
+    parser.add_argument("--files", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logger.remove()
+    with tempfile.TemporaryDirectory(prefix="scheduler-bench-") as tmp:
+        workdir = Path(tmp)
+        (workdir / "src").mkdir()
+        files = generate_files(workdir / "src", args.files, random.Random(args.seed))
+        for label, legacy in [("legacy round-robin", True), ("fair scheduler", False)]:
+            stats = simulate(files, workdir, legacy)
+            tiers = "  ".join(
+                f"{tier} {stats.get(tier + '_files', 0)} files mean {stats.get(tier + '_mean', 0):7.1f}s"
+                for tier in TIERS
+            )
+            print(f"{label:<20} makespan {stats['makespan']:8.1f}s (sim)  {tiers}  "
+                  f"[{stats['wall']:.2f}s wall]")
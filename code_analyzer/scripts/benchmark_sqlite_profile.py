@@ -0,0 +1,74 @@
+"""Benchmark concurrent dashboard reads and crew writes with and without the SQLite profile."""
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.exc import OperationalError
+from code_analyzer.models.base import Base
+from code_analyzer.models.log_entry import LogEntry
+from code_analyzer.models.sqlite_profile import apply_sqlite_profile
+
+
+def run(db_path: Path, profiled: bool, writers: int, readers: int, duration: float) -> dict:
+    """Run writer and reader threads against one database for ``duration`` seconds."""
+    engine = create_engine(f"sqlite:///{db_path}", pool_size=writers + readers)
+    if profiled:
+        apply_sqlite_profile(engine)
+    Base.metadata.create_all(engine)
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer(index: int):
+        while not stop.is_set():
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(LogEntry), [
+                        {"level": "INFO", "message": f"writer {index}", "crew_name": f"crew_{index}"}
+                        for _ in range(10)
+                    ])
+                with lock:
+                    counts["writes"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+
+    def reader():
+        query = select(LogEntry.level, func.count(LogEntry.id)).group_by(LogEntry.level)
+        while not stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    conn.execute(query).all()
+                    conn.execute(select(LogEntry).order_by(LogEntry.id.desc()).limit(10)).all()
+                with lock:
+                    counts["reads"] += 1
+            except OperationalError:
+                with lock:
+                    counts["locked"] += 1
+
+    threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return {key: value / duration if key != "locked" else value for key, value in counts.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SQLite profile under concurrent load")
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per run")
+    args = parser.parse_args()
+
+    print(f"{'profile':>10} {'commits/s':>10} {'reads/s':>10} {'locked':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, profiled in [("default", False), ("tuned", True)]:
+            stats = run(Path(tmp) / f"{name}.db", profiled, args.writers, args.readers, args.duration)
+            print(f"{name:>10} {stats['writes']:>10.0f} {stats['reads']:>10.0f} {stats['locked']:>8}")
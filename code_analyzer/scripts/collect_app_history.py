@@ -5,6 +5,8 @@ import json
 from datetime import datetime
 from code_analyzer.models.db_manager import DatabaseManager
 from code_analyzer.models.development_timeline import DevelopmentEvent
+from code_analyzer.utils.git_history import load_commit_table
+from code_analyzer.utils.log_scanner import iter_log_records
 from loguru import logger
 
 class AppHistoryCollector:
@@ -16,15 +18,17 @@ class AppHistoryCollector:
     def collect_git_history(self):
         """Collect all git commits."""
         logger.info("Collecting git history...")
-        for commit in self.repo.iter_commits():
+        table = load_commit_table(self.repo.working_dir)
+        for row in reversed(range(len(table))):  # Newest first, like iter_commits
+            message = table.messages[row]
             self.history.append({
                 "type": "git",
-                "timestamp": datetime.fromtimestamp(commit.committed_date),
-                "title": commit.message.split('\n')[0],
-                "description": commit.message,
-                "author": commit.author.name,
-                "files": list(commit.stats.files.keys()),
-                "hash": commit.hexsha
+                "timestamp": datetime.fromtimestamp(table.timestamps[row]),
+                "title": message.split('\n')[0],
+                "description": message,
+                "author": table.authors[table.author_ids[row]],
+                "files": [path for path, _, _ in table.files(row)],
+                "hash": table.shas[row]
             })
 
     def collect_log_history(self):
@@ -32,21 +36,17 @@ class AppHistoryCollector:
         logger.info("Collecting application logs...")
         log_dir = Path("code_analyzer/core/output/logs")
         if log_dir.exists():
-            for log_file in log_dir.glob("*.log"):
-                with open(log_file) as f:
-                    for line in f:
-                        try:
-                            parts = line.split("|")
-                            if len(parts) >= 4:
-                                self.history.append({
-                                    "type": "log",
-                                    "timestamp": datetime.fromisoformat(parts[0].strip()),
-                                    "level": parts[1].strip(),
-                                    "message": parts[2].strip(),
-                                    "metadata": parts[3].strip()
-                                })
-                        except Exception as e:
-                            logger.error(f"Error parsing log line: {e}")
+            for timestamp, level, message, metadata in iter_log_records(sorted(log_dir.glob("*.log"))):
+                try:
+                    self.history.append({
+                        "type": "log",
+                        "timestamp": datetime.fromisoformat(timestamp),
+                        "level": level,
+                        "message": message,
+                        "metadata": metadata
+                    })
+                except Exception as e:
+                    logger.error(f"Error parsing log line: {e}")
 
     def collect_crew_history(self):
         """Collect all crew operations."""
@@ -6,72 +6,152 @@ from datetime import datetime
 from code_analyzer.models.db_manager import DatabaseManager
 from code_analyzer.models.development_timeline import (
     DevelopmentEvent, FileChange, ShellCommand, 
-    CrewOperation, TestResult
+    CrewOperation, TestResult, HistoryCheckpoint
 )
+from code_analyzer.utils.git_log import GitCommit
+from code_analyzer.utils.git_history import CommitTable, load_commit_table
+from code_analyzer.utils.log_scanner import iter_log_records
+from sqlalchemy import insert
+from typing import List, Optional
+from loguru import logger
 import json
 from code_analyzer.models.crew_output import CrewOutput
 from code_analyzer.models.log_entry import LogEntry
 
+CHUNK_SIZE = 1000
+
 class HistoryCollector:
-    def __init__(self):
+    def __init__(self, repo_path: str = ".", chunk_size: int = CHUNK_SIZE):
         self.db = DatabaseManager()
-        self.repo = git.Repo(".")
-        self.root_dir = Path(".")
+        self.repo = git.Repo(repo_path)
+        self.root_dir = Path(repo_path)
+        self.chunk_size = chunk_size
+        self.checkpoint_source = f"git:{Path(self.repo.working_dir).resolve()}"
+
+    def collect_git_history(self) -> int:
+        """Collect git commits added since the last run.
+        
+        Commits come oldest first from the shared commit table and are
+        inserted in chunks. Each chunk commits together with the checkpoint,
+        which records the run's target HEAD and how many commits of
+        ``last_sha..target`` are in; ``last_sha`` moves to the target only
+        when the run completes. An interrupted run resumes at that position,
+        so no commit is inserted twice even when merges interleave history.
+        """
+        checkpoint = self.db.session.get(HistoryCheckpoint, self.checkpoint_source)
+        since = checkpoint.last_sha if checkpoint else None
+        target = checkpoint.target_sha if checkpoint else None
+        position = (checkpoint.position or 0) if target else 0
+        if since and not self._commit_exists(since):
+            logger.warning(f"Checkpoint {since} is no longer in history, collecting all commits")
+            since, target, position = None, None, 0
+        branch = self._branch_name()
+        
+        table = load_commit_table(self.repo.working_dir)
+        if not table.head:
+            return 0
+        total = 0
+        if target and target != table.head:
+            if self._is_ancestor(target, table.head):
+                # Finish the interrupted run before moving on to the new HEAD
+                total += self._collect_range(table, since, target, position, branch)
+                since = target
+            else:
+                logger.warning(f"Interrupted run target {target} is no longer in history, restarting it")
+            position = 0
+        total += self._collect_range(table, since, table.head, position, branch)
+        logger.info(f"Collected {total} new commits")
+        return total
+
+    def _collect_range(self, table: CommitTable, since: Optional[str], target: str,
+                       position: int, branch: Optional[str]) -> int:
+        """Insert commits of ``since..target`` from ``position`` on, then complete the run."""
+        rows = table.rows_since(self.repo.working_dir, since, target)
+        total = 0
+        for start in range(position, len(rows), self.chunk_size):
+            chunk = [table.commit(row) for row in rows[start:start + self.chunk_size]]
+            total += self._insert_commits(chunk, branch)
+            self._save_checkpoint(since, target, start + len(chunk))
+        self._save_checkpoint(target, None, 0)
+        return total
 
-    def collect_git_history(self):
-        """Collect all git history."""
-        for commit in self.repo.iter_commits():
-            # Create development event for each commit
-            event = DevelopmentEvent(
-                event_type="commit",
-                title=commit.message.split('\n')[0],
-                description=commit.message,
-                timestamp=datetime.fromtimestamp(commit.committed_date),
-                event_data={
-                    "author": commit.author.name,
-                    "hash": commit.hexsha,
-                    "branch": self.repo.active_branch.name
+    def _insert_commits(self, commits: List[GitCommit], branch: Optional[str]) -> int:
+        """Bulk insert one chunk of commits; committed with the next checkpoint."""
+        session = self.db.session
+        event_ids = session.scalars(
+            insert(DevelopmentEvent).returning(DevelopmentEvent.id, sort_by_parameter_order=True),
+            [
+                {
+                    "event_type": "commit",
+                    "title": commit.summary,
+                    "description": commit.message,
+                    "timestamp": datetime.fromtimestamp(commit.committed_date),
+                    "event_data": {
+                        "author": commit.author_name,
+                        "hash": commit.hexsha,
+                        "branch": branch
+                    }
                 }
-            )
+                for commit in commits
+            ]
+        ).all()
+        
+        file_changes = [
+            {
+                "event_id": event_id,
+                "file_path": file_path,
+                "change_type": "modify",
+                "change_data": stats
+            }
+            for event_id, commit in zip(event_ids, commits)
+            for file_path, stats in commit.files.items()
+        ]
+        if file_changes:
+            session.execute(insert(FileChange), file_changes)
+        return len(commits)
+
+    def _save_checkpoint(self, last_sha: Optional[str], target: Optional[str], position: int):
+        self.db.session.merge(HistoryCheckpoint(
+            source=self.checkpoint_source,
+            last_sha=last_sha,
+            target_sha=target,
+            position=position,
+            updated_at=datetime.utcnow()
+        ))
+        self.db.session.commit()
+
+    def _is_ancestor(self, ancestor: str, sha: str) -> bool:
+        return self._commit_exists(ancestor) and self.repo.is_ancestor(ancestor, sha)
 
-            # Track file changes
-            for file_path, stats in commit.stats.files.items():
-                file_change = FileChange(
-                    file_path=file_path,
-                    change_type="modify",
-                    change_data=stats
-                )
-                event.files_changed.append(file_change)
+    def _commit_exists(self, sha: str) -> bool:
+        try:
+            self.repo.commit(sha)
+            return True
+        except (ValueError, git.BadName):
+            return False
 
-            self.db.session.add(event)
+    def _branch_name(self) -> Optional[str]:
+        try:
+            return self.repo.active_branch.name
+        except TypeError:
+            return None  # Detached HEAD
 
     def collect_log_history(self):
         """Collect all existing logs."""
         log_dir = Path("code_analyzer/core/output/logs")
         if log_dir.exists():
-            for log_file in log_dir.glob("*.log"):
-                with open(log_file) as f:
-                    for line in f:
-                        # Parse log line and create event
-                        try:
-                            # Basic parsing - enhance based on your log format
-                            parts = line.split("|")
-                            if len(parts) >= 4:
-                                timestamp = parts[0].strip()
-                                level = parts[1].strip()
-                                message = parts[2].strip()
-                                metadata = parts[3].strip()
-
-                                event = DevelopmentEvent(
-                                    event_type="log",
-                                    title=f"Log Entry: {level}",
-                                    description=message,
-                                    timestamp=datetime.fromisoformat(timestamp),
-                                    event_data={"metadata": metadata}
-                                )
-                                self.db.session.add(event)
-                        except Exception as e:
-                            print(f"Error parsing log line: {e}")
+            for timestamp, level, message, metadata in iter_log_records(sorted(log_dir.glob("*.log"))):
+                try:
+                    event = DevelopmentEvent(
+                        event_type="log",
+                        title=f"Log Entry: {level}",
+                        description=message,
+                        timestamp=datetime.fromisoformat(timestamp),
+                        event_data={"metadata": metadata}
+                    )
+                    self.db.session.add(event)
+                except Exception as e:
+                    print(f"Error parsing log line: {e}")
 
     def collect_crew_history(self):
         """Collect crew operation history."""
@@ -0,0 +1,113 @@
+"""Load test dashboard log streaming with many simulated WebSocket clients.
+
+Starts the dashboard with uvicorn against a temporary database, connects
+``--clients`` WebSocket clients, writes log entries at ``--rate`` per second
+and reports delivery latency, messages per client and database queries.
+"""
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+import uvicorn
+import websockets
+from sqlalchemy import create_engine, event
+
+
+async def client(url: str, received: list, stop: asyncio.Event):
+    """Collect (receive time, entry) pairs until stopped."""
+    async with websockets.connect(url) as ws:
+        while not stop.is_set():
+            try:
+                message = await asyncio.wait_for(ws.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            now = time.time()
+            for entry in json.loads(message)["data"]:
+                received.append((now, entry))
+
+
+def writer(rate: float, duration: float, sent: dict):
+    """Insert log entries at ``rate`` per second, recording send times by message."""
+    from code_analyzer.models import LogEntry, get_session
+    session = get_session()
+    end = time.time() + duration
+    i = 0
+    while time.time() < end:
+        message = f"load test {i}"
+        sent[message] = time.time()
+        session.add(LogEntry(level="INFO", message=message, crew_name="load_test"))
+        session.commit()
+        i += 1
+        time.sleep(1 / rate)
+    session.close()
+
+
+def bind_database(db_path: Path):
+    """Point the main database sessions at a scratch SQLite file."""
+    from code_analyzer.models import base
+    from code_analyzer.models.sqlite_profile import apply_sqlite_profile
+    engine = create_engine(f"sqlite:///{db_path}")
+    apply_sqlite_profile(engine)
+    base.Base.metadata.create_all(engine)
+    base.SessionLocal.configure(bind=engine)
+    return engine
+
+
+async def main(args, db_path: Path):
+    from code_analyzer.monitoring import dashboard
+
+    engine = bind_database(db_path)
+    queries = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_selects(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries["count"] += 1
+
+    dashboard.broadcaster.poll_interval = args.poll_interval
+
+    server = uvicorn.Server(uvicorn.Config(dashboard.app, port=args.port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    url = f"ws://127.0.0.1:{args.port}/ws"
+    stop = asyncio.Event()
+    received = [[] for _ in range(args.clients)]
+    clients = [asyncio.create_task(client(url, r, stop)) for r in received]
+    await asyncio.sleep(1)
+
+    sent = {}
+    queries["count"] = 0
+    await asyncio.to_thread(writer, args.rate, args.duration, sent)
+    await asyncio.sleep(args.poll_interval * 2)
+    stop.set()
+    await asyncio.gather(*clients)
+    server.should_exit = True
+    await server_task
+
+    latencies = [(at - sent[e["message"]]) * 1000 for r in received for at, e in r if e["message"] in sent]
+    delivered = [len(r) for r in received]
+    writes = len(sent)
+    print(f"clients: {args.clients}, entries written: {writes}")
+    print(f"delivered per client: min {min(delivered)}, max {max(delivered)}")
+    print(f"latency ms: p50 {statistics.median(latencies):.0f}, "
+          f"p95 {statistics.quantiles(latencies, n=20)[-1]:.0f}")
+    print(f"dashboard SELECTs during run: {queries['count']} "
+          f"({queries['count'] / args.duration:.1f}/s), dropped messages: {dashboard.broadcaster.dropped}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test dashboard WebSocket streaming")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50, help="Log entries per second")
+    parser.add_argument("--duration", type=float, default=5, help="Seconds of writes")
+    parser.add_argument("--poll-interval", type=float, default=0.25)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(main(args, Path(tmp) / "dashboard.db"))
@@ -0,0 +1,255 @@
+"""Persistent content-hash keyed cache for analysis results.
+
+Entries are keyed by ``namespace``, an analyzer ``version`` and the hash of
+the analyzed content, so results survive across runs until either the
+content or the analyzer changes. Values are stored as JSON in a SQLite file
+and the least recently used entries are evicted once ``max_bytes`` is
+exceeded. Hits only note their access time in memory; the times are written
+in one statement with the next write, on close, or every ``TOUCH_BATCH``
+hits, so a run over an unchanged tree stays read-only.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+from loguru import logger
+
+DEFAULT_CACHE_PATH = Path("crews/crew-output/cache/analysis_cache.db")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Keys per ``IN (...)`` query, below SQLite's host parameter limit
+BATCH_KEYS = 500
+# Pending last_access updates written at once
+TOUCH_BATCH = 1000
+
+
+def content_hash(content: Union[str, bytes]) -> str:
+    """Return the SHA-256 hex digest of file content."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class AnalysisCache:
+    """Size-bounded LRU cache of analysis results stored on disk."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._total_bytes = 0
+        # key -> last access time not yet written
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the cache database on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " key TEXT PRIMARY KEY,"
+                " namespace TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " value TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_last_access"
+                " ON cache_entries (last_access)"
+            )
+            conn.commit()
+            self._total_bytes = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(namespace: str, version: str, digest: str) -> str:
+        """Build the cache key for a piece of content."""
+        return f"{namespace}:{version}:{digest}"
+
+    def get(self, namespace: str, version: str, digest: str) -> Optional[Any]:
+        """Return the cached value or None, refreshing its LRU position."""
+        key = self.make_key(namespace, version, digest)
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                self._touch(conn, [key])
+                self.hits += 1
+                return json.loads(row[0])
+            except sqlite3.Error as e:
+                logger.warning(f"Analysis cache read failed: {e}")
+                self.misses += 1
+                return None
+
+    def set(self, namespace: str, version: str, digest: str, value: Any) -> None:
+        """Store a JSON-serializable value and evict old entries if over budget."""
+        key = self.make_key(namespace, version, digest)
+        payload = json.dumps(value, default=str)
+        size = len(payload)
+        with self._lock:
+            try:
+                conn = self._connect()
+                self._flush_touched(conn)
+                previous = conn.execute(
+                    "SELECT size FROM cache_entries WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries"
+                    " (key, namespace, size, last_access, value) VALUES (?, ?, ?, ?, ?)",
+                    (key, namespace, size, time.time(), payload)
+                )
+                self._total_bytes += size - (previous[0] if previous else 0)
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Analysis cache write failed: {e}")
+
+    def get_many(self, namespace: str, version: str, digests: Iterable[str]) -> Dict[str, Any]:
+        """Look up many digests in one transaction; returns {digest: value} for hits."""
+        keys = {self.make_key(namespace, version, digest): digest for digest in set(digests)}
+        found: Dict[str, Any] = {}
+        with self._lock:
+            try:
+                conn = self._connect()
+                hit_keys: List[str] = []
+                key_list = list(keys)
+                for start in range(0, len(key_list), BATCH_KEYS):
+                    batch = key_list[start:start + BATCH_KEYS]
+                    rows = conn.execute(
+                        "SELECT key, value FROM cache_entries WHERE key IN"
+                        f" ({','.join('?' * len(batch))})", batch
+                    ).fetchall()
+                    for key, value in rows:
+                        found[keys[key]] = json.loads(value)
+                        hit_keys.append(key)
+                self._touch(conn, hit_keys)
+            except sqlite3.Error as e:
+                logger.warning(f"Analysis cache read failed: {e}")
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, namespace: str, version: str, values: Dict[str, Any]) -> None:
+        """Store many {digest: value} entries in one transaction."""
+        rows = []
+        for digest, value in values.items():
+            payload = json.dumps(value, default=str)
+            rows.append((self.make_key(namespace, version, digest), namespace, len(payload), payload))
+        with self._lock:
+            try:
+                conn = self._connect()
+                self._flush_touched(conn)
+                previous = 0
+                for start in range(0, len(rows), BATCH_KEYS):
+                    batch = [row[0] for row in rows[start:start + BATCH_KEYS]]
+                    previous += conn.execute(
+                        "SELECT COALESCE(SUM(size), 0) FROM cache_entries WHERE key IN"
+                        f" ({','.join('?' * len(batch))})", batch
+                    ).fetchone()[0]
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO cache_entries"
+                    " (key, namespace, size, last_access, value) VALUES (?, ?, ?, ?, ?)",
+                    [(key, ns, size, now, payload) for key, ns, size, payload in rows]
+                )
+                self._total_bytes += sum(row[2] for row in rows) - previous
+                if self._total_bytes > self.max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Analysis cache write failed: {e}")
+
+    def _touch(self, conn: sqlite3.Connection, keys: List[str]) -> None:
+        """Note hits for the LRU; written once enough are pending."""
+        now = time.time()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH:
+            self._flush_touched(conn)
+            conn.commit()
+
+    def _flush_touched(self, conn: sqlite3.Connection) -> None:
+        """Write pending access times in the current transaction."""
+        if self._touched:
+            conn.executemany(
+                "UPDATE cache_entries SET last_access = ? WHERE key = ?",
+                [(when, key) for key, when in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries until under 90% of the budget."""
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute(
+            "SELECT key, size FROM cache_entries ORDER BY last_access ASC"
+        ).fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+        conn.executemany("DELETE FROM cache_entries WHERE key = ?", evicted)
+        logger.debug(f"Evicted {len(evicted)} analysis cache entries")
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM cache_entries")
+            conn.commit()
+            self._touched.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size."""
+        with self._lock:
+            entries = self._connect().execute(
+                "SELECT COUNT(*) FROM cache_entries"
+            ).fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        """Write pending access times and close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._flush_touched(self._conn)
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Analysis cache write failed: {e}")
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Get the process-wide analysis cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = AnalysisCache()
+    return _default_cache
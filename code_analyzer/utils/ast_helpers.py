@@ -1,6 +1,7 @@
 """AST parsing utilities for code analysis."""
 import ast
-from typing import Optional, Dict, Any
+from collections import defaultdict
+from typing import Optional, Dict, Any, Callable, Iterable, List
 from loguru import logger
 
 def parse_code_safely(code: str) -> Optional[ast.AST]:
@@ -24,3 +25,49 @@ def count_node_lines(node: ast.AST) -> int:
     if hasattr(node, 'lineno') and hasattr(node, 'end_lineno'):
         return node.end_lineno - node.lineno + 1
     return 0
+
+class DetectionEngine(ast.NodeVisitor):
+    """Single-pass AST traversal that dispatches nodes to registered detectors.
+    
+    Detectors call ``register`` (and optionally ``register_exit``) with the
+    node types they care about. ``run`` then visits the tree once and every
+    handler is called with ``(node, engine)``. ``class_stack`` holds the
+    enclosing ``ClassDef`` nodes of the node being visited.
+    """
+    
+    def __init__(self, detectors: Iterable[Any] = ()):
+        self._enter: Dict[type, List[Callable]] = defaultdict(list)
+        self._exit: Dict[type, List[Callable]] = defaultdict(list)
+        self.class_stack: List[ast.ClassDef] = []
+        for detector in detectors:
+            detector.register(self)
+    
+    def register(self, node_type: type, handler: Callable) -> None:
+        """Call ``handler`` when a node of ``node_type`` is entered."""
+        self._enter[node_type].append(handler)
+    
+    def register_exit(self, node_type: type, handler: Callable) -> None:
+        """Call ``handler`` after a node of ``node_type`` and its subtree are visited."""
+        self._exit[node_type].append(handler)
+    
+    def run(self, tree: ast.AST) -> None:
+        """Visit the whole tree once."""
+        self.class_stack = []
+        self.visit(tree)
+    
+    def visit(self, node: ast.AST) -> None:
+        """Dispatch handlers for ``node`` and recurse into its children."""
+        node_type = type(node)
+        for handler in self._enter.get(node_type, ()):
+            handler(node, self)
+        
+        is_class = node_type is ast.ClassDef
+        if is_class:
+            self.class_stack.append(node)
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+        if is_class:
+            self.class_stack.pop()
+        
+        for handler in self._exit.get(node_type, ()):
+            handler(node, self)
@@ -0,0 +1,222 @@
+"""Split large Python modules into AST-aligned chunks that fit a request.
+
+Chunks follow top-level statement boundaries: consecutive functions,
+classes and statements are packed in source order until the token budget
+is reached. A class too large for one chunk is split between its methods,
+and chunks that continue it carry the class line as ``prefix``; anything
+still too large is split by lines. Chunk texts are contiguous source lines,
+so together they reproduce the file exactly. Every chunk carries the same
+header with the module's imports and top-level signatures, so it can be
+analyzed on its own. Files that do not parse are split by lines only.
+"""
+import ast
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+# At most this share of the budget goes to the shared header
+HEADER_SHARE = 0.25
+
+
+@dataclass
+class Chunk:
+    """One part of a module: lines start_line..end_line (1-based, inclusive) plus context."""
+    start_line: int
+    end_line: int
+    text: str
+    header: str = ""
+    names: List[str] = field(default_factory=list)
+    # Line(s) of the enclosing class when the chunk continues a split class
+    prefix: str = ""
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int
+    text: str
+    names: List[str]
+    # Enclosing class line(s) repeated before a piece of a split class
+    prefix: str = ""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _first_line(node: ast.AST) -> int:
+    decorators = getattr(node, "decorator_list", [])
+    return min([node.lineno] + [d.lineno for d in decorators])
+
+
+def _signature(node: ast.AST, indent: str = "") -> Optional[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+        returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+        return f"{indent}{prefix} {node.name}({ast.unparse(node.args)}){returns}: ..."
+    if isinstance(node, ast.ClassDef):
+        bases = [ast.unparse(b) for b in node.bases] + [ast.unparse(k) for k in node.keywords]
+        line = f"{indent}class {node.name}" + (f"({', '.join(bases)})" if bases else "") + ":"
+        methods = [m for m in (_signature(child, indent + "    ") for child in node.body) if m]
+        return "\n".join([line] + (methods or [f"{indent}    ..."]))
+    return None
+
+
+def build_header(tree: ast.Module, lines: List[str], budget: int) -> str:
+    """Imports, then top-level signatures, trimmed to ``budget`` tokens."""
+    imports = [
+        "".join(lines[node.lineno - 1:node.end_lineno])
+        for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+    signatures = [s for s in (_signature(node) for node in tree.body) if s]
+    header = ""
+    for part in ["".join(imports).rstrip("\n")] + signatures:
+        candidate = f"{header}\n{part}" if header else part
+        if estimate_tokens(candidate) <= budget:
+            header = candidate
+    return header
+
+
+def _split_lines(lines: List[str], start: int, end: int, budget: int,
+                 prefix: str = "") -> List[_Segment]:
+    """Line-aligned pieces of lines[start-1:end], each within budget."""
+    pieces: List[_Segment] = []
+    current: List[str] = []
+    first = start
+    for number in range(start, end + 1):
+        line = lines[number - 1]
+        if current and estimate_tokens(prefix + "".join(current) + line) > budget:
+            pieces.append(_Segment(first, number - 1, "".join(current), [], prefix))
+            current, first = [], number
+        current.append(line)
+    if current:
+        pieces.append(_Segment(first, end, "".join(current), [], prefix))
+    return pieces
+
+
+def _segments(tree: ast.Module, lines: List[str], budget: int) -> List[_Segment]:
+    """Top-level segments; oversized classes are split between methods."""
+    segments: List[_Segment] = []
+    nodes = tree.body
+    for n, node in enumerate(nodes):
+        # Comments and blank lines before a node belong to it
+        start = 1 if n == 0 else nodes[n - 1].end_lineno + 1
+        end = node.end_lineno if n + 1 < len(nodes) else len(lines)
+        text = "".join(lines[start - 1:end])
+        name = getattr(node, "name", None)
+        names = [name] if name else []
+        if estimate_tokens(text) <= budget:
+            segments.append(_Segment(start, end, text, names))
+        elif isinstance(node, ast.ClassDef) and len(node.body) > 1:
+            segments.extend(_class_segments(node, lines, start, end, budget))
+        else:
+            for piece in _split_lines(lines, start, end, budget):
+                piece.names = names
+                segments.append(piece)
+    return segments
+
+
+def _class_segments(node: ast.ClassDef, lines: List[str], start: int, end: int,
+                    budget: int) -> List[_Segment]:
+    """Segments of a class too large for one chunk, split between its members.
+
+    Leading comments and decorators become segments of their own. The class
+    statement stays in the text of the first member; later members repeat
+    it as their prefix, unless it is too long to repeat.
+    """
+    segments: List[_Segment] = []
+    for piece in _split_lines(lines, start, node.lineno - 1, budget):
+        piece.names = [node.name]
+        segments.append(piece)
+
+    body_start = _first_line(node.body[0])
+    class_line = "".join(lines[node.lineno - 1:body_start - 1])
+    prefix = class_line if estimate_tokens(class_line) < budget // 2 else ""
+    children = node.body
+    for c, child in enumerate(children):
+        child_start = node.lineno if c == 0 else children[c - 1].end_lineno + 1
+        child_end = child.end_lineno if c + 1 < len(children) else end
+        child_text = "".join(lines[child_start - 1:child_end])
+        child_name = getattr(child, "name", None)
+        label = [f"{node.name}.{child_name}"] if child_name else [node.name]
+        if estimate_tokens(("" if c == 0 else prefix) + child_text) <= budget:
+            segments.append(_Segment(child_start, child_end, child_text, label, "" if c == 0 else prefix))
+            continue
+        pieces = _split_lines(lines, child_start, child_end, budget, prefix)
+        if c == 0:
+            # The first piece holds the class line itself
+            pieces[0].prefix = ""
+        for piece in pieces:
+            piece.names = label
+            segments.append(piece)
+    return segments
+
+
+def chunk_source(source: str, budget: int) -> List[Chunk]:
+    """Split source into chunks of at most about ``budget`` tokens each.
+
+    Adjacent segments share a chunk while they fit, so chunks follow the
+    module's order. A file within budget comes back as a single chunk.
+    """
+    lines = source.splitlines(keepends=True)
+    if estimate_tokens(source) <= budget or not lines:
+        return [Chunk(1, max(1, len(lines)), source)]
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError):
+        return [Chunk(s.start, s.end, s.text) for s in _split_lines(lines, 1, len(lines), budget)]
+    if not tree.body:  # Only comments
+        return [Chunk(s.start, s.end, s.text) for s in _split_lines(lines, 1, len(lines), budget)]
+
+    header = build_header(tree, lines, int(budget * HEADER_SHARE))
+    body_budget = budget - estimate_tokens(header)
+    chunks: List[Chunk] = []
+    for segment in _segments(tree, lines, body_budget):
+        last = chunks[-1] if chunks else None
+        # Only a chunk's first segment needs the class line: a later one
+        # follows the class line or another piece of the same class
+        if last is not None and estimate_tokens(last.prefix + last.text + segment.text) <= body_budget:
+            last.text += segment.text
+            last.end_line = segment.end
+            last.names.extend(n for n in segment.names if n not in last.names)
+        else:
+            chunks.append(Chunk(segment.start, segment.end, segment.text, header,
+                                list(segment.names), segment.prefix))
+    return chunks
+
+
+def chunk_prompt(file_path: str, chunk: Chunk, position: int, total: int) -> str:
+    """User prompt for analyzing one chunk of a file."""
+    context = f"Module context (imports and signatures):\n{chunk.header}\n\n" if chunk.header else ""
+    if chunk.prefix:
+        context += f"Enclosing class:\n{chunk.prefix}\n"
+    return (
+        f"Analyze part {position} of {total} of {file_path} "
+        f"(lines {chunk.start_line}-{chunk.end_line}).\n\n{context}Code:\n{chunk.text}"
+    )
+
+
+def merge_chunk_results(file_path: str, chunks: List[Chunk],
+                        results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-chunk results into one file-level result."""
+    sections: List[str] = []
+    failed: List[Tuple[int, int]] = []
+    for chunk, result in zip(chunks, results):
+        label = f"Lines {chunk.start_line}-{chunk.end_line}"
+        if chunk.names:
+            label += f" ({', '.join(chunk.names)})"
+        if result.get("status") == "completed":
+            sections.append(f"{label}:\n{result['analysis']}")
+        else:
+            failed.append((chunk.start_line, chunk.end_line))
+            sections.append(f"{label}: analysis failed ({result.get('error', 'unknown error')})")
+
+    merged: Dict[str, Any] = {
+        "file": file_path,
+        "analysis": "\n\n".join(sections),
+        "chunks": len(chunks),
+        "status": "failed" if failed else "completed"
+    }
+    if failed:
+        merged["error"] = "Failed chunks: " + ", ".join(f"lines {a}-{b}" for a, b in failed)
+    return merged
@@ -0,0 +1,133 @@
+"""Structural complexity pre-scoring for routing files to model tiers.
+
+Files are measured with ``tokenize``, so keywords inside strings and
+comments are not counted and source encodings are detected from the coding
+cookie. Metrics are cached by content hash. Files that miss the cache are
+measured on a process pool; small batches stay in-process, where starting a
+pool would cost more than it saves.
+"""
+import io
+import tokenize
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from loguru import logger
+from code_analyzer.utils.analysis_cache import AnalysisCache, content_hash, get_analysis_cache
+from code_analyzer.utils.parallel import DEFAULT_CHUNK_SIZE, iter_chunk_results
+
+COMPLEXITY_VERSION = "1"
+# Fewer cache misses than this are measured in-process
+PARALLEL_THRESHOLD = 256
+# Larger (usually generated) files are estimated from their size
+MAX_TOKENIZE_BYTES = 1024 * 1024
+# Score weights; ~250 tokens is roughly the 1000 characters one point used to be
+TOKENS_PER_POINT = 250
+CLASS_WEIGHT = 2.0
+FUNCTION_WEIGHT = 1.5
+ASYNC_WEIGHT = 1.5
+# Blocks nested deeper than this add NESTING_WEIGHT per level
+FREE_NESTING = 3
+NESTING_WEIGHT = 2.0
+
+COUNTED_TOKENS = {tokenize.NAME, tokenize.OP, tokenize.NUMBER, tokenize.STRING}
+
+
+def measure_source(source: bytes) -> Dict[str, int]:
+    """Count tokens, functions, classes, async keywords and maximum block nesting."""
+    metrics = {"tokens": 0, "functions": 0, "classes": 0, "async": 0, "max_nesting": 0}
+    if len(source) > MAX_TOKENIZE_BYTES:
+        metrics["tokens"] = len(source) // 4
+        return metrics
+
+    depth = 0
+    try:
+        for token in tokenize.tokenize(io.BytesIO(source).readline):
+            kind = token.type
+            if kind == tokenize.INDENT:
+                depth += 1
+                if depth > metrics["max_nesting"]:
+                    metrics["max_nesting"] = depth
+            elif kind == tokenize.DEDENT:
+                depth -= 1
+            elif kind in COUNTED_TOKENS:
+                metrics["tokens"] += 1
+                if kind == tokenize.NAME:
+                    if token.string == "def":
+                        metrics["functions"] += 1
+                    elif token.string == "class":
+                        metrics["classes"] += 1
+                    elif token.string == "async":
+                        metrics["async"] += 1
+    except (tokenize.TokenError, SyntaxError, UnicodeDecodeError):
+        # Broken files keep the counts up to the error
+        pass
+    return metrics
+
+
+def complexity_score(metrics: Dict[str, int]) -> float:
+    """Combine metrics into the score AnalysisQueue tiers on."""
+    return (
+        metrics["tokens"] / TOKENS_PER_POINT
+        + metrics["classes"] * CLASS_WEIGHT
+        + metrics["functions"] * FUNCTION_WEIGHT
+        + metrics["async"] * ASYNC_WEIGHT
+        + max(0, metrics["max_nesting"] - FREE_NESTING) * NESTING_WEIGHT
+    )
+
+
+def measure_files(paths: List[str]) -> List[Tuple[str, Optional[Dict[str, int]]]]:
+    """Measure a chunk of files; runs inside a worker process."""
+    results = []
+    for path in paths:
+        try:
+            results.append((path, measure_source(Path(path).read_bytes())))
+        except OSError as e:
+            logger.warning(f"Could not measure {path}: {e}")
+            results.append((path, None))
+    return results
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    try:
+        return content_hash(path.read_bytes())
+    except OSError as e:
+        logger.warning(f"Could not read {path}: {e}")
+        return None
+
+
+def score_files(files: Iterable[Path], cache: Optional[AnalysisCache] = None,
+                workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[Path, Dict[str, Any]]:
+    """Metrics plus ``score`` for each file; unreadable files score 0."""
+    cache = cache or get_analysis_cache()
+    files = list(files)
+    with ThreadPoolExecutor() as pool:
+        digests = dict(zip(files, pool.map(_hash_file, files)))
+    cached = cache.get_many("complexity", COMPLEXITY_VERSION,
+                            [digest for digest in digests.values() if digest])
+
+    misses: Dict[str, Path] = {}
+    for file, digest in digests.items():
+        if digest and digest not in cached:
+            misses.setdefault(digest, file)
+    if misses:
+        if len(misses) < PARALLEL_THRESHOLD:
+            workers = 1
+        by_path = {str(file): digest for digest, file in misses.items()}
+        measured = {
+            by_path[path]: metrics
+            for path, metrics in iter_chunk_results(measure_files, list(by_path), workers, chunk_size)
+            if metrics is not None
+        }
+        cache.set_many("complexity", COMPLEXITY_VERSION, measured)
+        cached.update(measured)
+        logger.debug(f"Measured {len(misses)} files, {len(digests) - len(misses)} from cache")
+
+    scores: Dict[Path, Dict[str, Any]] = {}
+    for file, digest in digests.items():
+        metrics = cached.get(digest) if digest else None
+        if metrics is None:
+            scores[file] = {"score": 0.0, "status": "failed"}
+        else:
+            scores[file] = {**metrics, "score": complexity_score(metrics), "status": "completed"}
+    return scores
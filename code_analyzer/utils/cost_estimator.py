@@ -1,9 +1,13 @@
 from pathlib import Path
-from typing import Dict, List, Tuple
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 import tiktoken
 import json
 from loguru import logger
 import os
+import math
+import random
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -11,17 +15,71 @@ from rich.panel import Panel
 from rich.tree import Tree
 from rich.text import Text
 import humanize
+from code_analyzer.utils.analysis_cache import AnalysisCache, content_hash, get_analysis_cache
+from code_analyzer.utils.discovery import DiscoveryService
+from code_analyzer.utils.ignore import DEFAULT_PATTERNS, IgnoreMatcher, load_ignore_matcher
+
+TOKEN_INDEX_NAMESPACE = "token_index"
+TOKEN_INDEX_VERSION = "1"
+ENCODE_BATCH_SIZE = 256
+TIERS = ["fast", "balanced", "depth"]
+# Sampling: strata are top-level directory x size bucket (powers of 4 from 1 KB)
+SIZE_BUCKET_BASE = 1024
+SIZE_BUCKETS = 6
+MIN_PER_STRATUM = 2
+Z_95 = 1.96
+
+def stratified_total(strata: List[Tuple[int, List[float]]]) -> Tuple[float, float]:
+    """Estimate a population total from (stratum size, sampled values) pairs.
+    
+    Returns the estimate and the half-width of its 95% confidence interval
+    (normal approximation with finite population correction).
+    """
+    total = variance = 0.0
+    for population, values in strata:
+        n = len(values)
+        mean = sum(values) / n
+        total += population * mean
+        if 1 < n < population:
+            s2 = sum((v - mean) ** 2 for v in values) / (n - 1)
+            variance += population ** 2 * (1 - n / population) * s2 / n
+    return total, Z_95 * math.sqrt(variance)
+
+def _minimum_sample(strata: Dict[Tuple[str, int], List[Path]]) -> int:
+    return sum(min(len(members), MIN_PER_STRATUM) for members in strata.values())
+
+def _allocate(strata: Dict[Tuple[str, int], List[Path]], sample_size: int) -> Dict[Tuple[str, int], int]:
+    """Files to sample per stratum: the minimum, plus a largest-remainder
+    share of what is left of ``sample_size`` by remaining stratum size."""
+    counts = {key: min(len(members), MIN_PER_STRATUM, sample_size) for key, members in strata.items()}
+    room = {key: len(members) - counts[key] for key, members in strata.items()}
+    remaining = min(sample_size, sum(len(m) for m in strata.values())) - sum(counts.values())
+    total_room = sum(room.values())
+    if remaining <= 0 or not total_room:
+        return counts
+    quotas = {key: remaining * free / total_room for key, free in room.items()}
+    for key, quota in quotas.items():
+        counts[key] += int(quota)
+    leftover = remaining - sum(int(quota) for quota in quotas.values())
+    by_remainder = sorted(quotas, key=lambda key: quotas[key] - int(quotas[key]), reverse=True)
+    for key in by_remainder[:leftover]:
+        counts[key] += 1
+    return counts
 
 class CostEstimator:
     """Estimate API costs and time for code analysis."""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[AnalysisCache] = None, workers: Optional[int] = None):
         self.console = Console()
         self.config = self._load_config()
         self.encoders = {
             "gpt-3.5-turbo": tiktoken.encoding_for_model("gpt-3.5-turbo"),
             "gpt-4": tiktoken.encoding_for_model("gpt-4")
         }
+        self.matcher = IgnoreMatcher(DEFAULT_PATTERNS)
+        # Only used by fast mode
+        self.cache = cache
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
         
     def _load_config(self) -> Dict:
         """Load AI model configuration."""
@@ -30,16 +88,34 @@ class CostEstimator:
             raise FileNotFoundError("AI models config not found")
         return json.loads(config_path.read_text())
 
-    def estimate_project(self, path: str) -> Dict:
-        """Estimate full project analysis cost and time."""
-        files = self._get_analyzable_files(Path(path))
+    def estimate_project(self, path: str, fast: bool = False,
+                         sample: Optional[int] = None, seed: int = 0) -> Dict:
+        """Estimate full project analysis cost and time.
+        
+        With ``fast`` token counts come from a cache keyed by path, mtime
+        and size (then content hash); only changed files are tokenized, in
+        batches on a thread pool.
+        
+        With ``sample`` only about that many files are tokenized (see
+        _estimate_from_sample) and totals carry 95% confidence intervals.
+        """
+        sizes = self._discover(Path(path))
+        files = list(sizes)
+        if sample:
+            if sample < len(files):
+                return self._estimate_from_sample(Path(path), sizes, sample, seed)
+            fast = True
+            
+        if fast:
+            token_counts = self._count_tokens_cached(Path(path), files)
+        else:
+            token_counts = [self._count_tokens(file) for file in files]
         
         # Get token counts for all files
         total_tokens = 0
         file_estimates = []
         
-        for file in files:
-            tokens = self._count_tokens(file)
+        for file, tokens in zip(files, token_counts):
             total_tokens += tokens
             file_estimates.append({
                 "file": str(file),
@@ -64,26 +140,194 @@ class CostEstimator:
         }
         
     def _get_analyzable_files(self, path: Path) -> List[Path]:
-        """Get list of files to analyze."""
+        """Get list of files to analyze, pruning ignored directories."""
+        return list(self._discover(path))
+        
+    def _discover(self, path: Path) -> Dict[Path, int]:
+        """Files to analyze and their sizes, from the discovery scan's stat."""
         if path.is_file():
-            return [path] if self._should_analyze(path) else []
+            return {path: path.stat().st_size} if self._should_analyze(path) else {}
             
-        files = []
-        for item in path.rglob("*"):
-            if item.is_file() and self._should_analyze(item):
-                files.append(item)
-        return files
+        # A project's .codeA.ignore is applied after the defaults
+        matcher = load_ignore_matcher(path, DEFAULT_PATTERNS)
+        discovery = DiscoveryService(path, matcher, suffixes={".py"}, workers=self.workers)
+        return {info.path: info.size for info in discovery.scan()}
         
     def _should_analyze(self, file: Path) -> bool:
         """Check if file should be analyzed."""
-        ignore_patterns = [
-            ".git", "__pycache__", ".venv",
-            ".pyc", ".pyo", ".pyd", ".so"
-        ]
-        return (
-            file.suffix == ".py" and
-            not any(pattern in str(file) for pattern in ignore_patterns)
-        )
+        return file.suffix == ".py" and not self.matcher.is_ignored(file)
+        
+    def _read_source(self, file: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Read a file, returning (content hash, text) or (None, None) if unreadable."""
+        try:
+            data = file.read_bytes()
+            return content_hash(data), data.decode("utf-8")
+        except Exception as e:
+            logger.warning(f"Could not count tokens for {file}: {e}")
+            return None, None
+            
+    def _count_tokens_cached(self, root: Path, files: List[Path], prune: bool = True) -> List[int]:
+        """Token counts for files, tokenizing only those the cache has not seen.
+        
+        With ``prune`` the stored index is trimmed to ``files``; pass False
+        when counting a subset so other entries are kept.
+        """
+        cache = self.cache or get_analysis_cache()
+        encoder = self.encoders["gpt-3.5-turbo"]
+        index_key = content_hash(str(root.resolve()))
+        version = f"{TOKEN_INDEX_VERSION}:{encoder.name}"
+        index = cache.get(TOKEN_INDEX_NAMESPACE, version, index_key) or {"files": {}, "tokens": {}}
+        known_files, known_tokens = index["files"], index["tokens"]
+        
+        counts = [0] * len(files)
+        entries = {} if prune else dict(known_files)
+        stale = []
+        for i, file in enumerate(files):
+            try:
+                stat = file.stat()
+            except OSError as e:
+                logger.warning(f"Could not count tokens for {file}: {e}")
+                continue
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = known_files.get(str(file))
+            if entry and entry[:2] == signature and entry[2] in known_tokens:
+                counts[i] = known_tokens[entry[2]]
+                entries[str(file)] = entry
+            else:
+                stale.append((i, file, signature))
+                
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                sources = list(pool.map(self._read_source, [file for _, file, _ in stale]))
+            # Touched-but-unchanged files reuse their count; new content is encoded once
+            pending = {}
+            for digest, text in sources:
+                if digest is not None and digest not in known_tokens:
+                    pending[digest] = text
+            digests = list(pending)
+            for start in range(0, len(digests), ENCODE_BATCH_SIZE):
+                batch = digests[start:start + ENCODE_BATCH_SIZE]
+                encoded = encoder.encode_batch(
+                    [pending[d] for d in batch], num_threads=self.workers, disallowed_special=()
+                )
+                known_tokens.update((d, len(tokens)) for d, tokens in zip(batch, encoded))
+            for (i, file, signature), (digest, _) in zip(stale, sources):
+                if digest is not None:
+                    counts[i] = known_tokens[digest]
+                    entries[str(file)] = signature + [digest]
+                    
+        if stale or (prune and len(entries) != len(known_files)):
+            used = {entry[2] for entry in entries.values()}
+            cache.set(TOKEN_INDEX_NAMESPACE, version, index_key, {
+                "files": entries,
+                "tokens": {d: n for d, n in known_tokens.items() if d in used}
+            })
+        return counts
+        
+    def _stratify(self, root: Path, sizes: Dict[Path, int],
+                  by_directory: bool = True) -> Dict[Tuple[str, int], List[Path]]:
+        """Group files by top-level directory (unless not ``by_directory``) and size bucket."""
+        strata = defaultdict(list)
+        for file, size in sizes.items():
+            directory = "*"
+            if by_directory:
+                parts = file.relative_to(root).parts if root.is_dir() else (file.name,)
+                directory = parts[0] if len(parts) > 1 else "."
+            bucket = 0
+            while bucket < SIZE_BUCKETS - 1 and size >= SIZE_BUCKET_BASE * 4 ** bucket:
+                bucket += 1
+            strata[(directory, bucket)].append(file)
+        return strata
+        
+    def _estimate_from_sample(self, root: Path, sizes: Dict[Path, int], sample_size: int,
+                              seed: int = 0) -> Dict:
+        """Extrapolate the estimate from a stratified random sample of files.
+        
+        Every stratum gets two files so its variance can be estimated, and
+        the rest of ``sample_size`` is shared in proportion to the files
+        left in each stratum. When the minimums alone exceed ``sample_size``,
+        strata are coarsened (size bucket only, then one stratum), so no more
+        than ``sample_size`` files are tokenized. Totals are stratified
+        estimates; margins are 95% confidence half-widths.
+        """
+        rng = random.Random(seed)
+        files = list(sizes)
+        strata = self._stratify(root, sizes)
+        if _minimum_sample(strata) > sample_size:
+            strata = self._stratify(root, sizes, by_directory=False)
+        if _minimum_sample(strata) > sample_size:
+            strata = {("*", 0): files}
+        chosen = {
+            key: rng.sample(strata[key], n)
+            for key, n in sorted(_allocate(strata, sample_size).items())
+        }
+            
+        sampled = [file for members in chosen.values() for file in members]
+        token_counts = dict(zip(sampled, self._count_tokens_cached(root, sampled, prune=False)))
+        
+        rows = {}
+        for file, tokens in token_counts.items():
+            tier = self._determine_tier(tokens)
+            provider = self.config["model_tiers"][tier]["providers"][0]
+            rows[file] = {
+                "tier": tier,
+                "tokens": tokens,
+                "cost": (tokens / 1000) * provider["cost"],
+                "minutes": tokens / provider["rate_limit"]
+            }
+            
+        def estimate(value) -> Tuple[float, float]:
+            return stratified_total([
+                (len(strata[key]), [value(rows[file]) for file in members])
+                for key, members in chosen.items()
+            ])
+            
+        total_tokens, tokens_margin = estimate(lambda r: r["tokens"])
+        total_cost, cost_margin = estimate(lambda r: r["cost"])
+        minutes, minutes_margin = estimate(lambda r: r["minutes"])
+        tiers, costs, times = {}, {}, {}
+        for tier in TIERS:
+            def in_tier(key):
+                return lambda r: r[key] if r["tier"] == tier else 0
+            tier_files, files_margin = estimate(lambda r: 1 if r["tier"] == tier else 0)
+            tier_tokens, tier_tokens_margin = estimate(in_tier("tokens"))
+            costs[tier] = estimate(in_tier("cost"))
+            times[tier] = estimate(in_tier("minutes"))
+            tiers[tier] = {
+                "files": tier_files, "files_margin": files_margin,
+                "tokens": tier_tokens, "tokens_margin": tier_tokens_margin
+            }
+            
+        return {
+            "summary": {
+                "total_files": len(files),
+                "total_tokens": round(total_tokens),
+                "estimated_cost": total_cost,
+                "estimated_time": {
+                    "minutes": minutes,
+                    "breakdown": {tier: value for tier, (value, _) in times.items()}
+                },
+                "cost_breakdown": {tier: value for tier, (value, _) in costs.items()}
+            },
+            "files": [
+                {"file": str(file), "tokens": row["tokens"], "tier": row["tier"]}
+                for file, row in rows.items()
+            ],
+            "sample": {
+                "sampled_files": len(sampled),
+                "strata": len(strata),
+                "confidence": 0.95,
+                "margins": {
+                    "total_tokens": tokens_margin,
+                    "estimated_cost": cost_margin,
+                    "minutes": minutes_margin,
+                    "cost_breakdown": {tier: margin for tier, (_, margin) in costs.items()},
+                    "time_breakdown": {tier: margin for tier, (_, margin) in times.items()}
+                },
+                "tiers": tiers
+            },
+            "recommendations": self._get_recommendations(round(total_tokens), len(files))
+        }
         
     def _count_tokens(self, file: Path) -> int:
         """Count tokens in a file."""
@@ -168,18 +412,35 @@ class CostEstimator:
 
     def display_estimate(self, estimate: Dict) -> None:
         """Display beautiful cost estimate visualization."""
+        sample = estimate.get("sample")
+        margins = sample["margins"] if sample else {}
+        
+        def margin(value: float, fmt: str, key: str, group: str = None) -> str:
+            """Format a value, with its ± error bound for sampled estimates."""
+            text = format(value, fmt)
+            if sample:
+                bound = margins[group][key] if group else margins[key]
+                text += f" ± {format(bound, fmt)}"
+            return text
+            
         # Show summary panel
-        summary = Panel(
-            f"""[bold green]Project Analysis Estimate[/]
+        total_tokens = humanize.intcomma(estimate['summary']['total_tokens'])
+        if sample:
+            total_tokens += f" ± {humanize.intcomma(round(margins['total_tokens']))}"
+        summary_text = f"""[bold green]Project Analysis Estimate[/]
             
 Total Files: {estimate['summary']['total_files']}
-Total Tokens: {humanize.intcomma(estimate['summary']['total_tokens'])}
-Estimated Cost: ${estimate['summary']['estimated_cost']:.2f}
-Estimated Time: {estimate['summary']['estimated_time']['minutes']:.1f} minutes
-            """,
-            title="Summary",
-            border_style="green"
-        )
+Total Tokens: {total_tokens}
+Estimated Cost: ${margin(estimate['summary']['estimated_cost'], '.2f', 'estimated_cost')}
+Estimated Time: {margin(estimate['summary']['estimated_time']['minutes'], '.1f', 'minutes')} minutes
+            """
+        if sample:
+            summary_text += (
+                f"\n[yellow]Extrapolated from {sample['sampled_files']} sampled files "
+                f"in {sample['strata']} strata; ± values are "
+                f"{sample['confidence']:.0%} confidence intervals[/]"
+            )
+        summary = Panel(summary_text, title="Summary", border_style="green")
         self.console.print(summary)
 
         # Show cost breakdown table
@@ -191,22 +452,28 @@ Estimated Time: {estimate['summary']['estimated_time']['minutes']:.1f} minutes
         table.add_column("Time", justify="right", style="yellow")
 
         for tier, cost in estimate['summary']['cost_breakdown'].items():
-            tier_files = len([f for f in estimate['files'] if f['tier'] == tier])
-            tier_tokens = sum(f['tokens'] for f in estimate['files'] if f['tier'] == tier)
             tier_time = estimate['summary']['estimated_time']['breakdown'][tier]
+            if sample:
+                stats = sample["tiers"][tier]
+                files_text = f"{stats['files']:.0f} ± {stats['files_margin']:.0f}"
+                tokens_text = (f"{humanize.intcomma(round(stats['tokens']))} ± "
+                               f"{humanize.intcomma(round(stats['tokens_margin']))}")
+            else:
+                files_text = str(len([f for f in estimate['files'] if f['tier'] == tier]))
+                tokens_text = humanize.intcomma(sum(f['tokens'] for f in estimate['files'] if f['tier'] == tier))
             
             table.add_row(
                 tier.capitalize(),
-                str(tier_files),
-                humanize.intcomma(tier_tokens),
-                f"${cost:.2f}",
-                f"{tier_time:.1f}m"
+                files_text,
+                tokens_text,
+                f"${margin(cost, '.2f', tier, 'cost_breakdown')}",
+                f"{margin(tier_time, '.1f', tier, 'time_breakdown')}m"
             )
             
         self.console.print(table)
 
         # Show file tree with costs
-        tree = Tree("📁 Project Analysis")
+        tree = Tree("📁 Project Analysis (sampled files)" if sample else "📁 Project Analysis")
         for file in estimate['files']:
             cost = (file['tokens'] / 1000) * self.config["model_tiers"][file['tier']]["providers"][0]["cost"]
             file_text = Text(
@@ -287,4 +554,20 @@ Estimated Time: {estimate['summary']['estimated_time']['minutes']:.1f} minutes
             )
             self.console.print(savings_panel)
             
-        return optimizations 
\ No newline at end of file
+        return optimizations
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Estimate analysis cost and time for a project")
+    parser.add_argument("path", nargs="?", default=".")
+    parser.add_argument("--fast", action="store_true",
+                        help="Prune ignored directories and reuse cached token counts")
+    parser.add_argument("--sample", type=int, metavar="N",
+                        help="Tokenize about N files (stratified) and extrapolate with 95%% intervals")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --sample")
+    args = parser.parse_args()
+    
+    estimator = CostEstimator()
+    estimator.display_estimate(
+        estimator.estimate_project(args.path, fast=args.fast, sample=args.sample, seed=args.seed)
+    )
@@ -0,0 +1,220 @@
+"""File discovery with a persisted manifest for incremental runs.
+
+``DiscoveryService.scan`` lists files with ``os.scandir``, taking sizes and
+mtimes from the cached ``DirEntry`` stat and pruning ignored directories.
+With more than one worker, top-level subtrees are walked on a thread pool
+(scandir and stat release the GIL).
+
+``changes`` diffs a scan against the saved manifest (path -> size, mtime,
+content hash). Files whose size and mtime are unchanged are trusted without
+being read; others are hashed, so a file that was only touched is not
+reported as changed. Callers ``commit`` the diff once files are processed,
+recording only the ones that succeeded, so failed or interrupted files are
+reported again on the next run.
+"""
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Collection, Dict, Iterable, List, Optional, Union
+from loguru import logger
+from code_analyzer.utils.analysis_cache import content_hash
+from code_analyzer.utils.ignore import IgnoreMatcher, iter_entries
+
+DEFAULT_MANIFEST_DIR = Path("crews/crew-output/cache/manifests")
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class FileInfo:
+    """A discovered file and the stat fields the manifest tracks."""
+    path: Path
+    relative: str
+    size: int
+    mtime_ns: int
+    digest: Optional[str] = None
+
+
+@dataclass
+class ManifestDiff:
+    """Files added, changed or deleted since the previous manifest."""
+    added: List[FileInfo] = field(default_factory=list)
+    changed: List[FileInfo] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[FileInfo] = field(default_factory=list)
+    # Manifest entries the diff was taken against
+    previous: Dict[str, list] = field(default_factory=dict, repr=False)
+
+    @property
+    def modified(self) -> List[FileInfo]:
+        """Added and changed files, in path order."""
+        return sorted(self.added + self.changed, key=lambda info: info.relative)
+
+
+def _hash_file(info: FileInfo) -> Optional[str]:
+    try:
+        return content_hash(info.path.read_bytes())
+    except OSError as e:
+        logger.warning(f"Could not hash {info.path}: {e}")
+        return None
+
+
+class DiscoveryService:
+    """Enumerate the files of a tree and track how they change between runs."""
+
+    def __init__(self, root: Union[str, Path], matcher: Optional[IgnoreMatcher] = None,
+                 suffixes: Optional[Collection[str]] = None, workers: int = 1,
+                 manifest_path: Optional[Union[str, Path]] = None):
+        self.root = Path(root)
+        self.matcher = matcher
+        self.suffixes = set(suffixes) if suffixes else None
+        self.workers = workers
+        self._manifest_path = Path(manifest_path) if manifest_path else None
+
+    @property
+    def manifest_path(self) -> Path:
+        if self._manifest_path is None:
+            key = str(self.root.resolve()) + "\0" + "\0".join(sorted(self.suffixes or []))
+            digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+            self._manifest_path = DEFAULT_MANIFEST_DIR / f"{digest}.json"
+        return self._manifest_path
+
+    def _scan_subtree(self, directory: str, prefix: str) -> List[FileInfo]:
+        files = []
+        for entry, relative in iter_entries(directory, self.matcher, prefix):
+            if self.suffixes is not None and Path(entry.name).suffix not in self.suffixes:
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append(FileInfo(Path(entry.path), relative, stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def scan(self) -> List[FileInfo]:
+        """All non-ignored files under the root, sorted by relative path."""
+        if self.root.is_file():
+            stat = self.root.stat()
+            return [FileInfo(self.root, self.root.name, stat.st_size, stat.st_mtime_ns)]
+        if self.workers <= 1:
+            files = self._scan_subtree(str(self.root), "")
+        else:
+            files = self._scan_parallel()
+        return sorted(files, key=lambda info: info.relative)
+
+    def _scan_parallel(self) -> List[FileInfo]:
+        files: List[FileInfo] = []
+        subtrees = []
+        try:
+            with os.scandir(self.root) as scan:
+                entries = list(scan)
+        except OSError:
+            return files
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if self.matcher is None or not self.matcher.match(entry.name, is_dir=True):
+                    subtrees.append((entry.path, entry.name + "/"))
+            elif entry.is_file():
+                files.extend(self._scan_entry(entry))
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for result in pool.map(lambda subtree: self._scan_subtree(*subtree), subtrees):
+                files.extend(result)
+        return files
+
+    def _scan_entry(self, entry) -> List[FileInfo]:
+        if self.matcher is not None and self.matcher.match(entry.name):
+            return []
+        if self.suffixes is not None and Path(entry.name).suffix not in self.suffixes:
+            return []
+        try:
+            stat = entry.stat()
+        except OSError:
+            return []
+        return [FileInfo(Path(entry.path), entry.name, stat.st_size, stat.st_mtime_ns)]
+
+    def load_manifest(self) -> Dict[str, list]:
+        """Previous manifest: relative path -> [size, mtime_ns, digest]."""
+        try:
+            data = json.loads(self.manifest_path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                return data["files"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable manifest {self.manifest_path}: {e}")
+        return {}
+
+    def save_manifest(self, files: Union[List[FileInfo], Dict[str, list]]):
+        """Store files, or ready-made manifest entries, as the new manifest."""
+        if not isinstance(files, dict):
+            files = {info.relative: [info.size, info.mtime_ns, info.digest] for info in files}
+        data = {
+            "version": MANIFEST_VERSION,
+            "root": str(self.root.resolve()),
+            "files": files
+        }
+        try:
+            self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.manifest_path.with_suffix(".tmp")
+            temp_file.write_text(json.dumps(data))
+            temp_file.replace(self.manifest_path)
+        except OSError as e:
+            logger.warning(f"Could not save manifest: {e}")
+
+    def changes(self, save: bool = False) -> ManifestDiff:
+        """Diff the tree against the saved manifest.
+
+        Nothing is saved unless ``save`` is set; callers that process the
+        modified files should ``commit`` the diff afterwards instead.
+        """
+        previous = self.load_manifest()
+        files = self.scan()
+        diff = ManifestDiff(previous=previous)
+        to_hash = []
+        for info in files:
+            entry = previous.get(info.relative)
+            if entry is not None and entry[0] == info.size and entry[1] == info.mtime_ns and entry[2]:
+                info.digest = entry[2]
+                diff.unchanged.append(info)
+            else:
+                to_hash.append(info)
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            digests = list(pool.map(_hash_file, to_hash))
+        for info, digest in zip(to_hash, digests):
+            info.digest = digest
+            entry = previous.get(info.relative)
+            if entry is None:
+                diff.added.append(info)
+            elif digest is not None and digest == entry[2]:
+                diff.unchanged.append(info)
+            else:
+                diff.changed.append(info)
+
+        seen = {info.relative for info in files}
+        diff.deleted = sorted(path for path in previous if path not in seen)
+        if save:
+            self.save_manifest(files)
+        logger.debug(
+            f"Discovery {self.root}: {len(diff.added)} added, {len(diff.changed)} changed, "
+            f"{len(diff.deleted)} deleted, {len(diff.unchanged)} unchanged"
+        )
+        return diff
+
+    def commit(self, diff: ManifestDiff, succeeded: Optional[Iterable[Union[str, Path]]] = None):
+        """Save the manifest after a run over ``diff.modified``.
+
+        Only modified files listed in ``succeeded`` (all of them when None)
+        are recorded as seen; the others keep their previous entry, so the
+        next ``changes`` reports them again.
+        """
+        done = None if succeeded is None else {str(path) for path in succeeded}
+        entries = {info.relative: [info.size, info.mtime_ns, info.digest] for info in diff.unchanged}
+        for info in diff.modified:
+            if done is None or str(info.path) in done:
+                entries[info.relative] = [info.size, info.mtime_ns, info.digest]
+            elif info.relative in diff.previous:
+                entries[info.relative] = diff.previous[info.relative]
+        self.save_manifest(entries)
@@ -4,13 +4,15 @@ Contact: THE AI RE INVESTOR (405-963-2596)
 """
 from pathlib import Path
 from typing import Dict, List
-import fnmatch
+from code_analyzer.utils.discovery import DiscoveryService
+from code_analyzer.utils.ignore import IgnoreMatcher
 
 class FileCounter:
     """Accurate file counting with proper filtering."""
     
     def __init__(self, ignore_file: Path = Path(".codeA.ignore")):
         self.ignore_patterns = self._load_ignore_patterns(ignore_file)
+        self.matcher = IgnoreMatcher(self.ignore_patterns)
         
     def _load_ignore_patterns(self, ignore_file: Path) -> List[str]:
         """Load patterns from .codeA.ignore."""
@@ -22,15 +24,8 @@ class FileCounter:
         ]
         
     def should_ignore(self, file_path: str) -> bool:
-        """Check if file should be ignored."""
-        for pattern in self.ignore_patterns:
-            if pattern.startswith('!'):
-                # Include pattern
-                if fnmatch.fnmatch(file_path, pattern[1:]):
-                    return False
-            elif fnmatch.fnmatch(file_path, pattern):
-                return True
-        return False
+        """Check if file should be ignored (gitignore rules, last match wins)."""
+        return self.matcher.is_ignored(file_path)
         
     def count_files(self, path: Path) -> Dict[str, List[Path]]:
         """Count files by category."""
@@ -43,12 +38,9 @@ class FileCounter:
             "docs": []       # Documentation
         }
         
-        for file in path.rglob("*.py"):
-            rel_path = str(file.relative_to(path))
-            
-            if self.should_ignore(rel_path):
-                continue
-                
+        # Ignored directories are pruned during the walk
+        for info in DiscoveryService(path, self.matcher, suffixes={".py"}).scan():
+            file = info.path
             if "code_analyzer/core" in str(file):
                 categories["core"].append(file)
             elif "code_analyzer/cli" in str(file):
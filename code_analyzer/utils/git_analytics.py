@@ -0,0 +1,104 @@
+"""Vectorized git analytics over a CommitTable.
+
+Commit timestamps, author ids and per-file rows are viewed as NumPy arrays
+and every statistic is a histogram (``bincount``) or a cumulative sum, so
+cost grows with array length rather than Python loop iterations.
+"""
+import time
+from datetime import date, timedelta
+from typing import Any, Dict
+import numpy as np
+from code_analyzer.utils.git_history import CommitTable
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+EPOCH_WEEKDAY = 3  # 1970-01-01 was a Thursday
+# UTC offsets can change on quarter-hour boundaries (DST, +05:45 zones)
+OFFSET_RESOLUTION = 900
+
+
+def as_array(column) -> np.ndarray:
+    """Zero-copy view of an ``array.array`` column."""
+    return np.frombuffer(column, dtype=f"i{column.itemsize}") if len(column) else np.zeros(0, dtype=np.int64)
+
+
+def _utc_offsets(seconds: np.ndarray) -> np.ndarray:
+    return np.array([time.localtime(int(s)).tm_gmtoff for s in seconds], dtype=np.int64)
+
+
+def local_timestamps(timestamps: np.ndarray) -> np.ndarray:
+    """Shift UTC epoch seconds to local time, as datetime.fromtimestamp would.
+
+    The UTC offset is looked up once per distinct day. Only days whose
+    offset differs at the next midnight (DST transitions) are resolved per
+    quarter hour.
+    """
+    if not len(timestamps):
+        return timestamps
+    days, inverse = np.unique(timestamps // 86400, return_inverse=True)
+    inverse = inverse.ravel()
+    start_offsets = _utc_offsets(days * 86400)
+    end_offsets = _utc_offsets((days + 1) * 86400 - 1)
+    offsets = start_offsets[inverse]
+
+    changing = np.flatnonzero(start_offsets != end_offsets)
+    if len(changing):
+        rows = np.flatnonzero(np.isin(inverse, changing))
+        slots, slot_inverse = np.unique(timestamps[rows] // OFFSET_RESOLUTION, return_inverse=True)
+        offsets[rows] = _utc_offsets(slots * OFFSET_RESOLUTION)[slot_inverse.ravel()]
+    return timestamps + offsets
+
+
+def _counts_by_name(counts: np.ndarray, names) -> Dict[str, int]:
+    nonzero = np.flatnonzero(counts)
+    return {names[i]: int(counts[i]) for i in nonzero}
+
+
+def vectorized_git_patterns(table: CommitTable, window_days: int = 7, top_n: int = 20) -> Dict[str, Any]:
+    """Commit patterns with the same keys as the dict-based analysis, plus
+    churn, hotspot ranking and rolling activity."""
+    timestamps = local_timestamps(as_array(table.timestamps).astype(np.int64))
+    author_ids = as_array(table.author_ids)
+    file_ids = as_array(table.file_ids)
+    additions = as_array(table.additions).astype(np.int64)
+    deletions = as_array(table.deletions).astype(np.int64)
+    path_count = len(table.paths)
+
+    hours = (timestamps // 3600) % 24
+    days = timestamps // 86400
+    weekdays = (days + EPOCH_WEEKDAY) % 7
+
+    changes = np.bincount(file_ids, minlength=path_count)
+    churn = np.bincount(file_ids, weights=additions + deletions, minlength=path_count).astype(np.int64)
+    # Most changed files first; churn breaks ties
+    ranked = np.lexsort((-churn, -changes))[:min(top_n, int(np.count_nonzero(changes)))]
+
+    rolling = {"window_days": window_days, "peak_commits": 0, "peak_window_end": None, "current": 0}
+    if len(days):
+        first_day = int(days.min())
+        daily = np.bincount(days - first_day, minlength=window_days)
+        cumulative = np.concatenate(([0], np.cumsum(daily)))
+        windows = cumulative[window_days:] - cumulative[:-window_days]
+        peak = int(np.argmax(windows))
+        rolling.update({
+            "peak_commits": int(windows[peak]),
+            "peak_window_end": (date(1970, 1, 1) + timedelta(days=first_day + peak + window_days - 1)).isoformat(),
+            "current": int(windows[-1])
+        })
+
+    return {
+        "total_commits": len(table),
+        "authors": _counts_by_name(np.bincount(author_ids, minlength=len(table.authors)), table.authors),
+        "file_changes": _counts_by_name(changes, table.paths),
+        "commit_times": {int(h): int(c) for h, c in enumerate(np.bincount(hours, minlength=24)) if c},
+        "commit_days": _counts_by_name(np.bincount(weekdays, minlength=7), WEEKDAYS),
+        "churn": {
+            "additions": int(additions.sum()),
+            "deletions": int(deletions.sum()),
+            "total": int(churn.sum())
+        },
+        "hotspots": [
+            {"path": table.paths[i], "changes": int(changes[i]), "churn": int(churn[i])}
+            for i in ranked
+        ],
+        "rolling_activity": rolling
+    }
@@ -0,0 +1,194 @@
+"""Columnar commit table shared by the history collectors and analyzers.
+
+The table is built from one ``git log --numstat`` stream and cached on disk
+keyed by the repository's HEAD. When HEAD moves forward only the new
+commits are read and appended, so repeated runs never walk history twice.
+
+Rows are stored oldest first. Per-file stats use offsets into flat arrays:
+the files of row ``i`` are ``file_ids[file_offsets[i]:file_offsets[i + 1]]``
+with matching ``additions`` and ``deletions``. Authors and paths are
+interned, so each row holds small integer ids.
+"""
+import json
+import hashlib
+import subprocess
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from loguru import logger
+from code_analyzer.utils.git_log import GitCommit, iter_git_log
+
+DEFAULT_CACHE_DIR = Path("crews/crew-output/cache/git_history")
+FORMAT_VERSION = 1
+
+
+class CommitTable:
+    """Commit metadata and per-file line stats in parallel columns."""
+
+    def __init__(self):
+        self.head: Optional[str] = None
+        self.shas: List[str] = []
+        self.timestamps = array("q")
+        self.author_ids = array("l")
+        self.messages: List[str] = []
+        self.file_offsets = array("l", [0])
+        self.file_ids = array("l")
+        self.additions = array("l")
+        self.deletions = array("l")
+        self.authors: List[str] = []
+        self.paths: List[str] = []
+        self._author_index: Dict[str, int] = {}
+        self._path_index: Dict[str, int] = {}
+        self._row_index: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.shas)
+
+    def _intern(self, value: str, values: List[str], index: Dict[str, int]) -> int:
+        key = index.get(value)
+        if key is None:
+            key = index[value] = len(values)
+            values.append(value)
+        return key
+
+    def append(self, commit: GitCommit):
+        """Add a commit as the newest row."""
+        self._row_index[commit.hexsha] = len(self.shas)
+        self.shas.append(commit.hexsha)
+        self.timestamps.append(commit.committed_date)
+        self.author_ids.append(self._intern(commit.author_name, self.authors, self._author_index))
+        self.messages.append(commit.message)
+        for path, stats in commit.files.items():
+            self.file_ids.append(self._intern(path, self.paths, self._path_index))
+            self.additions.append(stats["insertions"])
+            self.deletions.append(stats["deletions"])
+        self.file_offsets.append(len(self.file_ids))
+
+    def row(self, sha: str) -> Optional[int]:
+        return self._row_index.get(sha)
+
+    def files(self, row: int) -> Iterator[Tuple[str, int, int]]:
+        """Yield (path, additions, deletions) for one row."""
+        for i in range(self.file_offsets[row], self.file_offsets[row + 1]):
+            yield self.paths[self.file_ids[i]], self.additions[i], self.deletions[i]
+
+    def commit(self, row: int) -> GitCommit:
+        """Materialize one row as a GitCommit."""
+        return GitCommit(
+            hexsha=self.shas[row],
+            parents=[],
+            author_name=self.authors[self.author_ids[row]],
+            author_email="",
+            committed_date=self.timestamps[row],
+            message=self.messages[row],
+            files={
+                path: {"insertions": added, "deletions": deleted, "lines": added + deleted}
+                for path, added, deleted in self.files(row)
+            }
+        )
+
+    def __iter__(self) -> Iterator[GitCommit]:
+        for row in range(len(self)):
+            yield self.commit(row)
+
+    def rows_since(self, repo_path: Union[str, Path], sha: Optional[str],
+                   head: Optional[str] = None) -> List[int]:
+        """Rows for commits in ``sha..head`` (all of ``head`` if sha is None), oldest first.
+
+        The order is ``git rev-list --reverse``, so it depends only on the
+        range, not on how the table was built; callers can resume by position.
+        """
+        head = head or self.head
+        revision = f"{sha}..{head}" if sha else head
+        wanted = _git(repo_path, "rev-list", "--reverse", revision).stdout.split()
+        return [self._row_index[s] for s in wanted if s in self._row_index]
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": FORMAT_VERSION,
+            "head": self.head,
+            "shas": self.shas,
+            "timestamps": self.timestamps.tolist(),
+            "author_ids": self.author_ids.tolist(),
+            "messages": self.messages,
+            "file_offsets": self.file_offsets.tolist(),
+            "file_ids": self.file_ids.tolist(),
+            "additions": self.additions.tolist(),
+            "deletions": self.deletions.tolist(),
+            "authors": self.authors,
+            "paths": self.paths
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CommitTable":
+        table = cls()
+        table.head = data["head"]
+        table.shas = data["shas"]
+        table.timestamps = array("q", data["timestamps"])
+        table.author_ids = array("l", data["author_ids"])
+        table.messages = data["messages"]
+        table.file_offsets = array("l", data["file_offsets"])
+        table.file_ids = array("l", data["file_ids"])
+        table.additions = array("l", data["additions"])
+        table.deletions = array("l", data["deletions"])
+        table.authors = data["authors"]
+        table.paths = data["paths"]
+        table._author_index = {name: i for i, name in enumerate(table.authors)}
+        table._path_index = {path: i for i, path in enumerate(table.paths)}
+        table._row_index = {sha: i for i, sha in enumerate(table.shas)}
+        return table
+
+
+def _git(repo_path: Union[str, Path], *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(["git", *args], cwd=str(repo_path), capture_output=True, text=True)
+
+
+def _cache_file(repo_path: Path, cache_dir: Path) -> Path:
+    digest = hashlib.sha256(str(repo_path).encode()).hexdigest()[:16]
+    return cache_dir / f"{digest}.json"
+
+
+def load_commit_table(repo_path: Union[str, Path] = ".",
+                      cache_dir: Optional[Union[str, Path]] = None) -> CommitTable:
+    """Get the commit table for HEAD, reading only commits the cache lacks."""
+    repo_path = Path(_git(repo_path, "rev-parse", "--show-toplevel").stdout.strip() or repo_path).resolve()
+    head = _git(repo_path, "rev-parse", "HEAD").stdout.strip()
+    cache_file = _cache_file(repo_path, Path(cache_dir or DEFAULT_CACHE_DIR))
+
+    table = None
+    if cache_file.exists():
+        try:
+            data = json.loads(cache_file.read_text())
+            if data.get("version") == FORMAT_VERSION:
+                table = CommitTable.from_dict(data)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable commit table cache {cache_file}: {e}")
+    if table is not None and table.head == head:
+        return table
+
+    since = None
+    if table is not None and table.head:
+        is_ancestor = _git(repo_path, "merge-base", "--is-ancestor", table.head, head).returncode == 0
+        if is_ancestor:
+            since = table.head
+        else:
+            table = None
+    if table is None:
+        table = CommitTable()
+
+    added = 0
+    if head:
+        for commit in iter_git_log(repo_path, since=since, reverse=True):
+            table.append(commit)
+            added += 1
+    table.head = head
+    logger.debug(f"Commit table for {repo_path}: {added} new commits, {len(table)} total")
+
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = cache_file.with_suffix(".tmp")
+        temp_file.write_text(json.dumps(table.to_dict()))
+        temp_file.replace(cache_file)
+    except OSError as e:
+        logger.warning(f"Could not cache commit table: {e}")
+    return table
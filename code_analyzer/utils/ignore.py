@@ -0,0 +1,233 @@
+"""Gitignore-style path matching compiled into lookup tables and one regex.
+
+The last matching pattern decides (``!`` negations re-include). Patterns
+that are plain names (``build``), extensions (``*.pyc``) or literal
+anchored paths (``/docs/build``) go into dicts mapping the key to the
+highest pattern index. All remaining globs become one regex alternation in
+reverse order, so its first matching alternative is the last matching
+glob. Checking a path is then a few dict lookups plus one regex call,
+however many patterns there are.
+
+``walk`` applies the matcher during traversal and never descends into an
+ignored directory; as in git, files inside an ignored directory cannot be
+re-included.
+
+Paths are relative to the root the patterns belong to, with ``/``
+separators.
+"""
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
+
+IGNORE_FILE = ".codeA.ignore"
+# Never worth analyzing: VCS metadata, virtualenvs and compiled files
+DEFAULT_PATTERNS = [
+    ".git/", "__pycache__/", ".venv/",
+    "*.pyc", "*.pyo", "*.pyd", "*.so"
+]
+
+
+GLOB_CHARS = set("*?[\\")
+
+
+class IgnoreRule:
+    """One parsed pattern line."""
+
+    def __init__(self, line: str):
+        self.negated = line.startswith("!")
+        pattern = line[1:] if self.negated else line
+        if pattern.startswith("\\!") or pattern.startswith("\\#"):
+            pattern = pattern[1:]
+        self.dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        # A slash anywhere but the end anchors the pattern to the root
+        self.anchored = "/" in pattern
+        self.pattern = pattern.lstrip("/")
+        self.regex = ("" if self.anchored else "(?:.*/)?") + _translate(self.pattern)
+
+    @property
+    def literal(self) -> bool:
+        return not GLOB_CHARS & set(self.pattern)
+
+    @property
+    def extension(self) -> Optional[str]:
+        """The ``.ext`` of an unanchored ``*.ext`` pattern, else None."""
+        rest = self.pattern[1:]
+        if not self.anchored and self.pattern.startswith("*.") and not GLOB_CHARS & set(rest):
+            return rest
+        return None
+
+
+class RuleSet:
+    """Rules compiled for lookup; ``winner`` gives the last matching rule."""
+
+    def __init__(self, rules: List[IgnoreRule]):
+        self.rules = rules
+        self.names: Dict[str, int] = {}
+        self.extensions: Dict[str, int] = {}
+        self.paths: Dict[str, int] = {}
+        globs = []
+        for index, rule in enumerate(rules):
+            if rule.extension is not None:
+                self.extensions[rule.extension] = index
+            elif rule.literal:
+                table = self.paths if rule.anchored else self.names
+                table[rule.pattern] = index
+            else:
+                globs.append(index)
+        self.regex: Optional[Pattern] = None
+        # Group n of the alternation is rule self.groups[n]; index 0 is unused
+        self.groups = [-1] + list(reversed(globs))
+        if globs:
+            self.regex = re.compile(
+                "|".join(f"({rules[i].regex})" for i in self.groups[1:]), re.DOTALL
+            )
+
+    def winner(self, path: str) -> int:
+        """Index of the last rule matching path, or -1."""
+        best = self.paths.get(path, -1)
+        name = path[path.rfind("/") + 1:]
+        best = max(best, self.names.get(name, -1))
+        if self.extensions:
+            dot = name.find(".")
+            while dot != -1:
+                best = max(best, self.extensions.get(name[dot:], -1))
+                dot = name.find(".", dot + 1)
+        if self.regex is not None:
+            found = self.regex.fullmatch(path)
+            if found is not None:
+                best = max(best, self.groups[found.lastindex])
+        return best
+
+
+def _translate(pattern: str) -> str:
+    """Translate one glob (without anchoring or trailing slash) to a regex."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                if pattern.startswith("**/", i):  # zero or more directories
+                    out.append("(?:.*/)?")
+                    i += 3
+                    continue
+                if i + 2 == n:  # everything inside
+                    out.append(".+")
+                    i += 2
+                    continue
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                content = pattern[i + 1:j].replace("\\", "\\\\")
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                out.append(f"[{content}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_lines(lines: Iterable[str]) -> List[str]:
+    """Keep pattern lines, dropping blanks and comments."""
+    patterns = []
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if line and not line.startswith("#"):
+            patterns.append(line)
+    return patterns
+
+
+class IgnoreMatcher:
+    """Decide whether relative paths are ignored by a list of patterns."""
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.rules = [IgnoreRule(p) for p in parse_lines(patterns)]
+        self._dirs = RuleSet(self.rules)
+        self._files = RuleSet([rule for rule in self.rules if not rule.dir_only])
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], defaults: Iterable[str] = ()) -> "IgnoreMatcher":
+        """Load patterns from a file (if it exists) after ``defaults``."""
+        patterns = list(defaults)
+        path = Path(path)
+        if path.is_file():
+            patterns.extend(path.read_text().splitlines())
+        return cls(patterns)
+
+    def match(self, path: str, is_dir: bool = False) -> bool:
+        """Whether the path itself is ignored (parents are not checked)."""
+        rules = self._dirs if is_dir else self._files
+        index = rules.winner(path)
+        return index >= 0 and not rules.rules[index].negated
+
+    def is_ignored(self, path: Union[str, Path], is_dir: bool = False) -> bool:
+        """Whether a path is ignored, either itself or through a parent directory."""
+        parts = Path(path).as_posix().strip("/").split("/")
+        if parts[0] == ".":
+            parts = parts[1:]
+        for depth in range(1, len(parts)):
+            if self.match("/".join(parts[:depth]), is_dir=True):
+                return True
+        return self.match("/".join(parts), is_dir=is_dir)
+
+    def walk(self, root: Union[str, Path]) -> Iterator[Path]:
+        """Yield files under root that are not ignored, depth first by name.
+
+        Ignored directories are pruned, so nothing below them is listed.
+        """
+        for entry, _ in iter_entries(root, self):
+            yield Path(entry.path)
+
+
+def iter_entries(directory: Union[str, Path], matcher: Optional[IgnoreMatcher] = None,
+                 prefix: str = "") -> Iterator[Tuple[os.DirEntry, str]]:
+    """Yield (DirEntry, relative path) for non-ignored files, depth first by name.
+
+    ``prefix`` is the relative path of ``directory`` itself (with a trailing
+    slash) when walking a subtree. DirEntry objects keep the type and stat
+    information from scandir, so callers need no extra syscalls.
+    """
+    stack = [(str(directory), prefix)]
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            with os.scandir(current) as scan:
+                entries = sorted(scan, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            relative = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if matcher is None or not matcher.match(relative, is_dir=True):
+                    subdirs.append((entry.path, relative + "/"))
+            elif entry.is_file() and (matcher is None or not matcher.match(relative)):
+                yield entry, relative
+        stack.extend(reversed(subdirs))
+
+
+def load_ignore_matcher(root: Union[str, Path], defaults: Iterable[str] = ()) -> IgnoreMatcher:
+    """Matcher for a tree: ``defaults`` followed by the root's .codeA.ignore."""
+    return IgnoreMatcher.from_file(Path(root) / IGNORE_FILE, defaults)
@@ -0,0 +1,285 @@
+"""Parallel scanning of ``timestamp | level | message | metadata`` log files.
+
+Files are split into byte segments aligned to line boundaries and parsed in
+worker processes (large files through mmap, so a worker only pages in its
+own segment). Each worker returns a partial ``LogAggregate``; aggregates
+are mergeable, and message samples are bounded: a uniform reservoir sample
+plus approximate top-K frequent messages per level.
+"""
+import os
+import mmap
+import time
+import zlib
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from code_analyzer.utils.parallel import iter_chunk_results
+
+SEGMENT_BYTES = 8 * 1024 * 1024
+MMAP_THRESHOLD = 1024 * 1024
+# Below this much input, process start-up costs more than it saves
+PARALLEL_THRESHOLD = 16 * 1024 * 1024
+SAMPLE_SIZE = 100
+TOP_K = 20
+SAMPLED_LEVELS = ("ERROR", "WARNING")
+
+LogRecord = Tuple[str, str, str, str]  # timestamp, level, message, metadata
+
+
+class ReservoirSample:
+    """Uniform sample of at most ``size`` items from a stream."""
+
+    def __init__(self, size: int = SAMPLE_SIZE, seed: Optional[int] = None):
+        self.size = size
+        self.seen = 0
+        self.items: List[str] = []
+        self._random = random.Random(seed)
+
+    def add(self, item: str):
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+        else:
+            slot = self._random.randrange(self.seen)
+            if slot < self.size:
+                self.items[slot] = item
+
+    def extend(self, items: List[str]):
+        """Add a batch at once: a plain random sample of the batch, merged in."""
+        batch = ReservoirSample(self.size)
+        batch.items = self._random.sample(items, min(self.size, len(items)))
+        batch.seen = len(items)
+        self.merge(batch)
+
+    def merge(self, other: "ReservoirSample"):
+        """Combine two samples as if one reservoir had seen both streams."""
+        if not other.seen:
+            return
+        if self.seen + other.seen <= self.size:
+            self.items.extend(other.items)
+            self.seen += other.seen
+            return
+        mine, theirs = list(self.items), list(other.items)
+        remaining_mine, remaining_theirs = self.seen, other.seen
+        merged = []
+        while len(merged) < self.size and (mine or theirs):
+            # Each pick comes from a side in proportion to the items it stands for
+            take_mine = theirs == [] or (
+                mine and self._random.random() * (remaining_mine + remaining_theirs) < remaining_mine
+            )
+            source = mine if take_mine else theirs
+            merged.append(source.pop(self._random.randrange(len(source))))
+            if take_mine:
+                remaining_mine -= 1
+            else:
+                remaining_theirs -= 1
+        self.items = merged
+        self.seen += other.seen
+
+
+class TopK:
+    """Approximate most frequent items (Misra-Gries), mergeable across workers.
+
+    Counts are kept exactly until there are ``prune_factor * capacity`` of
+    them, then every count is reduced by the ``capacity + 1``-th largest and
+    non-positive ones are dropped. Any item occurring more than
+    ``n / (capacity + 1)`` times survives.
+    """
+
+    def __init__(self, capacity: int = TOP_K * 5, prune_factor: int = 10):
+        self.capacity = capacity
+        self.limit = capacity * prune_factor
+        self.counts: Dict[str, int] = {}
+
+    def add(self, item: str, count: int = 1):
+        self.counts[item] = self.counts.get(item, 0) + count
+        if len(self.counts) > self.limit:
+            self._prune()
+
+    def update(self, items: List[str]):
+        self.merge_counts(Counter(items))
+
+    def merge_counts(self, counts: Dict[str, int]):
+        for item, count in counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+        if len(self.counts) > self.limit:
+            self._prune()
+
+    def _prune(self):
+        if len(self.counts) > self.capacity:
+            cutoff = sorted(self.counts.values(), reverse=True)[self.capacity]
+            self.counts = {k: v - cutoff for k, v in self.counts.items() if v > cutoff}
+
+    def merge(self, other: "TopK"):
+        self.merge_counts(other.counts)
+
+    def most_common(self, n: int = TOP_K) -> List[Tuple[str, int]]:
+        self._prune()
+        return Counter(self.counts).most_common(n)
+
+
+@dataclass
+class LogAggregate:
+    """Mergeable totals for a set of log lines."""
+    total_lines: int = 0
+    bytes_scanned: int = 0
+    levels: Counter = field(default_factory=Counter)
+    crews: Counter = field(default_factory=Counter)
+    samples: Dict[str, ReservoirSample] = field(default_factory=dict)
+    top_messages: Dict[str, TopK] = field(default_factory=dict)
+
+    def _trackers(self, level: str, seed: Optional[int]) -> Tuple[ReservoirSample, TopK]:
+        if level not in self.samples:
+            self.samples[level] = ReservoirSample(seed=seed)
+            self.top_messages[level] = TopK()
+        return self.samples[level], self.top_messages[level]
+
+    def add_message(self, level: str, message: str, seed: Optional[int] = None):
+        sample, top = self._trackers(level, seed)
+        sample.add(message)
+        top.add(message)
+
+    def add_messages(self, level: str, messages: List[str], seed: Optional[int] = None):
+        sample, top = self._trackers(level, seed)
+        sample.extend(messages)
+        top.update(messages)
+
+    def merge(self, other: "LogAggregate"):
+        self.total_lines += other.total_lines
+        self.bytes_scanned += other.bytes_scanned
+        self.levels.update(other.levels)
+        self.crews.update(other.crews)
+        for level, sample in other.samples.items():
+            if level in self.samples:
+                self.samples[level].merge(sample)
+                self.top_messages[level].merge(other.top_messages[level])
+            else:
+                self.samples[level] = sample
+                self.top_messages[level] = other.top_messages[level]
+
+
+@dataclass
+class Segment:
+    """Byte range of a file; owns the lines that start inside it."""
+    path: str
+    start: int
+    end: int
+
+
+def iter_segments(paths: Iterable[Union[str, Path]], segment_bytes: int = SEGMENT_BYTES) -> Iterator[Segment]:
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), segment_bytes):
+            yield Segment(str(path), start, min(start + segment_bytes, size))
+
+
+def read_segment_lines(segment: Segment) -> Tuple[List[str], int]:
+    """Decode the lines owned by a segment and the bytes they span."""
+    with open(segment.path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], 0
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size >= MMAP_THRESHOLD else f.read()
+        try:
+            start = segment.start
+            if start > 0:
+                start = data.find(b"\n", start - 1) + 1 or size
+            end = data.find(b"\n", segment.end - 1) + 1 if segment.end < size else size
+            end = end or size
+            if start >= end:
+                return [], 0
+            text = data[start:end].decode("utf-8", errors="replace")
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+    lines = text.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines, end - start
+
+
+def parse_line(line: str) -> Optional[LogRecord]:
+    """Split a log line into stripped fields, or None if it has fewer than four."""
+    parts = line.split("|", 4)
+    if len(parts) < 4:
+        return None
+    return parts[0].strip(), parts[1].strip(), parts[2].strip(), parts[3].strip()
+
+
+def aggregate_segment(segment: Segment) -> LogAggregate:
+    aggregate = LogAggregate()
+    lines, aggregate.bytes_scanned = read_segment_lines(segment)
+    aggregate.total_lines = len(lines)
+    seed = zlib.crc32(f"{segment.path}:{segment.start}".encode())
+    # Hot loop: parse_line() inlined, and only the fields used are stripped;
+    # a helper call per line costs ~40% of single-core throughput
+    levels: Dict[str, int] = {}
+    crews: Dict[str, int] = {}
+    sampled = {level: [] for level in SAMPLED_LEVELS}
+    for line in lines:
+        parts = line.split("|", 4)
+        if len(parts) < 4:
+            continue
+        level = parts[1].strip()
+        levels[level] = levels.get(level, 0) + 1
+        metadata = parts[3]
+        # The value of "crew_name": "..." in the metadata field
+        if "crew_name" in metadata:
+            crew = metadata.split("crew_name", 2)[1].split('"', 3)
+            if len(crew) > 2:
+                crews[crew[2]] = crews.get(crew[2], 0) + 1
+        if level in sampled:
+            sampled[level].append(parts[2])
+    aggregate.levels.update(levels)
+    aggregate.crews.update(crews)
+    for level, messages in sampled.items():
+        if messages:
+            aggregate.add_messages(level, [m.strip() for m in messages], seed=seed)
+    return aggregate
+
+
+def _aggregate_segments(segments: List[Segment]) -> List[LogAggregate]:
+    return [aggregate_segment(segment) for segment in segments]
+
+
+def _parse_segments(segments: List[Segment]) -> List[List[LogRecord]]:
+    results = []
+    for segment in segments:
+        lines, _ = read_segment_lines(segment)
+        results.append([record for record in map(parse_line, lines) if record is not None])
+    return results
+
+
+def _choose_workers(paths: List[Path], workers: Optional[int]) -> Optional[int]:
+    if workers is not None:
+        return workers
+    total = sum(os.path.getsize(p) for p in paths)
+    return 1 if total < PARALLEL_THRESHOLD else None
+
+
+def scan_logs(paths: Iterable[Union[str, Path]], workers: Optional[int] = None,
+              segment_bytes: int = SEGMENT_BYTES) -> Tuple[LogAggregate, float]:
+    """Aggregate log files in parallel; returns the aggregate and MB/s."""
+    paths = list(paths)
+    start = time.perf_counter()
+    aggregate = LogAggregate()
+    for partial in iter_chunk_results(_aggregate_segments, iter_segments(paths, segment_bytes),
+                                      workers=_choose_workers(paths, workers), chunk_size=1):
+        aggregate.merge(partial)
+    elapsed = time.perf_counter() - start
+    return aggregate, aggregate.bytes_scanned / 1024 / 1024 / max(elapsed, 1e-9)
+
+
+def iter_log_records(paths: Iterable[Union[str, Path]], workers: Optional[int] = None,
+                     segment_bytes: int = SEGMENT_BYTES) -> Iterator[LogRecord]:
+    """Yield parsed (timestamp, level, message, metadata) records from log files.
+
+    Records from each segment stay in file order, but segments arrive in
+    completion order.
+    """
+    paths = list(paths)
+    for records in iter_chunk_results(_parse_segments, iter_segments(paths, segment_bytes),
+                                      workers=_choose_workers(paths, workers), chunk_size=1):
+        yield from records
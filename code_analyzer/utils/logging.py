@@ -1,36 +1,119 @@
 """Logging configuration."""
 from loguru import logger as loguru_logger
 from code_analyzer.models.db_manager import DatabaseManager
-import sys
+from typing import Optional
+from datetime import timezone
 from pathlib import Path
+import threading
+import atexit
+import queue
+import time
+import sys
+
+_STOP = object()
 
 class DatabaseLogHandler:
-    """Handler for storing logs in database."""
+    """Buffered sink storing logs in the database.
     
-    def __init__(self):
-        self.db = DatabaseManager()
+    Records are queued by the logging thread and written by a background
+    writer in batches of ``batch_size`` or every ``flush_interval`` seconds,
+    whichever comes first. The queue holds at most ``max_queue`` records;
+    when full, ``overflow="drop"`` discards new records (counted in
+    ``dropped``) and ``overflow="block"`` waits for the writer. Pending
+    records are written when loguru removes the sink or at exit.
+    """
+    
+    def __init__(self, batch_size: int = 500, flush_interval: float = 0.5,
+                 max_queue: int = 10000, overflow: str = "drop",
+                 db: Optional[DatabaseManager] = None):
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.db = db
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stopped = False
+        self._writer = threading.Thread(
+            target=self._run, name="database-log-writer", daemon=True
+        )
+        self._writer.start()
+        atexit.register(self.stop)
     
-    def __call__(self, message):
-        """Handle log message."""
+    def write(self, message):
+        """Queue a log message for the writer."""
+        if self._stopped:
+            return
         record = message.record
-        
-        # Extract crew name from extras or context
-        crew_name = record["extra"].get("crew_name", "system")
-        
-        # Save to database
-        self.db.save_log_entry(
-            level=record["level"].name,
-            message=record["message"],
-            metadata={
+        entry = {
+            "timestamp": record["time"].astimezone(timezone.utc).replace(tzinfo=None),
+            "level": record["level"].name,
+            "message": record["message"],
+            # Extract crew name from extras or context
+            "crew_name": record["extra"].get("crew_name", "system"),
+            "extra_data": {
                 "function": record["function"],
                 "file": record["file"].name,
                 "line": record["line"],
                 "time": record["time"].isoformat(),
                 "thread": record["thread"].name,
                 "process": record["process"].id
-            },
-            crew_name=crew_name
-        )
+            }
+        }
+        if self.overflow == "block":
+            self._queue.put(entry)
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+    
+    __call__ = write
+    
+    def stop(self):
+        """Write pending records and stop the writer."""
+        if self._stopped:
+            return
+        self._stopped = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        atexit.unregister(self.stop)
+    
+    def _run(self):
+        """Collect queued records into batches and write them."""
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                entry = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                entry = None
+            if entry is _STOP:
+                self._write_batch(batch)
+                return
+            if entry is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(entry)
+            if batch and (len(batch) >= self.batch_size or time.monotonic() >= deadline):
+                self._write_batch(batch)
+                batch = []
+                deadline = None
+    
+    def _write_batch(self, batch):
+        """Insert one batch, reporting failures without re-entering the logger."""
+        if not batch:
+            return
+        try:
+            if self.db is None:
+                self.db = DatabaseManager()
+            self.written += self.db.save_log_entries(batch)
+        except Exception as e:
+            # Logging through loguru here would feed the failure back into this sink
+            sys.stderr.write(f"Failed to write {len(batch)} log entries: {e}\n")
 
 def setup_logging():
     """Setup logging configuration."""
@@ -0,0 +1,64 @@
+"""Process-pool helpers for fanning work out across cores."""
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+DEFAULT_CHUNK_SIZE = 64
+
+
+def default_workers() -> int:
+    """Number of worker processes to use when none is requested."""
+    return os.cpu_count() or 1
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of at most ``size`` items without materializing the input."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_chunk_results(
+    worker: Callable[[List[Any]], List[Any]],
+    items: Iterable[Any],
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Run ``worker`` over chunks of ``items`` and stream results as chunks finish.
+
+    ``worker`` must be a picklable module-level function that takes a list of
+    items and returns a list of results. Only ``workers * 2`` chunks are in
+    flight at once, so ``items`` can be a lazy generator over a huge tree.
+    Results are yielded in completion order, not input order.
+
+    Args:
+        worker: Function applied to each chunk
+        items: Items to process
+        workers: Process count (``1`` runs in-process, ``None`` uses all cores)
+        chunk_size: Items per chunk sent to a worker
+    """
+    workers = workers or default_workers()
+    chunks = chunked(items, chunk_size)
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from worker(chunk)
+        return
+
+    max_in_flight = workers * 2
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for chunk in islice(chunks, max_in_flight):
+            pending.add(pool.submit(worker, chunk))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+                next_chunk = next(chunks, None)
+                if next_chunk is not None:
+                    pending.add(pool.submit(worker, next_chunk))
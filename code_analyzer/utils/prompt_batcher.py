@@ -0,0 +1,127 @@
+"""Pack small files into shared LLM requests and split the answers back out.
+
+Files below ``SMALL_FILE_TOKENS`` are bin-packed (first-fit decreasing) into
+requests of at most a tier's token budget. Each file becomes a delimited
+section with a short id, and the model is asked for a JSON object matching
+``BATCH_RESPONSE_SCHEMA``. ``parse_batch_response`` returns the analyses it
+can match to ids; callers retry the remaining files on their own.
+"""
+import json
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Matches the "Batch Small Files" threshold in CostEstimator.optimize_costs
+SMALL_FILE_TOKENS = 1000
+# Rough size of a token, used instead of a tokenizer to size requests
+CHARS_PER_TOKEN = 4
+# Section header and footer around each file
+SECTION_OVERHEAD_TOKENS = 20
+# Prompt tokens per request when the tier config has no batch_token_budget
+DEFAULT_BATCH_TOKENS = {"fast": 4000, "balanced": 8000, "depth": 8000}
+DEFAULT_BATCH_FILES = 50
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "analysis": {"type": "string"}
+                },
+                "required": ["id", "analysis"]
+            }
+        }
+    },
+    "required": ["results"]
+}
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a code analysis expert. You will receive several files, each between "
+    "'=== FILE <id>: <path> ===' and '=== END FILE <id> ===' lines. Analyze every file "
+    "independently and reply with only a JSON object matching this schema, with one "
+    "entry per file id:\n" + json.dumps(BATCH_RESPONSE_SCHEMA)
+)
+
+
+@dataclass
+class BatchItem:
+    """A file waiting to be analyzed."""
+    index: int
+    file: str
+    content: str
+
+    @property
+    def tokens(self) -> int:
+        return len(self.content) // CHARS_PER_TOKEN + SECTION_OVERHEAD_TOKENS
+
+
+def batch_limits(config: Dict, tier: str) -> Tuple[int, int]:
+    """(token budget, max files) per request for a tier of ai_models.json."""
+    tier_config = config.get("model_tiers", {}).get(tier, {})
+    budget = tier_config.get("batch_token_budget", DEFAULT_BATCH_TOKENS.get(tier, 4000))
+    files = config.get("analysis_phases", {}).get("initial_scan", {}).get("batch_size", DEFAULT_BATCH_FILES)
+    return budget, files
+
+
+def pack_items(items: List[BatchItem], budget: int,
+               max_items: Optional[int] = None) -> List[List[BatchItem]]:
+    """First-fit decreasing bin packing of items into batches of at most ``budget`` tokens.
+
+    An item larger than the budget gets a batch of its own.
+    """
+    bins: List[List[BatchItem]] = []
+    room: List[int] = []
+    for item in sorted(items, key=lambda i: i.tokens, reverse=True):
+        for n, batch in enumerate(bins):
+            if room[n] >= item.tokens and (max_items is None or len(batch) < max_items):
+                batch.append(item)
+                room[n] -= item.tokens
+                break
+        else:
+            bins.append([item])
+            room.append(budget - item.tokens)
+    return bins
+
+
+def build_batch_prompt(items: List[BatchItem]) -> Tuple[List[str], str]:
+    """Return (section ids, user prompt) for a batch.
+
+    Ids carry a nonce derived from the batch so file contents cannot close
+    a section by accident.
+    """
+    nonce = hashlib.sha256("\0".join(i.content for i in items).encode()).hexdigest()[:8]
+    ids = [f"{nonce}-{n}" for n in range(len(items))]
+    sections = [
+        f"=== FILE {section_id}: {item.file} ===\n{item.content}\n=== END FILE {section_id} ==="
+        for section_id, item in zip(ids, items)
+    ]
+    return ids, "Analyze these files:\n\n" + "\n\n".join(sections)
+
+
+def parse_batch_response(text: str, ids: List[str]) -> Dict[str, Any]:
+    """Map section ids to analyses; missing or malformed entries are left out."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        text = text[text.find("\n") + 1:] if "\n" in text else text
+    try:
+        payload = json.loads(text)
+    except ValueError:
+        return {}
+    entries = payload.get("results") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return {}
+
+    wanted = set(ids)
+    analyses: Dict[str, Any] = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        section_id, analysis = entry.get("id"), entry.get("analysis")
+        if section_id in wanted and isinstance(analysis, str) and analysis.strip():
+            analyses[section_id] = analysis
+    return analyses
@@ -0,0 +1,214 @@
+"""Token-bucket rate limits shared by every process on the machine.
+
+Each ``provider/model`` key gets a requests-per-minute and a
+tokens-per-minute bucket, built from ``configs/ai_models.json``. A bucket
+holds up to one minute of budget and refills continuously, so there is no
+window that resets abruptly and a caller that has to wait sleeps exactly
+until its request fits.
+
+Bucket levels live in a small SQLite file. Every check-and-take runs inside
+``BEGIN IMMEDIATE``, so parallel workers (threads or processes) draw from
+the same buckets and can never overshoot a provider limit together.
+"""
+import json
+import time
+import sqlite3
+import asyncio
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+from loguru import logger
+
+DEFAULT_STATE_PATH = Path("crews/crew-output/cache/rate_limits.db")
+CONFIG_PATH = Path("configs/ai_models.json")
+# How long a process waits for another one holding the state file lock
+LOCK_TIMEOUT = 30.0
+# Shortfalls below this are float rounding, not a reason to wait
+EPSILON = 1e-9
+
+
+@dataclass
+class RateLimit:
+    """Per-minute budgets for one key; None means unlimited."""
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    def buckets(self, requests: float, tokens: float):
+        """(bucket suffix, capacity, cost) for each limited budget."""
+        if self.requests_per_minute:
+            yield "requests", self.requests_per_minute, requests
+        if self.tokens_per_minute:
+            yield "tokens", self.tokens_per_minute, tokens
+
+
+def provider_key(provider: Dict) -> str:
+    """Limiter key for a provider entry of ai_models.json."""
+    return f"{provider['name']}/{provider.get('model', provider['name'])}"
+
+
+def limits_from_config(config: Dict) -> Dict[str, RateLimit]:
+    """Build limits for every provider in every tier.
+
+    A model listed in several tiers shares one bucket, using the strictest
+    of its configured limits.
+    """
+    limits: Dict[str, RateLimit] = {}
+    for tier in config.get("model_tiers", {}).values():
+        for provider in tier.get("providers", []):
+            unit = provider.get("rate_limit_unit", "tokens_per_minute")
+            configured = {
+                "requests_per_minute": provider.get("requests_per_minute"),
+                "tokens_per_minute": provider.get("tokens_per_minute"),
+            }
+            if unit in configured and provider.get("rate_limit") is not None:
+                configured[unit] = provider["rate_limit"]
+
+            limit = limits.setdefault(provider_key(provider), RateLimit())
+            for field, value in configured.items():
+                current = getattr(limit, field)
+                if value is not None and (current is None or value < current):
+                    setattr(limit, field, value)
+    return limits
+
+
+class TokenBucketLimiter:
+    """Requests/min and tokens/min buckets per key, persisted in SQLite."""
+
+    def __init__(self, limits: Optional[Dict[str, RateLimit]] = None,
+                 path: Union[str, Path] = DEFAULT_STATE_PATH,
+                 clock: Callable[[], float] = time.time):
+        self.limits: Dict[str, RateLimit] = dict(limits or {})
+        self.path = Path(path)
+        # Wall-clock time, since bucket timestamps are shared between processes
+        self.clock = clock
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the state file on first use."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=LOCK_TIMEOUT,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_buckets ("
+                " bucket TEXT PRIMARY KEY,"
+                " level REAL NOT NULL,"
+                " updated REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def set_limit(self, key: str, limit: RateLimit) -> None:
+        """Add or replace the limits for a key."""
+        self.limits[key] = limit
+
+    @staticmethod
+    def _level(conn: sqlite3.Connection, bucket: str, capacity: float, now: float) -> float:
+        """Current bucket level after refilling; unknown buckets start full."""
+        row = conn.execute(
+            "SELECT level, updated FROM rate_buckets WHERE bucket = ?", (bucket,)
+        ).fetchone()
+        if row is None:
+            return capacity
+        return min(capacity, row[0] + max(0.0, now - row[1]) * capacity / 60.0)
+
+    def _take(self, key: str, requests: float, tokens: float, take: bool) -> float:
+        """Seconds until the request fits; when it fits now and ``take``, deduct it.
+
+        A cost above a bucket's capacity is admitted once the bucket is full
+        and leaves the bucket in debt, so oversized requests still progress.
+        """
+        limit = self.limits.get(key)
+        if limit is None:
+            return 0.0
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                wait = 0.0
+                levels = []
+                for suffix, capacity, cost in limit.buckets(requests, tokens):
+                    bucket = f"{key}:{suffix}"
+                    level = self._level(conn, bucket, capacity, now)
+                    needed = min(cost, capacity)
+                    if needed - level > EPSILON:
+                        wait = max(wait, (needed - level) * 60.0 / capacity)
+                    levels.append((bucket, level - cost))
+                if take and wait == 0.0:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO rate_buckets (bucket, level, updated)"
+                        " VALUES (?, ?, ?)",
+                        [(bucket, level, now) for bucket, level in levels]
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def wait_time(self, key: str, tokens: float = 0, requests: float = 1) -> float:
+        """Seconds until a request of this size would be admitted (nothing is taken)."""
+        return self._take(key, requests, tokens, take=False)
+
+    def try_acquire(self, key: str, tokens: float = 0, requests: float = 1) -> float:
+        """Take the budget if available now; returns 0, or the seconds to wait."""
+        return self._take(key, requests, tokens, take=True)
+
+    async def acquire(self, key: str, tokens: float = 0, requests: float = 1) -> float:
+        """Wait until the budget is available and take it; returns seconds waited."""
+        waited = 0.0
+        while True:
+            wait = await asyncio.to_thread(self.try_acquire, key, tokens, requests)
+            if wait == 0.0:
+                return waited
+            logger.info(f"Rate limit reached for {key}, waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def consume(self, key: str, tokens: float) -> None:
+        """Charge tokens without waiting, e.g. to correct an estimate after a call."""
+        limit = self.limits.get(key)
+        if limit is None or not limit.tokens_per_minute or not tokens:
+            return
+        bucket = f"{key}:tokens"
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                level = self._level(conn, bucket, limit.tokens_per_minute, now)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (bucket, level, updated) VALUES (?, ?, ?)",
+                    (bucket, level - tokens, now)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_limiter: Optional[TokenBucketLimiter] = None
+
+
+def get_rate_limiter() -> TokenBucketLimiter:
+    """Get the process-wide limiter, built from configs/ai_models.json."""
+    global _default_limiter
+    if _default_limiter is None:
+        limits: Dict[str, RateLimit] = {}
+        try:
+            limits = limits_from_config(json.loads(CONFIG_PATH.read_text()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load rate limits, requests are unlimited: {e}")
+        _default_limiter = TokenBucketLimiter(limits)
+    return _default_limiter
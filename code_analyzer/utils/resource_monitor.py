@@ -6,18 +6,122 @@ import psutil
 import os
 from pathlib import Path
 from loguru import logger
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
+from collections import deque
 import asyncio
+import threading
+import math
 import time
 
+class ResourceSampler:
+    """Background sampler keeping a rolling window of process readings.
+    
+    A daemon thread samples CPU, RSS and open file descriptors every
+    ``interval`` seconds. Readers get the latest snapshot without locking:
+    the sampler swaps in a new dict on every tick, and the window is a
+    bounded deque that is only appended to.
+    """
+    
+    def __init__(self, interval: float = 0.5, window_seconds: float = 60.0):
+        self.interval = interval
+        self.process = psutil.Process()
+        self._samples = deque(maxlen=max(1, int(window_seconds / interval)))
+        self._snapshot = {"timestamp": 0.0, "cpu_percent": 0.0, "memory_mb": 0.0, "open_fds": 0}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+        
+    def start(self) -> None:
+        """Start the sampling thread if it is not already running."""
+        with self._start_lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self.process.cpu_percent()  # Prime the CPU counter
+            self._thread = threading.Thread(
+                target=self._run, name="resource-sampler", daemon=True
+            )
+            self._thread.start()
+            
+    def stop(self) -> None:
+        """Stop the sampling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 2)
+            self._thread = None
+            
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.record(self._read())
+            except Exception as e:
+                logger.error(f"Resource sampling failed: {e}")
+                
+    def _read(self) -> Dict[str, float]:
+        """Take one reading of the current process."""
+        memory_info = self.process.memory_info()
+        if hasattr(self.process, "num_fds"):
+            open_fds = self.process.num_fds()
+        else:
+            open_fds = self.process.num_handles()
+        return {
+            "timestamp": time.monotonic(),
+            "cpu_percent": self.process.cpu_percent(),
+            "memory_mb": memory_info.rss / 1024 / 1024,
+            "open_fds": open_fds
+        }
+        
+    def record(self, sample: Dict[str, float]) -> None:
+        """Add a reading to the window and publish it as the snapshot."""
+        self._samples.append(sample)
+        self._snapshot = sample
+        
+    def snapshot(self) -> Dict[str, float]:
+        """Latest reading; never blocks."""
+        return self._snapshot
+        
+    def window(self, seconds: Optional[float] = None) -> List[Dict[str, float]]:
+        """Readings from the last ``seconds`` (or the whole window)."""
+        samples = list(self._samples)
+        if seconds is None:
+            return samples
+        cutoff = time.monotonic() - seconds
+        return [s for s in samples if s["timestamp"] >= cutoff]
+        
+    def percentile(self, metric: str, pct: float, seconds: Optional[float] = None) -> float:
+        """Nearest-rank percentile of ``metric`` over the recent window."""
+        values = sorted(s[metric] for s in self.window(seconds))
+        if not values:
+            return self._snapshot.get(metric, 0.0)
+        rank = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+        return values[rank]
+
+_sampler: Optional[ResourceSampler] = None
+_sampler_lock = threading.Lock()
+
+def get_sampler() -> ResourceSampler:
+    """Get the process-wide sampler, starting it on first use."""
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                _sampler = ResourceSampler()
+    _sampler.start()
+    return _sampler
+
 class ResourceMonitor:
     """Monitor system resources and file handles."""
     
-    def __init__(self, cpu_threshold: float = 95.0):
+    def __init__(self, cpu_threshold: float = 95.0, sampler: ResourceSampler = None):
         self.process = psutil.Process()
         self.cpu_threshold = cpu_threshold
         self.open_files = set()
         self._lock = asyncio.Lock()
+        self.sampler = sampler or get_sampler()
         
     async def track_resource(self, resource_type: str, resource: Any):
         """Track a resource with locking."""
@@ -32,30 +136,22 @@ class ResourceMonitor:
                 self.open_files.discard(id(resource))
                 
     def check_resources(self) -> Dict:
-        """Check resources with better CPU sampling."""
-        try:
-            # Average CPU over 3 samples
-            cpu_samples = []
-            for _ in range(3):
-                cpu_samples.append(self.process.cpu_percent())
-                time.sleep(0.1)
-            
-            cpu_percent = sum(cpu_samples) / len(cpu_samples)
-            memory_info = self.process.memory_info()
-            
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_mb": memory_info.rss / 1024 / 1024,
-                "open_files": len(self.open_files)
-            }
-            
-        except Exception as e:
-            logger.error(f"Resource check failed: {e}")
-            return {
-                "cpu_percent": 0,
-                "memory_mb": 0,
-                "open_files": 0
-            }
+        """Get the latest cached resource readings without blocking."""
+        snapshot = self.sampler.snapshot()
+        return {
+            "cpu_percent": snapshot["cpu_percent"],
+            "memory_mb": snapshot["memory_mb"],
+            "open_fds": snapshot["open_fds"],
+            "open_files": len(self.open_files)
+        }
+        
+    def cpu_percentile(self, pct: float, seconds: Optional[float] = None) -> float:
+        """CPU percentile over the last ``seconds`` (e.g. p95 over 30s)."""
+        return self.sampler.percentile("cpu_percent", pct, seconds)
+        
+    def memory_percentile(self, pct: float, seconds: Optional[float] = None) -> float:
+        """RSS (MB) percentile over the last ``seconds``."""
+        return self.sampler.percentile("memory_mb", pct, seconds)
         
     def cleanup(self):
         """Force cleanup of resources."""
@@ -4,76 +4,127 @@ IMPORTANT: DO NOT MODIFY WITHOUT PERMISSION
 Contact: THE AI RE INVESTOR (405-963-2596)
 """
 from pathlib import Path
+from datetime import datetime
+from typing import Iterable, List, Optional, Union
 from loguru import logger
+from sqlalchemy.dialects.sqlite import insert
 from code_analyzer.models.base import get_session
-from code_analyzer.models.crew_output import LogEntry
-import json
+from code_analyzer.models.log_entry import LogEntry, LogImportCheckpoint
+import hashlib
 import pendulum
 import re
 
-def migrate_logs():
-    """Migrate existing log files to database."""
-    session = get_session()
-    log_dirs = [
-        Path("crews/crew-output/logs"),
-        Path("tests/Logs"),
-        Path("DEV-MAN-CREW/Logs")
-    ]
-    
+LOG_DIRS = [
+    Path("crews/crew-output/logs"),
+    Path("tests/Logs"),
+    Path("DEV-MAN-CREW/Logs")
+]
+CHUNK_SIZE = 5000
+
+LINE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) \| (\w+)\s+\| (.+)')
+# One pass over the message; alternatives keep the old priority order
+# (any "...Crew" word beats "crew X", which beats "X crew").
+CREW_PATTERN = re.compile(r'^(?:.*?(\w+Crew)|.*?crew (\w+)|.*?(\w+) crew)', re.IGNORECASE)
+
+def migrate_logs(log_dirs: Optional[Iterable[Union[str, Path]]] = None,
+                 session=None, chunk_size: int = CHUNK_SIZE) -> int:
+    """Bulk-load log files into log_entries, resuming from saved byte offsets.
+
+    Rows are inserted in chunks of ``chunk_size``; each chunk commits together
+    with the file's new offset, so re-running after a crash (or on an
+    unchanged directory) never inserts a line twice. A ``session`` passed in
+    is left open for the caller.
+    """
+    own_session = session is None
+    session = session or get_session()
+    LogImportCheckpoint.__table__.create(session.get_bind(), checkfirst=True)
+    migrated_at = pendulum.now().isoformat()
     total_migrated = 0
-    
+
     try:
-        for log_dir in log_dirs:
+        for log_dir in map(Path, log_dirs or LOG_DIRS):
             if not log_dir.exists():
                 continue
-                
-            for log_file in log_dir.glob("*.log"):
+
+            for log_file in sorted(log_dir.glob("*.log")):
                 logger.info(f"Processing {log_file}")
-                
-                with open(log_file) as f:
-                    for line in f:
-                        # Parse log line
-                        if match := re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) \| (\w+)\s+\| (.+)', line):
-                            timestamp, level, message = match.groups()
-                            
-                            # Create log entry
-                            entry = LogEntry(
-                                timestamp=pendulum.parse(timestamp),
-                                level=level,
-                                message=message,
-                                crew_name=extract_crew_name(message),
-                                log_metadata={
-                                    "source_file": str(log_file),
-                                    "migrated_at": pendulum.now().isoformat()
-                                }
-                            )
-                            session.add(entry)
-                            total_migrated += 1
-                            
-                # Commit after each file
-                session.commit()
+                total_migrated += migrate_file(session, log_file, migrated_at, chunk_size)
                 logger.info(f"Migrated logs from {log_file}")
-                
+
         logger.success(f"Total logs migrated: {total_migrated}")
-        
+
     except Exception as e:
         logger.error(f"Migration failed: {e}")
         session.rollback()
     finally:
-        session.close()
+        if own_session:
+            session.close()
+    return total_migrated
+
+def migrate_file(session, log_file: Path, migrated_at: str, chunk_size: int = CHUNK_SIZE) -> int:
+    """Load the lines of one file past its checkpoint; returns rows inserted."""
+    key = str(log_file.resolve())
+    checkpoint = session.get(LogImportCheckpoint, key)
+    migrated = 0
+
+    with open(log_file, "rb") as f:
+        fingerprint = _fingerprint(f.readline())
+        offset = 0
+        if checkpoint is not None and checkpoint.fingerprint == fingerprint:
+            offset = checkpoint.offset
+        f.seek(offset)
+
+        rows: List[dict] = []
+        for raw in f:
+            # A trailing line without newline may still be being written
+            if not raw.endswith(b"\n"):
+                break
+            offset += len(raw)
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if match := LINE_PATTERN.match(line):
+                timestamp, level, message = match.groups()
+                rows.append({
+                    "timestamp": parse_timestamp(timestamp),
+                    "level": level,
+                    "message": message,
+                    "crew_name": extract_crew_name(message),
+                    "extra_data": {
+                        "source_file": str(log_file),
+                        "migrated_at": migrated_at
+                    }
+                })
+            if len(rows) >= chunk_size:
+                migrated += _flush(session, key, fingerprint, offset, rows)
+                rows = []
+
+        if rows or checkpoint is None or offset != checkpoint.offset:
+            migrated += _flush(session, key, fingerprint, offset, rows)
+    return migrated
+
+def _flush(session, key: str, fingerprint: Optional[str], offset: int, rows: List[dict]) -> int:
+    """Insert a chunk and advance the file's checkpoint in one transaction."""
+    if rows:
+        session.execute(LogEntry.__table__.insert(), rows)
+    values = {"offset": offset, "fingerprint": fingerprint, "updated_at": datetime.utcnow()}
+    session.execute(
+        insert(LogImportCheckpoint).values(path=key, **values)
+        .on_conflict_do_update(index_elements=["path"], set_=values)
+    )
+    session.commit()
+    return len(rows)
+
+def _fingerprint(first_line: bytes) -> Optional[str]:
+    return hashlib.sha1(first_line).hexdigest() if first_line else None
+
+def parse_timestamp(timestamp: str) -> datetime:
+    """Parse ``2024-01-01 12:00:00,123`` (log timestamps are stored naive)."""
+    return datetime.fromisoformat(timestamp.replace(",", "."))
 
 def extract_crew_name(message: str) -> str:
     """Extract crew name from log message."""
-    crew_patterns = [
-        r'(\w+Crew)',
-        r'crew (\w+)',
-        r'(\w+) crew'
-    ]
-    
-    for pattern in crew_patterns:
-        if match := re.search(pattern, message, re.IGNORECASE):
-            return match.group(1)
+    if match := CREW_PATTERN.match(message):
+        return next(group for group in match.groups() if group)
     return "unknown"
 
 if __name__ == "__main__":
-    migrate_logs() 
\ No newline at end of file
+    migrate_logs()
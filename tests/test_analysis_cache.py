@@ -0,0 +1,82 @@
+"""Tests for the content-hash analysis cache."""
+import sqlite3
+import pytest
+from code_analyzer.utils.analysis_cache import AnalysisCache, content_hash
+from code_analyzer.crews.analysis_crews import pattern_detector
+from code_analyzer.crews.analysis_crews.pattern_detector import PatternDetector
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.db")
+    yield cache
+    cache.close()
+
+def test_round_trip_and_persistence(tmp_path, cache):
+    digest = content_hash("print('hi')")
+    assert cache.get("patterns", "1", digest) is None
+
+    cache.set("patterns", "1", digest, {"metrics": {"class_count": 0}})
+    assert cache.get("patterns", "1", digest) == {"metrics": {"class_count": 0}}
+
+    # A new analyzer version misses, a new process still hits
+    assert cache.get("patterns", "2", digest) is None
+    reopened = AnalysisCache(tmp_path / "cache.db")
+    assert reopened.get("patterns", "1", digest) == {"metrics": {"class_count": 0}}
+    reopened.close()
+
+def test_lru_eviction(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.db", max_bytes=250)
+    payload = "x" * 98  # 100 bytes once JSON encoded
+    cache.set("ns", "1", "a", payload)
+    cache.set("ns", "1", "b", payload)
+    cache.get("ns", "1", "a")  # "b" is now least recently used
+    cache.set("ns", "1", "c", payload)
+
+    assert cache.get("ns", "1", "b") is None
+    assert cache.get("ns", "1", "a") == payload
+    assert cache.get("ns", "1", "c") == payload
+    assert cache.stats()["bytes"] <= 250
+    cache.close()
+
+def test_batched_get_and_set(cache):
+    cache.set("ns", "1", "a", "old")
+    cache.set_many("ns", "1", {"a": [1], "b": {"x": 2}})
+
+    assert cache.get_many("ns", "1", ["a", "b", "missing"]) == {"a": [1], "b": {"x": 2}}
+    assert cache.get_many("ns", "2", ["a"]) == {}
+    # Replaced entries are not double counted
+    assert cache.stats()["bytes"] == len("[1]") + len('{"x": 2}')
+
+def test_hits_defer_access_time_writes(tmp_path, cache):
+    cache.set_many("ns", "1", {"a": 1, "b": 2})
+    reader = sqlite3.connect(str(tmp_path / "cache.db"))
+    def access_times():
+        return dict(reader.execute("SELECT key, last_access FROM cache_entries"))
+    before = access_times()
+
+    assert cache.get("ns", "1", "a") == 1
+    assert cache.get_many("ns", "1", ["a", "b"]) == {"a": 1, "b": 2}
+    # Nothing written yet: hits are kept in memory
+    assert access_times() == before
+    assert cache._conn.total_changes == 2
+
+    cache.close()
+    after = access_times()
+    assert all(after[key] > before[key] for key in before)
+    reader.close()
+
+@pytest.mark.asyncio
+async def test_pattern_detector_skips_unchanged_code(cache, monkeypatch):
+    saved = []
+    monkeypatch.setattr(pattern_detector.DatabaseManager, "save_crew_output",
+                        lambda self, **kwargs: saved.append(kwargs))
+    detector = PatternDetector(cache=cache)
+    code = "class Factory:\n    def create(self):\n        pass\n"
+
+    first = await detector.analyze_patterns(code)
+    second = await detector.analyze_patterns(code)
+
+    assert first == second
+    assert first["design_patterns"][0]["name"] == "factory"
+    assert len(saved) == 1
+    assert cache.hits == 1
@@ -0,0 +1,126 @@
+"""Tests for the tier-aware AnalysisQueue scheduler."""
+import asyncio
+import threading
+import pytest
+from code_analyzer.crews.handlers.analysis_queue import AnalysisQueue
+from code_analyzer.crews.handlers.rate_limit import RateLimitHandler
+from code_analyzer.scripts.benchmark_scheduler import VirtualClockLoop
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.rate_limits import TokenBucketLimiter, limits_from_config
+
+CONFIG = {
+    "model_tiers": {
+        "fast": {"providers": [{"name": "sim", "model": "small", "rate_limit": 100000}]},
+        "balanced": {"providers": [{"name": "sim", "model": "large", "rate_limit": 600}]},
+        "depth": {"providers": [{"name": "sim", "model": "large", "rate_limit": 600}]},
+    },
+    "analysis_phases": {
+        "fast": {"concurrent_requests": 1},
+        "balanced": {"concurrent_requests": 4, "weight": 2},
+        "depth": {"concurrent_requests": 4, "weight": 1},
+    }
+}
+
+
+@pytest.fixture
+def loop():
+    loop = VirtualClockLoop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def handler(loop, tmp_path):
+    limiter = TokenBucketLimiter(limits_from_config(CONFIG), path=tmp_path / "limits.db",
+                                 clock=loop.time)
+    handler = RateLimitHandler(limiter=limiter, monitor=object())
+    handler.config = CONFIG
+    yield handler
+    limiter.close()
+
+
+def make_queue(handler, calls, duration=1.0, cache=None):
+    async def process(file, provider):
+        calls.append(file.name)
+        await asyncio.sleep(duration)
+        return file.name
+    return AnalysisQueue(CONFIG, rate_handler=handler, processor=process, cache=cache)
+
+
+def write(tmp_path, name, content="x = 1\n"):
+    path = tmp_path / name
+    path.write_text(content)
+    return path
+
+
+def test_dequeues_by_deadline_then_priority(loop, handler, tmp_path):
+    calls = []
+    queue = make_queue(handler, calls, cache=AnalysisCache(tmp_path / "cache.db"))
+    queue.add_files([write(tmp_path, "late.py"), write(tmp_path, "plain.py")])
+    queue.add_files([write(tmp_path, "urgent.py")], priority=5)
+    queue.add_files([write(tmp_path, "due.py")], deadline=10.0)
+
+    results = loop.run_until_complete(queue.process_queues())
+
+    assert calls == ["due.py", "urgent.py", "late.py", "plain.py"]
+    assert sorted(results) == sorted(calls)
+    # One fast worker, one second per file
+    assert loop.time() == pytest.approx(4.0)
+
+
+def test_shared_provider_is_split_by_tier_weight(loop, handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(AnalysisQueue, "_score_files",
+                        lambda self, files: {file: float(file.stem[-2:]) for file in files})
+    # 200 tokens each; the shared provider admits 600 tokens a minute
+    content = "x" * 800
+    balanced = [write(tmp_path, f"b_{i}_10.py", content) for i in range(6)]
+    depth = [write(tmp_path, f"d_{i}_20.py", content) for i in range(6)]
+    calls = []
+    queue = make_queue(handler, calls)
+    queue.add_files(balanced + depth)
+
+    reserve_calls = []
+    original = handler.reserve
+    monkeypatch.setattr(handler, "reserve", lambda *args: reserve_calls.append(1) or original(*args))
+    loop.run_until_complete(queue.process_queues())
+
+    first = calls[:9]
+    assert sum(name.startswith("b_") for name in first) == 6
+    assert sum(name.startswith("d_") for name in first) == 3
+    # Waits are timed to the next refill; polling each second would take ~360 calls
+    assert len(reserve_calls) <= 3 * len(calls)
+    assert loop.time() == pytest.approx(180, abs=21)
+
+
+def test_tier_without_budget_does_not_block_others(loop, handler, tmp_path, monkeypatch):
+    monkeypatch.setattr(AnalysisQueue, "_score_files", lambda self, files: {
+        file: 20.0 if file.name.startswith("d") else 0.0 for file in files
+    })
+    calls = []
+    queue = make_queue(handler, calls)
+    queue.add_files([write(tmp_path, f"d_{i}.py", "x" * 2000) for i in range(2)])
+    queue.add_files([write(tmp_path, f"f_{i}.py") for i in range(3)])
+
+    loop.run_until_complete(queue.process_queues())
+
+    assert calls.index("f_2.py") < calls.index("d_1.py")
+
+
+def test_reserve_runs_off_the_event_loop(tmp_path, monkeypatch):
+    monkeypatch.setattr(AnalysisQueue, "_score_files", lambda self, files: {file: 0.0 for file in files})
+    limiter = TokenBucketLimiter(limits_from_config(CONFIG), path=tmp_path / "limits.db")
+    handler = RateLimitHandler(limiter=limiter, monitor=object())
+    handler.config = CONFIG
+    threads = []
+    original = handler.reserve
+    monkeypatch.setattr(handler, "reserve",
+                        lambda *args: threads.append(threading.get_ident()) or original(*args))
+    calls = []
+    queue = make_queue(handler, calls, duration=0)
+    queue.add_files([write(tmp_path, f"f_{i}.py") for i in range(3)])
+
+    asyncio.run(queue.process_queues())
+    limiter.close()
+
+    assert len(calls) == 3
+    assert threads and threading.get_ident() not in threads
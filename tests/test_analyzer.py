@@ -1,4 +1,39 @@
 """Test analyzer functionality."""
 import pytest
 from pathlib import Path
-from code_analyzer.core.analyzer import analyze_directory
\ No newline at end of file
+from code_analyzer.analyzer import analyze_directory, analyze_file
+
+@pytest.fixture
+def sample_tree(tmp_path):
+    """Create a small tree with visible and hidden files."""
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "module.py").write_text("import os\n\nclass A:\n    def run(self):\n        pass\n")
+    (tmp_path / "pkg" / "broken.py").write_text("def broken(:\n")
+    (tmp_path / "notes.txt").write_text("hello\nworld\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "secret.py").write_text("x = 1\n")
+    return tmp_path
+
+def test_analyze_file_counts_structure(sample_tree):
+    """Python files report class, function and import counts."""
+    result = analyze_file(str(sample_tree / "pkg" / "module.py"))
+    assert result["status"] == "completed"
+    assert result["classes"] == 1
+    assert result["functions"] == 1
+    assert result["imports"] == 1
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_analyze_directory_streams_results(sample_tree, workers):
+    """Every visible file is analyzed regardless of worker count."""
+    results = []
+    assert analyze_directory(sample_tree, workers=workers, chunk_size=1,
+                             on_result=results.append)
+
+    by_name = {Path(r["file"]).name: r for r in results}
+    assert set(by_name) == {"module.py", "broken.py", "notes.txt"}
+    assert by_name["broken.py"]["status"] == "failed"
+    assert by_name["notes.txt"]["lines"] == 2
+
+def test_analyze_directory_missing_path(tmp_path):
+    """Missing directories fail cleanly."""
+    assert analyze_directory(tmp_path / "missing") is False
@@ -0,0 +1,76 @@
+"""Tests for AST-aligned chunking of large modules."""
+import ast
+from code_analyzer.utils.chunker import (
+    Chunk, chunk_source, estimate_tokens, merge_chunk_results
+)
+
+FUNCTIONS = "".join(
+    f"def handler_{i}(value: int) -> int:\n    # step {i}\n    return value * {i}\n\n\n" for i in range(40)
+)
+SOURCE = "import os\nfrom typing import List\n\n\n" + FUNCTIONS
+
+
+def test_small_source_is_one_chunk():
+    assert chunk_source("x = 1\n", 100) == [Chunk(1, 1, "x = 1\n")]
+
+
+def test_chunks_follow_function_boundaries_and_fit_budget():
+    chunks = chunk_source(SOURCE, 300)
+    assert len(chunks) > 2
+    assert "".join(c.text for c in chunks) == SOURCE
+    for chunk in chunks:
+        assert estimate_tokens(chunk.header) + estimate_tokens(chunk.text) <= 300
+        # Every chunk parses on its own: no function is cut in half
+        ast.parse(chunk.text)
+        assert chunk.header.startswith("import os\nfrom typing import List")
+        assert "def handler_0(value: int) -> int: ..." in chunk.header
+    assert [c.start_line for c in chunks[1:]] == [c.end_line + 1 for c in chunks[:-1]]
+
+
+def test_large_class_is_split_between_methods():
+    methods = "".join(f"    def method_{i}(self):\n        return {i}\n\n" for i in range(60))
+    source = "class Service(Base):\n    \"\"\"Doc.\"\"\"\n\n" + methods
+    chunks = chunk_source(source, 250)
+    assert len(chunks) > 1
+    assert "".join(c.text for c in chunks) == source
+    assert chunks[0].text.startswith("class Service(Base):\n") and not chunks[0].prefix
+    for chunk in chunks[1:]:
+        assert chunk.prefix == "class Service(Base):\n"
+        assert chunk.text.lstrip("\n").startswith("    def method_")
+        ast.parse(chunk.prefix + chunk.text)
+    assert "Service.method_59" in chunks[-1].names
+
+
+def test_chunks_cover_every_line_of_decorated_class():
+    comment = "".join(f"# {'long comment ' * 6}{i}\n" for i in range(12))
+    methods = "".join(f"    def m{i}(self):\n        return {i}\n\n" for i in range(60))
+    source = f"import os\n\n{comment}@decorator(option=True)\nclass Service:\n{methods}"
+    lines = source.splitlines(keepends=True)
+    chunks = chunk_source(source, 300)
+    covered = set()
+    for chunk in chunks:
+        # Each chunk's text is exactly the lines it is labelled with
+        assert chunk.text == "".join(lines[chunk.start_line - 1:chunk.end_line])
+        covered.update(range(chunk.start_line, chunk.end_line + 1))
+    assert all(n in covered for n, line in enumerate(lines, 1) if line.strip())
+    for chunk in chunks:
+        if "    def m0(self):\n" in chunk.text:
+            assert "class Service:\n" in chunk.prefix + chunk.text
+
+
+def test_unparsable_source_is_split_by_lines():
+    source = "def broken(:\n" + "x = 1\n" * 400
+    chunks = chunk_source(source, 100)
+    assert "".join(c.text for c in chunks) == source
+    assert all(estimate_tokens(c.text) <= 100 for c in chunks)
+
+
+def test_merge_reports_failed_chunks():
+    chunks = [Chunk(1, 10, "a", names=["f"]), Chunk(11, 20, "b")]
+    merged = merge_chunk_results("m.py", chunks, [
+        {"status": "completed", "analysis": "fine"},
+        {"status": "failed", "error": "timeout"}
+    ])
+    assert merged["status"] == "failed"
+    assert merged["analysis"].startswith("Lines 1-10 (f):\nfine")
+    assert merged["error"] == "Failed chunks: lines 11-20"
@@ -0,0 +1,164 @@
+"""Test the CodeAnalysisCrew request pipeline against a local fake OpenAI server."""
+import re
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from openai import AsyncOpenAI
+from code_analyzer.crews.code_analysis_crew import CodeAnalysisCrew
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.chunker import chunk_source
+
+LATENCY = 0.2
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            server.requests += 1
+        time.sleep(LATENCY)
+        with server.lock:
+            server.in_flight -= 1
+
+        prompt = body["messages"][1]["content"]
+        if "response_format" in body:
+            # Batched prompt: answer every section except dropped files
+            sections = re.findall(r"=== FILE (\S+): (\S+) ===", prompt)
+            content = json.dumps({"results": [
+                {"id": section_id, "analysis": f"analysis of {path}"}
+                for section_id, path in sections
+                if not any(path.endswith(name) for name in server.drop)
+            ]})
+        else:
+            content = f"analysis of {len(prompt)} chars"
+        payload = json.dumps({
+            "id": "chatcmpl-test",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2}
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOpenAIHandler)
+    server.lock = threading.Lock()
+    server.in_flight = server.max_in_flight = server.requests = 0
+    server.drop = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{server.server_port}/v1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    yield server
+    server.shutdown()
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    src = tmp_path / "src"
+    src.mkdir()
+    for i in range(9):
+        (src / f"module_{i}.py").write_text(f"VALUE = {i}\n" * (i + 1))
+    return src
+
+async def no_throttle():
+    return None
+
+@pytest.mark.asyncio
+async def test_requests_run_concurrently_within_limit(fake_openai, project, tmp_path):
+    crew = CodeAnalysisCrew(str(project))
+    crew.cache = AnalysisCache(tmp_path / "cache.db")
+    crew.concurrent_requests = 3
+    crew.throttle = no_throttle
+    crew.batching = False
+    # Create the client up front so lazy SDK imports are not timed
+    crew._client = AsyncOpenAI()
+    crew._client.chat.completions
+
+    start = time.perf_counter()
+    results = await crew.analyze_directory(str(project))
+    elapsed = time.perf_counter() - start
+
+    assert results["status"] == "completed"
+    assert results["files_analyzed"] == 9
+    assert all(r["status"] == "completed" for r in results["results"])
+    assert fake_openai.max_in_flight == 3
+    # Nine requests, three at a time: about three latencies rather than nine
+    assert elapsed < LATENCY * 9 * 0.7
+
+@pytest.mark.asyncio
+async def test_unchanged_files_are_served_from_cache(fake_openai, project, tmp_path):
+    crew = CodeAnalysisCrew(str(project))
+    crew.cache = AnalysisCache(tmp_path / "cache.db")
+    crew.throttle = no_throttle
+    crew.batching = False
+
+    first = await crew.analyze_directory(str(project))
+    (project / "module_0.py").write_text("VALUE = 'changed'\n")
+    second = await crew.analyze_directory(str(project))
+
+    assert fake_openai.requests == 10
+    assert [r["file"] for r in first["results"]] == [r["file"] for r in second["results"]]
+
+@pytest.mark.asyncio
+async def test_small_files_share_requests_and_failures_retry_alone(fake_openai, project, tmp_path):
+    (project / "big.py").write_text("x = 1\n" * 1000)
+    fake_openai.drop = {"module_4.py"}
+    crew = CodeAnalysisCrew(str(project))
+    crew.cache = AnalysisCache(tmp_path / "cache.db")
+    crew.throttle = no_throttle
+    crew.batch_tokens = 200
+
+    results = await crew.analyze_directory(str(project))
+
+    assert results["files_analyzed"] == 10
+    assert all(r["status"] == "completed" for r in results["results"])
+    by_file = {r["file"].rsplit("/", 1)[-1]: r["analysis"] for r in results["results"]}
+    assert by_file["module_3.py"].endswith("module_3.py")
+    # Retried alone, so answered by the single-file prompt
+    assert by_file["module_4.py"].endswith("chars")
+    # 9 small files in 200-token batches, one retry, and the large file's chunks
+    chunks = len(chunk_source((project / "big.py").read_text(), 200))
+    assert fake_openai.requests == 3 + 1 + chunks
+
+    fake_openai.requests = 0
+    await crew.analyze_directory(str(project))
+    assert fake_openai.requests == 0
+
+@pytest.mark.asyncio
+async def test_large_files_are_analyzed_in_parallel_chunks(fake_openai, project, tmp_path):
+    functions = "".join(f"def handler_{i}(value):\n    return value * {i}\n\n" for i in range(60))
+    (project / "large.py").write_text("import os\n\n" + functions)
+    crew = CodeAnalysisCrew(str(project))
+    crew.cache = AnalysisCache(tmp_path / "cache.db")
+    crew.throttle = no_throttle
+    crew.concurrent_requests = 3
+    crew.batch_tokens = 300
+
+    results = await crew.analyze_directory(str(project))
+
+    large = next(r for r in results["results"] if r["file"].endswith("large.py"))
+    assert large["status"] == "completed"
+    assert large["chunks"] > 3
+    assert large["analysis"].startswith("Lines 1-")
+    assert "handler_59" in large["analysis"]
+    assert fake_openai.max_in_flight == 3
@@ -0,0 +1,60 @@
+"""Tests for tokenize-based complexity pre-scoring."""
+from code_analyzer.utils import complexity
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.complexity import measure_source, score_files
+
+
+def test_strings_and_comments_are_not_structure():
+    source = b'''"""A class that explains def and async."""
+# class Commented: def f(): pass
+TEMPLATE = "class Foo:\\n    def bar(self): pass"
+'''
+    metrics = measure_source(source)
+    assert (metrics["classes"], metrics["functions"], metrics["async"]) == (0, 0, 0)
+    assert metrics["tokens"] == 4
+
+
+def test_counts_structure_and_nesting():
+    source = b'''
+class A:
+    async def f(self):
+        for x in y:
+            if x:
+                return x
+
+def g():
+    pass
+'''
+    metrics = measure_source(source)
+    assert metrics == {"tokens": metrics["tokens"], "functions": 2, "classes": 1,
+                       "async": 1, "max_nesting": 4}
+    assert complexity.complexity_score(metrics) > complexity.complexity_score(
+        measure_source(b"def g():\n    pass\n"))
+
+
+def test_broken_and_non_utf8_files_still_score():
+    assert measure_source(b"def f(:\n    x = '''unterminated\n")["functions"] == 1
+    assert measure_source(b"# -*- coding: latin-1 -*-\ns = '\xe9'\ndef f(): pass\n")["functions"] == 1
+
+
+def test_scores_are_cached_by_content(tmp_path, monkeypatch):
+    cache = AnalysisCache(tmp_path / "cache.db")
+    files = []
+    for name, body in [("a.py", "def f(): pass\n"), ("b.py", "def f(): pass\n"), ("c.py", "x = 1\n")]:
+        files.append(tmp_path / name)
+        files[-1].write_text(body)
+    measured = []
+    original = complexity.measure_files
+    monkeypatch.setattr(complexity, "measure_files",
+                        lambda paths: measured.extend(paths) or original(paths))
+
+    first = score_files(files + [tmp_path / "missing.py"], cache=cache)
+    # Identical contents are measured once
+    assert len(measured) == 2
+    assert first[files[0]] == first[files[1]]
+    assert first[files[0]]["functions"] == 1
+    assert first[tmp_path / "missing.py"]["status"] == "failed"
+
+    assert score_files(files, cache=cache) == {file: first[file] for file in files}
+    assert len(measured) == 2
+    cache.close()
@@ -0,0 +1,157 @@
+"""Tests for CostEstimator's fast, cached estimate mode."""
+import os
+import pytest
+import tiktoken
+from code_analyzer.utils import cost_estimator
+from code_analyzer.utils.analysis_cache import AnalysisCache
+from code_analyzer.utils.cost_estimator import CostEstimator
+
+
+class CountingEncoding(tiktoken.Encoding):
+    """Byte-level encoding (one token per byte) that records how much it encodes."""
+
+    def __init__(self):
+        super().__init__(
+            name="test_bytes",
+            pat_str=r"\S+|\s+",
+            mergeable_ranks={bytes([i]): i for i in range(256)},
+            special_tokens={}
+        )
+        self.encoded = 0
+
+    def encode_batch(self, text, **kwargs):
+        self.encoded += len(text)
+        return super().encode_batch(text, **kwargs)
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    encoding = CountingEncoding()
+    monkeypatch.setattr(tiktoken, "encoding_for_model", lambda model: encoding)
+    return encoding
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "project"
+    (root / "pkg").mkdir(parents=True)
+    (root / "pkg" / "a.py").write_text("x = 1\n")
+    (root / "pkg" / "b.py").write_text("def f():\n    return 2\n")
+    (root / "pkg" / "notes.txt").write_text("not python")
+    for ignored in [".venv/lib", ".git/hooks", "pkg/__pycache__"]:
+        (root / ignored).mkdir(parents=True)
+        (root / ignored / "skip.py").write_text("skipped = True\n")
+    return root
+
+
+@pytest.fixture
+def estimator(encoding, tmp_path):
+    return CostEstimator(cache=AnalysisCache(tmp_path / "cache.db"), workers=2)
+
+
+def test_ignored_directories_are_pruned(estimator, project):
+    (project / ".codeA.ignore").write_text("pkg/b.py\n")
+    (project / ".github").mkdir()
+    (project / ".github" / "ci.py").write_text("ok = True\n")
+    files = estimator._get_analyzable_files(project)
+    assert sorted(f.relative_to(project).as_posix() for f in files) == [".github/ci.py", "pkg/a.py"]
+    assert not estimator._should_analyze(project / ".venv" / "lib" / "skip.py")
+
+
+def test_fast_estimate_matches_serial_counts(estimator, project):
+    slow = estimator.estimate_project(str(project))
+    fast = estimator.estimate_project(str(project), fast=True)
+
+    assert fast["summary"] == slow["summary"]
+    assert sorted(f["file"] for f in fast["files"]) == sorted(f["file"] for f in slow["files"])
+
+
+def test_repeat_estimate_only_tokenizes_changed_files(estimator, encoding, project):
+    estimator.estimate_project(str(project), fast=True)
+    assert encoding.encoded == 2
+
+    estimator.estimate_project(str(project), fast=True)
+    assert encoding.encoded == 2
+
+    # Touched but unchanged content is matched by hash
+    os.utime(project / "pkg" / "a.py", ns=(0, 0))
+    (project / "pkg" / "b.py").write_text("def f():\n    return 3 + 4\n")
+    estimate = estimator.estimate_project(str(project), fast=True)
+
+    assert encoding.encoded == 3
+    tokens = {os.path.basename(f["file"]): f["tokens"] for f in estimate["files"]}
+    assert tokens == {"a.py": 6, "b.py": len("def f():\n    return 3 + 4\n")}
+
+
+def test_stratified_total_is_exact_for_full_strata():
+    total, margin = cost_estimator.stratified_total([(3, [1, 2, 3]), (2, [10, 10])])
+    assert (total, margin) == (26, 0)
+
+    total, margin = cost_estimator.stratified_total([(100, [1, 3])])
+    assert total == 200
+    assert margin == pytest.approx(1.96 * (100 ** 2 * 0.98 * 2 / 2) ** 0.5)
+
+
+@pytest.fixture
+def large_project(tmp_path):
+    root = tmp_path / "large"
+    for i in range(400):
+        package = root / f"pkg_{i % 4}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"m_{i}.py").write_text("x = 1\n" * (1 + (i * 37) % 300))
+    return root
+
+
+def test_sample_estimate_brackets_the_full_count(estimator, encoding, large_project):
+    full = estimator.estimate_project(str(large_project), fast=True)
+    encoding.encoded = 0
+    estimator.cache.clear()
+
+    estimate = estimator.estimate_project(str(large_project), sample=60, seed=1)
+
+    sample = estimate["sample"]
+    assert estimate["summary"]["total_files"] == 400
+    assert sample["sampled_files"] == len(estimate["files"]) == 60
+    # Identical contents are only encoded once
+    assert encoding.encoded <= sample["sampled_files"]
+    truth = full["summary"]["total_tokens"]
+    assert abs(estimate["summary"]["total_tokens"] - truth) <= sample["margins"]["total_tokens"]
+    assert sum(estimate["summary"]["cost_breakdown"].values()) == pytest.approx(
+        estimate["summary"]["estimated_cost"])
+
+
+def test_sample_never_exceeds_budget_with_many_directories(estimator, tmp_path):
+    root = tmp_path / "wide"
+    for i in range(300):
+        package = root / f"pkg_{i // 3}"
+        package.mkdir(parents=True, exist_ok=True)
+        (package / f"m_{i}.py").write_text("x = 1\n" * (1 + (i * 37) % 300))
+
+    for budget in (5, 40, 250):
+        estimate = estimator.estimate_project(str(root), sample=budget, seed=2)
+        assert estimate["sample"]["sampled_files"] == len(estimate["files"]) == budget
+
+
+def test_stratify_uses_discovered_sizes(estimator, tmp_path):
+    # The files do not exist: sizes must come from discovery, not a stat
+    sizes = {tmp_path / "a" / "small.py": 10, tmp_path / "a" / "big.py": 10 ** 6,
+             tmp_path / "top.py": 10}
+    strata = estimator._stratify(tmp_path, sizes)
+    assert strata == {("a", 0): [tmp_path / "a" / "small.py"],
+                      ("a", 5): [tmp_path / "a" / "big.py"],
+                      (".", 0): [tmp_path / "top.py"]}
+
+
+def test_sample_larger_than_project_is_exact(estimator, project):
+    estimate = estimator.estimate_project(str(project), sample=100)
+    assert "sample" not in estimate
+    assert estimate["summary"] == estimator.estimate_project(str(project))["summary"]
+
+
+def test_display_states_error_bound(estimator, large_project):
+    estimate = estimator.estimate_project(str(large_project), sample=40)
+    with estimator.console.capture() as capture:
+        estimator.display_estimate(estimate)
+    output = capture.get()
+    assert "±" in output
+    assert "95% confidence" in output
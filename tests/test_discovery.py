@@ -0,0 +1,92 @@
+"""Tests for scandir-based discovery and the change manifest."""
+import os
+from pathlib import Path
+import pytest
+from code_analyzer.analyzer import analyze_directory
+from code_analyzer.utils.discovery import DiscoveryService
+from code_analyzer.utils.ignore import DEFAULT_PATTERNS, IgnoreMatcher
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    for relative in ["a.py", "pkg/b.py", "pkg/sub/c.py", "pkg/notes.md", "other/d.py",
+                     ".git/objects/x.py", "pkg/__pycache__/b.cpython-311.pyc"]:
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {relative}\n")
+    return root
+
+
+def service(root, tmp_path, **kwargs):
+    return DiscoveryService(root, IgnoreMatcher(DEFAULT_PATTERNS),
+                            manifest_path=tmp_path / "manifest.json", **kwargs)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_scan_prunes_ignored_and_filters_suffixes(tree, tmp_path, workers):
+    files = service(tree, tmp_path, suffixes={".py"}, workers=workers).scan()
+    assert [info.relative for info in files] == ["a.py", "other/d.py", "pkg/b.py", "pkg/sub/c.py"]
+    info = files[0]
+    assert info.path == tree / "a.py"
+    assert info.size == (tree / "a.py").stat().st_size
+    assert info.mtime_ns == (tree / "a.py").stat().st_mtime_ns
+
+
+def test_changes_reports_added_changed_and_deleted(tree, tmp_path):
+    first = service(tree, tmp_path).changes()
+    assert len(first.added) == 5
+    assert not first.changed and not first.deleted
+    # Nothing is recorded until the diff is committed
+    assert len(service(tree, tmp_path).changes().added) == 5
+    service(tree, tmp_path).commit(first)
+
+    assert not service(tree, tmp_path).changes(save=True).modified
+
+    # Touched without a content change is not reported
+    os.utime(tree / "a.py", ns=(0, 0))
+    (tree / "pkg" / "b.py").write_text("changed = True\n")
+    (tree / "pkg" / "new.py").write_text("new = True\n")
+    (tree / "other" / "d.py").unlink()
+    diff = service(tree, tmp_path).changes()
+
+    assert [info.relative for info in diff.added] == ["pkg/new.py"]
+    assert [info.relative for info in diff.changed] == ["pkg/b.py"]
+    assert diff.deleted == ["other/d.py"]
+    assert [info.relative for info in diff.modified] == ["pkg/b.py", "pkg/new.py"]
+    assert "a.py" in {info.relative for info in diff.unchanged}
+
+
+def test_unreadable_manifest_is_a_full_scan(tree, tmp_path):
+    (tmp_path / "manifest.json").write_text("{not json")
+    diff = service(tree, tmp_path).changes()
+    assert len(diff.added) == 5
+
+
+def test_commit_keeps_failed_files_pending(tree, tmp_path):
+    diff = service(tree, tmp_path).changes(save=True)
+    (tree / "pkg" / "b.py").write_text("changed = True\n")
+    (tree / "pkg" / "new.py").write_text("new = True\n")
+    diff = service(tree, tmp_path).changes()
+    # Only pkg/b.py was analyzed successfully
+    service(tree, tmp_path).commit(diff, succeeded=[tree / "pkg" / "b.py"])
+    assert [info.relative for info in service(tree, tmp_path).changes().modified] == ["pkg/new.py"]
+
+
+def test_failed_file_is_analyzed_again_next_run(tmp_path, monkeypatch):
+    root = tmp_path / "src"
+    root.mkdir()
+    (root / "good.py").write_text("x = 1\n")
+    (root / "bad.py").write_text("def broken(:\n")
+    monkeypatch.chdir(tmp_path)
+
+    def run():
+        results = []
+        assert analyze_directory(root, workers=1, on_result=results.append, changed_only=True)
+        return sorted(Path(r["file"]).name for r in results)
+
+    assert run() == ["bad.py", "good.py"]
+    assert run() == ["bad.py"]
+    (root / "bad.py").write_text("def fixed():\n    pass\n")
+    assert run() == ["bad.py"]
+    assert run() == []
@@ -0,0 +1,59 @@
+"""Tests for vectorized git analytics."""
+import time
+import pytest
+from code_analyzer.utils.git_log import GitCommit
+from code_analyzer.utils.git_history import CommitTable
+from code_analyzer.utils.git_analytics import vectorized_git_patterns
+from code_analyzer.scripts.analyze_history import git_patterns_from_table
+from code_analyzer.scripts.benchmark_git_analytics import synthetic_table
+
+DAY = 86400
+
+@pytest.fixture
+def new_york(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+def make_table(rows):
+    table = CommitTable()
+    for i, (timestamp, author, files) in enumerate(rows):
+        table.append(GitCommit(
+            hexsha=f"{i:040x}", parents=[], author_name=author, author_email="",
+            committed_date=timestamp, message=f"commit {i}",
+            files={path: {"insertions": a, "deletions": d, "lines": a + d} for path, (a, d) in files.items()}
+        ))
+    return table
+
+def test_matches_dict_path_across_dst(new_york):
+    table = synthetic_table(20000, 3, 20, 300)
+    vectorized = vectorized_git_patterns(table)
+    expected = git_patterns_from_table(table)
+    for key in ("authors", "file_changes", "commit_times", "commit_days"):
+        assert vectorized[key] == dict(expected[key]), key
+    assert vectorized["total_commits"] == 20000
+
+def test_hotspots_churn_and_rolling_activity():
+    start = 1_700_000_000 - 1_700_000_000 % DAY
+    table = make_table([
+        (start, "ada", {"a.py": (10, 2), "b.py": (1, 0)}),
+        (start + DAY, "ada", {"a.py": (5, 5)}),
+        (start + 2 * DAY, "bob", {"b.py": (30, 0)}),
+        (start + 10 * DAY, "bob", {"c.py": (1, 1)}),
+    ])
+    result = vectorized_git_patterns(table, window_days=3, top_n=2)
+    assert result["churn"] == {"additions": 47, "deletions": 8, "total": 55}
+    assert result["hotspots"] == [
+        {"path": "b.py", "changes": 2, "churn": 31},
+        {"path": "a.py", "changes": 2, "churn": 22},
+    ]
+    assert result["rolling_activity"]["peak_commits"] == 3
+    assert result["rolling_activity"]["current"] == 1
+
+def test_empty_table():
+    result = vectorized_git_patterns(CommitTable())
+    assert result["total_commits"] == 0
+    assert result["hotspots"] == []
+    assert result["rolling_activity"]["peak_window_end"] is None
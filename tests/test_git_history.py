@@ -0,0 +1,130 @@
+"""Tests for the shared, cached commit table."""
+import os
+import sys
+import threading
+import subprocess
+import pytest
+import git
+from git.exc import GitCommandError
+from code_analyzer.utils import git_history
+from code_analyzer.utils.git_history import load_commit_table
+from code_analyzer.utils.git_log import iter_git_log
+from code_analyzer.scripts.analyze_history import DevelopmentAnalyzer
+
+def run_git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+def commit(repo, message, files, author="Tester"):
+    for name, content in files.items():
+        (repo / name).write_text(content)
+    run_git(repo, "add", "-A")
+    run_git(repo, "-c", f"user.name={author}", "-c", "user.email=t@example.com",
+            "commit", "-q", "-m", message)
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run_git(repo, "init", "-q", "-b", "main")
+    commit(repo, "one", {"a.py": "1\n", "b.py": "1\n"}, author="Ada")
+    commit(repo, "two", {"a.py": "2\n3\n"}, author="Grace")
+    commit(repo, "three", {"b.py": "x\n"}, author="Ada")
+    return repo
+
+@pytest.fixture
+def git_log_calls(monkeypatch):
+    calls = []
+    original = git_history.iter_git_log
+    def tracking(*args, **kwargs):
+        calls.append(kwargs.get("since"))
+        return original(*args, **kwargs)
+    monkeypatch.setattr(git_history, "iter_git_log", tracking)
+    return calls
+
+def test_columns_match_git(repo, tmp_path):
+    table = load_commit_table(repo, cache_dir=tmp_path / "cache")
+    gitpython = git.Repo(repo)
+    assert table.shas == [c.hexsha for c in reversed(list(gitpython.iter_commits()))]
+    assert [table.authors[i] for i in table.author_ids] == ["Ada", "Grace", "Ada"]
+    assert table.authors == ["Ada", "Grace"]
+    assert list(table.files(1)) == [("a.py", 2, 1)]
+    assert table.commit(0).files["b.py"] == {"insertions": 1, "deletions": 0, "lines": 1}
+    assert table.head == gitpython.head.commit.hexsha
+
+def test_cache_reused_and_extended(repo, tmp_path, git_log_calls):
+    cache = tmp_path / "cache"
+    first = load_commit_table(repo, cache_dir=cache)
+    assert load_commit_table(repo, cache_dir=cache).shas == first.shas
+    assert git_log_calls == [None]
+
+    commit(repo, "four", {"c.py": "c\n"})
+    table = load_commit_table(repo, cache_dir=cache)
+    assert git_log_calls == [None, first.head]
+    assert len(table) == 4
+    assert table.rows_since(repo, first.head) == [3]
+    assert table.paths.count("c.py") == 1
+
+def test_rewritten_history_rebuilds(repo, tmp_path, git_log_calls):
+    cache = tmp_path / "cache"
+    load_commit_table(repo, cache_dir=cache)
+    run_git(repo, "reset", "-q", "--hard", "HEAD~1")
+    commit(repo, "other", {"d.py": "d\n"})
+    table = load_commit_table(repo, cache_dir=cache)
+    assert git_log_calls == [None, None]
+    assert [table.messages[i] for i in range(len(table))] == ["one", "two", "other"]
+
+def test_development_analyzer_reads_table(repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(git_history, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    analyzer = DevelopmentAnalyzer.__new__(DevelopmentAnalyzer)
+    analyzer.repo = git.Repo(repo)
+    analyzer.analysis = {}
+    analyzer.analyze_git_patterns()
+    result = analyzer.analysis["git"]
+    assert result["total_commits"] == 3
+    assert dict(result["authors"]) == {"Ada": 2, "Grace": 1}
+    assert dict(result["file_changes"]) == {"a.py": 2, "b.py": 2}
+
+
+def test_development_analyzer_vectorized(repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(git_history, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    analyzer = DevelopmentAnalyzer.__new__(DevelopmentAnalyzer)
+    analyzer.repo = git.Repo(repo)
+    analyzer.analysis = {}
+    analyzer.vectorized = True
+    analyzer.analyze_git_patterns()
+    result = analyzer.analysis["git"]
+    assert result["total_commits"] == 3
+    assert dict(result["authors"]) == {"Ada": 2, "Grace": 1}
+    assert dict(result["file_changes"]) == {"a.py": 2, "b.py": 2}
+    assert result["churn"] == {"additions": 5, "deletions": 2, "total": 7}
+    assert {h["path"] for h in result["hotspots"]} == {"a.py", "b.py"}
+
+
+@pytest.fixture
+def noisy_git(tmp_path, monkeypatch):
+    """A ``git`` on PATH that writes 1 MB of warnings before its output."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "git"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import os, sys\n"
+        "sys.stderr.write('warning: noisy\\n' * 65536)\n"
+        "sys.stderr.flush()\n"
+        "sys.stdout.write('\\x1e' + '\\x1f'.join(['a' * 40, '', 'Ada', 'a@x', '1', 'msg\\n', '1\\t0\\ta.py\\n']))\n"
+        "sys.exit(int(os.environ.get('NOISY_GIT_EXIT', '0')))\n"
+    )
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}:{os.environ['PATH']}")
+
+def test_git_log_survives_large_stderr(noisy_git, tmp_path, monkeypatch):
+    result = []
+    reader = threading.Thread(target=lambda: result.extend(iter_git_log(tmp_path)), daemon=True)
+    reader.start()
+    reader.join(timeout=20)
+    assert not reader.is_alive(), "iter_git_log blocked on git's stderr"
+    assert [c.files for c in result] == [{"a.py": {"insertions": 1, "deletions": 0, "lines": 1}}]
+
+    monkeypatch.setenv("NOISY_GIT_EXIT", "128")
+    with pytest.raises(GitCommandError, match="warning: noisy"):
+        list(iter_git_log(tmp_path))
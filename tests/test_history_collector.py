@@ -0,0 +1,123 @@
+"""Tests for streaming, incremental git history ingestion."""
+import subprocess
+import pytest
+import git
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.development_timeline import DevelopmentEvent, FileChange
+from code_analyzer.scripts.collect_history import HistoryCollector
+from code_analyzer.utils import git_history
+from code_analyzer.utils.git_log import iter_git_log
+
+def run_git(repo, *args):
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+def commit_files(repo, message, files):
+    for name, content in files.items():
+        path = repo / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content) if isinstance(content, bytes) else path.write_text(content)
+    run_git(repo, "add", "-A")
+    run_git(repo, "commit", "-q", "-m", message)
+
+@pytest.fixture(autouse=True)
+def commit_table_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_history, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run_git(repo, "init", "-q", "-b", "main")
+    run_git(repo, "config", "user.name", "Tester")
+    run_git(repo, "config", "user.email", "tester@example.com")
+    commit_files(repo, "initial", {"a.py": "a = 1\n", "docs/readme.md": "hello\n"})
+    commit_files(repo, "second\n\nwith body", {"a.py": "a = 2\nb = 3\n", "data.bin": b"\x00\x01"})
+    run_git(repo, "checkout", "-q", "-b", "feature")
+    commit_files(repo, "feature", {"feature.py": "x = 1\n"})
+    run_git(repo, "checkout", "-q", "main")
+    commit_files(repo, "main work", {"docs/readme.md": "hello\nworld\n"})
+    run_git(repo, "merge", "-q", "--no-ff", "-m", "merge feature", "feature")
+    return repo
+
+@pytest.fixture
+def collector_factory(repo, tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+
+    def make(chunk_size=2):
+        collector = HistoryCollector(str(repo), chunk_size=chunk_size)
+        collector.db.session = Session()
+        return collector
+    yield make
+    engine.dispose()
+
+def test_stream_matches_gitpython_stats(repo):
+    gitpython = git.Repo(repo)
+    commits = list(iter_git_log(repo))
+    assert [c.hexsha for c in commits] == [c.hexsha for c in gitpython.iter_commits()]
+    for commit in commits:
+        expected = gitpython.commit(commit.hexsha)
+        stats = {path: {k: s[k] for k in ("insertions", "deletions", "lines")}
+                 for path, s in expected.stats.files.items()}
+        assert commit.files == stats
+        assert commit.message == expected.message.rstrip("\n")
+        assert commit.author_name == expected.author.name
+
+def test_ingestion_is_incremental(repo, collector_factory):
+    collector = collector_factory()
+    assert collector.collect_git_history() == 5
+    assert collector.collect_git_history() == 0
+
+    commit_files(repo, "later", {"a.py": "a = 3\n"})
+    assert collector_factory().collect_git_history() == 1
+
+    session = collector.db.session
+    events = session.query(DevelopmentEvent).order_by(DevelopmentEvent.id).all()
+    assert [e.title for e in events] == ["initial", "second", "feature", "main work", "merge feature", "later"]
+    assert events[1].description == "second\n\nwith body"
+    assert events[0].event_data["branch"] == "main"
+    changes = {c.file_path: c.change_data for c in events[1].files_changed}
+    assert changes == {
+        "a.py": {"insertions": 2, "deletions": 1, "lines": 3},
+        "data.bin": {"insertions": 0, "deletions": 0, "lines": 0},
+    }
+    # Merge commits are diffed against their first parent
+    assert [c.file_path for c in events[4].files_changed] == ["feature.py"]
+    assert session.query(FileChange).count() == 8
+
+def test_missing_checkpoint_falls_back_to_full_history(repo, collector_factory):
+    collector = collector_factory()
+    collector.collect_git_history()
+    run_git(repo, "reset", "-q", "--hard", "HEAD~1")
+    run_git(repo, "commit", "-q", "--amend", "-m", "rewritten")
+    run_git(repo, "reflog", "expire", "--expire=now", "--all")
+    run_git(repo, "gc", "-q", "--prune=now")
+    # initial, second and the rewritten commit
+    assert collector.collect_git_history() == 3
+
+@pytest.mark.parametrize("fail_at", [1, 2, 3, 4])
+def test_interrupted_run_resumes_without_duplicates(repo, collector_factory, monkeypatch, fail_at):
+    collector = collector_factory(chunk_size=1)
+    original = collector._insert_commits
+    calls = []
+
+    def failing(commits, branch):
+        calls.append(commits[0].hexsha)
+        if len(calls) > fail_at:
+            raise RuntimeError("interrupted")
+        return original(commits, branch)
+
+    monkeypatch.setattr(collector, "_insert_commits", failing)
+    with pytest.raises(RuntimeError):
+        collector.collect_git_history()
+    collector.db.session.rollback()
+
+    # HEAD moves on before the resumed run
+    commit_files(repo, "later", {"a.py": "a = 3\n"})
+    assert collector_factory(chunk_size=1).collect_git_history() == 6 - fail_at
+
+    hashes = [e.event_data["hash"] for e in collector.db.session.query(DevelopmentEvent)]
+    assert len(hashes) == len(set(hashes)) == 6
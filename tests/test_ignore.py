@@ -0,0 +1,78 @@
+"""Tests for the compiled gitignore matcher."""
+import os
+import pytest
+from code_analyzer.utils import ignore
+from code_analyzer.utils.ignore import IgnoreMatcher, load_ignore_matcher
+from code_analyzer.utils.file_counter import FileCounter
+
+
+@pytest.mark.parametrize("patterns,path,expected", [
+    (["*.log"], "a/b/debug.log", True),
+    (["*.log"], ".log", True),
+    (["*.tar.gz"], "dist/pkg.tar.gz", True),
+    (["*.tar.gz"], "dist/pkg.gz", False),
+    (["build"], "a/build", True),
+    (["a/build"], "x/a/build", False),
+    (["*.log", "!keep.log"], "a/keep.log", False),
+    (["!keep.log", "*.log"], "a/keep.log", True),
+    (["/build"], "build", True),
+    (["/build"], "src/build", False),
+    (["docs/*.md"], "docs/a.md", True),
+    (["docs/*.md"], "docs/sub/a.md", False),
+    (["a/**/b"], "a/b", True),
+    (["a/**/b"], "a/x/y/b", True),
+    (["**/tmp"], "x/tmp", True),
+    (["logs/**"], "logs/deep/file", True),
+    (["logs/**"], "logs", False),
+    (["file?.txt"], "file1.txt", True),
+    (["file?.txt"], "file/.txt", False),
+    (["[!a]x.txt"], "bx.txt", True),
+    (["[!a]x.txt"], "ax.txt", False),
+    (["\\#hash"], "#hash", True),
+    (["# comment", ""], "# comment", False),
+])
+def test_gitignore_semantics(patterns, path, expected):
+    assert IgnoreMatcher(patterns).is_ignored(path) is expected
+
+
+def test_dir_only_patterns_apply_to_directories_and_their_contents():
+    matcher = IgnoreMatcher(["cache/", "!cache/keep.txt"])
+    assert matcher.is_ignored("cache", is_dir=True)
+    assert not matcher.is_ignored("cache")
+    # A file cannot be re-included once its directory is excluded
+    assert matcher.is_ignored("cache/keep.txt")
+    assert matcher.is_ignored("src/cache/data.bin")
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for path in ["src/a.py", "src/b.log", "src/.hidden/x.py", "build/out.py",
+                 "vendor/big/deep/lib.py", "docs/README.md", "docs/guide.md"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("")
+    (tmp_path / ".codeA.ignore").write_text("*.log\n/build/\nvendor/\n*.md\n!README.md\n")
+    return tmp_path
+
+
+def test_walk_prunes_ignored_directories(tree, monkeypatch):
+    scanned = []
+    scandir = os.scandir
+
+    def recording_scandir(path):
+        scanned.append(os.path.relpath(path, tree))
+        return scandir(path)
+
+    monkeypatch.setattr(ignore.os, "scandir", recording_scandir)
+    matcher = load_ignore_matcher(tree, [".*"])
+    files = [f.relative_to(tree).as_posix() for f in matcher.walk(tree)]
+
+    assert files == ["docs/README.md", "src/a.py"]
+    assert sorted(scanned) == [".", "docs", "src"]
+
+
+def test_file_counter_uses_matcher(tree):
+    counter = FileCounter(tree / ".codeA.ignore")
+    assert counter.should_ignore("vendor/big/deep/lib.py")
+    assert not counter.should_ignore("docs/README.md")
+    counted = [f for files in counter.count_files(tree).values() for f in files]
+    assert all("vendor" not in str(f) and "build" not in str(f) for f in counted)
@@ -0,0 +1,87 @@
+"""Tests for push-based dashboard log streaming."""
+import time
+import asyncio
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from code_analyzer.models.base import Base
+from code_analyzer.models.log_entry import LogEntry
+from code_analyzer.monitoring import dashboard
+from code_analyzer.monitoring.broadcaster import LogBroadcaster
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def add_logs(session_factory, *messages):
+    session = session_factory()
+    session.add_all(LogEntry(level="INFO", message=m, crew_name="test") for m in messages)
+    session.commit()
+    session.close()
+
+@pytest.mark.asyncio
+async def test_only_new_rows_are_sent_once(session_factory):
+    add_logs(session_factory, "before")
+    queries = []
+    def counting_factory():
+        queries.append(1)
+        return session_factory()
+    broadcaster = LogBroadcaster(poll_interval=0.02, session_factory=counting_factory)
+    queues = [broadcaster.subscribe() for _ in range(20)]
+    await asyncio.sleep(0.05)
+
+    add_logs(session_factory, "first", "second")
+    messages = [await asyncio.wait_for(q.get(), 1) for q in queues]
+    assert all([e["message"] for e in m["data"]] == ["second", "first"] for m in messages)
+    await asyncio.sleep(0.1)
+    assert all(q.empty() for q in queues)
+    # One query per poll, not per subscriber
+    assert len(queries) < 20
+
+    for q in queues:
+        broadcaster.unsubscribe(q)
+    assert broadcaster._task is None
+
+@pytest.mark.asyncio
+async def test_resubscribing_skips_rows_logged_while_idle(session_factory):
+    broadcaster = LogBroadcaster(poll_interval=0.02, session_factory=session_factory)
+    queue = broadcaster.subscribe()
+    while broadcaster.last_id is None:
+        await asyncio.sleep(0.01)
+    broadcaster.unsubscribe(queue)
+
+    add_logs(session_factory, "while nobody watched")
+    queue = broadcaster.subscribe()
+    while broadcaster.last_id is None:
+        await asyncio.sleep(0.01)
+    add_logs(session_factory, "live")
+    message = await asyncio.wait_for(queue.get(), 1)
+    assert [e["message"] for e in message["data"]] == ["live"]
+    broadcaster.unsubscribe(queue)
+
+@pytest.mark.asyncio
+async def test_slow_clients_drop_oldest(session_factory):
+    broadcaster = LogBroadcaster(queue_size=2, session_factory=session_factory)
+    queue = broadcaster.subscribe()
+    for i in range(5):
+        broadcaster.publish({"type": "logs", "data": [i]})
+    assert broadcaster.dropped == 3
+    assert [queue.get_nowait()["data"] for _ in range(2)] == [[3], [4]]
+    broadcaster.unsubscribe(queue)
+
+def test_websocket_endpoint_streams_deltas(session_factory, monkeypatch):
+    monkeypatch.setattr(dashboard, "broadcaster",
+                        LogBroadcaster(poll_interval=0.02, session_factory=session_factory))
+    add_logs(session_factory, "old")
+    client = TestClient(dashboard.app)
+    with client.websocket_connect("/ws") as first, client.websocket_connect("/ws") as second:
+        while dashboard.broadcaster.last_id is None:
+            time.sleep(0.01)
+        add_logs(session_factory, "new")
+        for ws in (first, second):
+            assert [e["message"] for e in ws.receive_json()["data"]] == ["new"]
+    assert dashboard.broadcaster.subscriber_count == 0
@@ -0,0 +1,103 @@
+"""Tests for incremental analytics rollups."""
+import time
+import random
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+from fastapi.testclient import TestClient
+from code_analyzer.models import Base, LogEntry
+from code_analyzer.monitoring import dashboard
+from code_analyzer.monitoring.rollups import compact_rollups, rollup_summary
+
+START = datetime(2026, 10, 1, 8, 0)
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def add_random_logs(session, count, seed=0):
+    rng = random.Random(seed)
+    session.add_all(
+        LogEntry(
+            timestamp=START + timedelta(seconds=rng.randrange(6 * 3600)),
+            level=rng.choice(["INFO", "WARNING", "ERROR"]),
+            crew_name=rng.choice(["analyzer", "fixer", None]),
+            message="entry"
+        )
+        for _ in range(count)
+    )
+    session.commit()
+
+def direct_counts(session, start=None, end=None):
+    query = session.query(LogEntry.level, func.count(LogEntry.id))
+    if start:
+        query = query.filter(LogEntry.timestamp >= start)
+    if end:
+        query = query.filter(LogEntry.timestamp < end)
+    return dict(query.group_by(LogEntry.level).all())
+
+def test_compaction_is_incremental(session_factory):
+    session = session_factory()
+    add_random_logs(session, 500)
+    assert compact_rollups(session, batch_size=64) == 500
+    assert compact_rollups(session) == 0
+    add_random_logs(session, 200, seed=1)
+    assert compact_rollups(session) == 200
+
+    summary = rollup_summary(session)
+    assert summary["total"] == 700
+    assert summary["levels"] == direct_counts(session)
+    assert sum(count for _, count in summary["crews"]) == 700
+    assert "system" in dict(summary["crews"])
+
+@pytest.mark.parametrize("start,end", [
+    (START + timedelta(minutes=17), START + timedelta(hours=3, minutes=41)),
+    (START + timedelta(hours=1), START + timedelta(hours=2)),
+    (START + timedelta(minutes=5), START + timedelta(minutes=50)),
+    (None, START + timedelta(hours=2, minutes=30)),
+    (START + timedelta(hours=4, minutes=10), None),
+])
+def test_time_ranges_match_raw_counts(session_factory, start, end):
+    session = session_factory()
+    add_random_logs(session, 2000)
+    compact_rollups(session)
+    # Minute resolution: the raw query uses the same minute-aligned bounds
+    assert rollup_summary(session, start, end)["levels"] == direct_counts(session, start, end)
+
+def test_concurrent_compactors_do_not_double_count(session_factory):
+    first, second = session_factory(), session_factory()
+    add_random_logs(first, 300)
+    assert compact_rollups(first, batch_size=100) + compact_rollups(second, batch_size=100) == 300
+    assert rollup_summary(first)["total"] == 300
+
+def test_analytics_endpoint_reads_rollups(session_factory, monkeypatch):
+    rendered = {}
+    monkeypatch.setattr(dashboard, "get_session", lambda: session_factory())
+    monkeypatch.setattr(dashboard.templates, "TemplateResponse",
+                        lambda name, context: rendered.update(context) or {})
+    add_random_logs(session_factory(), 100)
+    start = START + timedelta(hours=1)
+    assert dashboard.compact_once() == 100
+    expected = direct_counts(session_factory(), start)
+    # The handler only reads buckets; later entries wait for the compactor
+    add_random_logs(session_factory(), 10, seed=1)
+
+    response = TestClient(dashboard.app).get("/analytics", params={"start": start.isoformat()})
+
+    assert response.status_code == 200
+    assert rendered["level_counts"] == expected
+    assert rendered["total_logs"] == sum(expected.values())
+    assert rendered["start"] == start
+
+def test_dashboard_compacts_in_background(session_factory, monkeypatch):
+    monkeypatch.setattr(dashboard, "get_session", lambda: session_factory())
+    add_random_logs(session_factory(), 50)
+    with TestClient(dashboard.app):
+        deadline = time.monotonic() + 10
+        while rollup_summary(session_factory())["total"] < 50 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert rollup_summary(session_factory())["total"] == 50
@@ -0,0 +1,107 @@
+"""Tests for the parallel log scanner."""
+import pytest
+from code_analyzer.utils import log_scanner
+from code_analyzer.utils.log_scanner import (
+    ReservoirSample, Segment, TopK, aggregate_segment, iter_log_records, read_segment_lines, iter_segments, scan_logs
+)
+
+
+def write_log(path, count, crew="AnalysisCrew"):
+    levels = ["INFO", "INFO", "WARNING", "ERROR"]
+    with open(path, "w") as f:
+        for i in range(count):
+            level = levels[i % len(levels)]
+            f.write(f"2024-01-01T00:00:{i % 60:02d} | {level} | message {i % 7} | "
+                    f'{{"crew_name": "{crew}"}}\n')
+        f.write("a line without fields\n")
+
+
+@pytest.fixture
+def log_files(tmp_path):
+    first, second = tmp_path / "a.log", tmp_path / "b.log"
+    write_log(first, 1000)
+    write_log(second, 500, crew="DocsCrew")
+    return [first, second]
+
+
+@pytest.mark.parametrize("segment_bytes", [37, 4096, 1 << 20])
+def test_segments_cover_every_line_once(log_files, segment_bytes):
+    lines = []
+    for segment in iter_segments(log_files, segment_bytes):
+        lines.extend(read_segment_lines(segment)[0])
+    expected = [line for path in log_files for line in path.read_text().splitlines()]
+    assert lines == expected
+
+
+def test_scan_logs_counts_match_serial_parse(log_files):
+    aggregate, throughput = scan_logs(log_files, workers=2, segment_bytes=2048)
+
+    assert aggregate.total_lines == 1502
+    assert aggregate.levels == {"INFO": 750, "WARNING": 375, "ERROR": 375}
+    assert aggregate.crews == {"AnalysisCrew": 1000, "DocsCrew": 500}
+    assert aggregate.bytes_scanned == sum(p.stat().st_size for p in log_files)
+    assert throughput > 0
+
+
+def test_samples_are_bounded(log_files):
+    aggregate, _ = scan_logs(log_files, workers=1, segment_bytes=1024)
+
+    errors = aggregate.samples["ERROR"]
+    assert errors.seen == 375
+    assert len(errors.items) == log_scanner.SAMPLE_SIZE
+    assert {message for message, _ in aggregate.top_messages["ERROR"].most_common()} <= {
+        f"message {i}" for i in range(7)
+    }
+
+
+def test_large_files_are_read_through_mmap(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_scanner, "MMAP_THRESHOLD", 0)
+    path = tmp_path / "big.log"
+    write_log(path, 300)
+
+    records = list(iter_log_records([path], workers=1, segment_bytes=500))
+    assert len(records) == 300
+    assert records[0] == ("2024-01-01T00:00:00", "INFO", "message 0", '{"crew_name": "AnalysisCrew"}')
+
+
+def test_reservoir_merge_keeps_size_and_weights():
+    left, right = ReservoirSample(size=10, seed=1), ReservoirSample(size=10, seed=2)
+    for i in range(1000):
+        left.add("left")
+    for i in range(10):
+        right.add("right")
+    left.merge(right)
+
+    assert left.seen == 1010
+    assert len(left.items) == 10
+    assert left.items.count("left") >= 8
+
+
+def test_topk_merge_keeps_heavy_hitters():
+    first, second = TopK(capacity=3), TopK(capacity=3)
+    for item in ["a"] * 50 + ["b", "c", "d", "e"]:
+        first.add(item)
+    for item in ["a"] * 20 + ["f"] * 30 + ["g", "h"]:
+        second.add(item)
+    first.merge(second)
+
+    top = dict(first.most_common(2))
+    assert list(top) == ["a", "f"]
+    assert len(first.counts) <= 3
+
+
+def test_aggregate_segment_parses_fields_inline(tmp_path):
+    path = tmp_path / "edge.log"
+    path.write_text(
+        't | ERROR |  boom  | {"crew_name": "A", "x": 1} | extra\n'
+        't | INFO | no crew | {"other": 1}\n'
+        't | INFO | bare key | crew_name\n'
+        't|WARNING|tight|{"crew_name":"B"}\n'
+        'too | few\n'
+    )
+    aggregate = aggregate_segment(Segment(str(path), 0, path.stat().st_size))
+    assert aggregate.total_lines == 5
+    assert aggregate.levels == {"INFO": 2, "ERROR": 1, "WARNING": 1}
+    assert aggregate.crews == {"A": 1, "B": 1}
+    assert aggregate.samples["ERROR"].items == ["boom"]
+    assert aggregate.samples["WARNING"].items == ["tight"]
@@ -0,0 +1,82 @@
+"""Tests for the batched database log sink."""
+import time
+import threading
+import pytest
+from loguru import logger
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.log_entry import LogEntry
+from code_analyzer.models.db_manager import DatabaseManager
+from code_analyzer.utils.logging import DatabaseLogHandler
+
+class RecordingDB:
+    """Stand-in for DatabaseManager that records batches."""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def save_log_entries(self, entries):
+        self.release.wait()
+        time.sleep(self.delay)
+        self.batches.append(list(entries))
+        return len(entries)
+
+@pytest.fixture
+def db_manager(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    Base.metadata.create_all(engine)
+    db = DatabaseManager()
+    db.session = sessionmaker(bind=engine)()
+    yield db
+    db.session.close()
+
+def test_records_are_batched_and_written_on_stop(db_manager):
+    handler = DatabaseLogHandler(batch_size=100, flush_interval=10, db=db_manager)
+    sink_id = logger.add(handler, level="INFO")
+    for i in range(250):
+        logger.bind(crew_name="test_crew").info(f"message {i}")
+    logger.remove(sink_id)
+
+    rows = db_manager.session.query(LogEntry).order_by(LogEntry.id).all()
+    assert len(rows) == 250
+    assert rows[0].message == "message 0"
+    assert rows[0].crew_name == "test_crew"
+    assert rows[0].extra_data["function"] == "test_records_are_batched_and_written_on_stop"
+    assert handler.written == 250
+
+def test_partial_batch_flushed_after_interval():
+    db = RecordingDB()
+    handler = DatabaseLogHandler(batch_size=100, flush_interval=0.05, db=db)
+    sink_id = logger.add(handler, level="INFO")
+    for i in range(3):
+        logger.info(f"message {i}")
+    time.sleep(0.3)
+    assert [len(b) for b in db.batches] == [3]
+    logger.remove(sink_id)
+
+def test_full_queue_drops_records():
+    db = RecordingDB()
+    db.release.clear()
+    handler = DatabaseLogHandler(batch_size=1, flush_interval=0.01, max_queue=5, db=db)
+    sink_id = logger.add(handler, level="INFO")
+    for i in range(50):
+        logger.info(f"message {i}")
+    assert handler.dropped > 0
+    db.release.set()
+    logger.remove(sink_id)
+    assert sum(len(b) for b in db.batches) + handler.dropped == 50
+
+def test_block_policy_keeps_every_record():
+    db = RecordingDB(delay=0.001)
+    handler = DatabaseLogHandler(batch_size=2, flush_interval=0.01, max_queue=2,
+                                 overflow="block", db=db)
+    sink_id = logger.add(handler, level="INFO")
+    for i in range(40):
+        logger.info(f"message {i}")
+    logger.remove(sink_id)
+    assert handler.dropped == 0
+    assert [e["message"] for b in db.batches for e in b] == [f"message {i}" for i in range(40)]
@@ -0,0 +1,127 @@
+"""Tests for the resumable log bulk loader."""
+import re
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from code_analyzer.models.base import Base
+from code_analyzer.models.log_entry import LogEntry, LogImportCheckpoint
+import migrate_logs
+from migrate_logs import extract_crew_name, migrate_logs as run_migration
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def write_lines(path, start, count, mode="w"):
+    with open(path, mode) as f:
+        for i in range(start, start + count):
+            f.write(f"2024-01-01 12:00:{i % 60:02d},{i % 1000:03d} | INFO     | "
+                    f"AnalysisCrew step {i}\n")
+
+
+def count_rows(session_factory):
+    with session_factory() as session:
+        return session.scalar(select(func.count()).select_from(LogEntry))
+
+
+def test_loads_in_chunks_and_is_idempotent(tmp_path, session_factory):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    write_lines(log_dir / "a.log", 0, 25)
+    (log_dir / "a.log").open("a").write("not a log line\n")
+
+    assert run_migration([log_dir], session_factory(), chunk_size=10) == 25
+    assert run_migration([log_dir], session_factory(), chunk_size=10) == 0
+    assert count_rows(session_factory) == 25
+
+    with session_factory() as session:
+        entry = session.scalars(select(LogEntry).order_by(LogEntry.id)).first()
+        assert entry.crew_name == "AnalysisCrew"
+        assert entry.message == "AnalysisCrew step 0"
+        assert entry.extra_data["source_file"] == str(log_dir / "a.log")
+
+
+def test_resumes_after_appends_and_partial_lines(tmp_path, session_factory):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    path = log_dir / "a.log"
+    write_lines(path, 0, 5)
+    path.open("a").write("2024-01-01 12:00:59,000 | INFO     | half written")
+
+    assert run_migration([log_dir], session_factory()) == 5
+    path.open("a").write(" line\n")
+    write_lines(path, 5, 3, mode="a")
+
+    assert run_migration([log_dir], session_factory()) == 4
+    assert count_rows(session_factory) == 9
+
+
+def test_crash_mid_file_keeps_committed_chunks(tmp_path, session_factory, monkeypatch):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    write_lines(log_dir / "a.log", 0, 30)
+
+    original = migrate_logs._flush
+    calls = []
+
+    def failing_flush(*args):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("disk full")
+        return original(*args)
+
+    monkeypatch.setattr(migrate_logs, "_flush", failing_flush)
+    run_migration([log_dir], session_factory(), chunk_size=10)
+    assert count_rows(session_factory) == 10
+
+    monkeypatch.setattr(migrate_logs, "_flush", original)
+    assert run_migration([log_dir], session_factory(), chunk_size=10) == 20
+    assert count_rows(session_factory) == 30
+
+
+def test_replaced_file_is_loaded_from_start(tmp_path, session_factory):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    write_lines(log_dir / "a.log", 0, 5)
+    run_migration([log_dir], session_factory())
+
+    write_lines(log_dir / "a.log", 100, 2)
+    assert run_migration([log_dir], session_factory()) == 2
+    with session_factory() as session:
+        checkpoint = session.scalars(select(LogImportCheckpoint)).one()
+        assert checkpoint.offset == (log_dir / "a.log").stat().st_size
+
+
+@pytest.mark.parametrize("message", [
+    "Started AnalysisCrew run",
+    "crew docs finished before TestCrew",
+    "the review crew failed",
+    "Running crew alpha after beta crew",
+    "nothing relevant",
+])
+def test_crew_pattern_matches_previous_priority(message):
+    expected = "unknown"
+    for pattern in [r'(\w+Crew)', r'crew (\w+)', r'(\w+) crew']:
+        if match := re.search(pattern, message, re.IGNORECASE):
+            expected = match.group(1)
+            break
+    assert extract_crew_name(message) == expected
+
+
+def test_caller_session_stays_open(tmp_path, session_factory):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    write_lines(log_dir / "a.log", 0, 3)
+    with session_factory() as session:
+        entry = LogEntry(level="INFO", message="before", crew_name="x")
+        session.add(entry)
+        session.commit()
+        assert run_migration([log_dir], session) == 3
+        # Not closed: objects loaded before are still attached
+        assert entry in session
+        assert session.scalar(select(func.count()).select_from(LogEntry)) == 4
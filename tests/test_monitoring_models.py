@@ -0,0 +1,37 @@
+"""Tests for the pooled monitoring database."""
+import threading
+import pytest
+from code_analyzer.monitoring import models
+from code_analyzer.monitoring.models import APICall
+
+@pytest.fixture
+def monitoring_db(tmp_path, monkeypatch):
+    models.dispose_engine()
+    monkeypatch.setattr(models, "DB_PATH", tmp_path / "monitoring.db")
+    yield
+    models.dispose_engine()
+
+def test_engine_and_schema_created_once(monitoring_db, monkeypatch):
+    calls = []
+    create_all = models.Base.metadata.create_all
+    monkeypatch.setattr(models.Base.metadata, "create_all",
+                        lambda *a, **kw: (calls.append(1), create_all(*a, **kw)))
+    engines = {id(models.get_session().get_bind()) for _ in range(5)}
+    assert len(engines) == 1
+    assert len(calls) == 1
+
+def test_sessions_are_scoped_per_thread(monitoring_db):
+    session = models.get_session()
+    assert models.get_session() is session
+    session.add(APICall(model="gpt-4", tokens=10, cost=0.1, endpoint="completion", success=1))
+    session.commit()
+
+    seen = []
+    def worker():
+        other = models.get_session()
+        seen.append((other is session, other.query(APICall).count()))
+        models.Session.remove()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert seen == [(False, 1)]
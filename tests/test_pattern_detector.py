@@ -0,0 +1,74 @@
+"""Tests for single-pass pattern detection."""
+import ast
+import pytest
+from code_analyzer.utils.ast_helpers import DetectionEngine
+from code_analyzer.crews.analysis_crews.pattern_detector import (
+    PatternDetector, CodeSmellDetector, DesignPatternDetector,
+    AntiPatternDetector, MetricsDetector
+)
+
+SAMPLE = '''
+class Config:
+    _instance = None
+
+    def getInstance(self):
+        return Config._instance
+
+class Outer:
+    class Builder:
+        def build_widget(self):
+            pass
+
+def wide(a, b, c, d, e, f):
+    if a:
+        for x in b:
+            pass
+'''
+
+def run_all(code: str):
+    detectors = [CodeSmellDetector(), DesignPatternDetector(),
+                 AntiPatternDetector(), MetricsDetector()]
+    DetectionEngine(detectors).run(ast.parse(code))
+    return detectors
+
+def test_design_patterns_credit_enclosing_classes():
+    """Nested evidence marks every enclosing class, in definition order."""
+    _, design, _, _ = run_all(SAMPLE)
+    found = [(m.name, m.location["class"]) for m in design.matches]
+    assert found == [
+        ("singleton", "Config"),
+        ("factory", "Outer"),
+        ("factory", "Builder"),
+    ]
+
+def test_smells_and_metrics():
+    smells, _, anti, metrics = run_all(SAMPLE)
+    assert [(m.name, m.location["function"]) for m in smells.matches] == [("too_many_parameters", "wide")]
+    assert anti.matches == []
+    assert metrics.results() == {
+        "class_count": 3,
+        "method_count": 3,
+        "complexity_score": 2.8,
+    }
+
+def test_god_class_detected():
+    body = "\n".join(f"    attr_{i} = {i}" for i in range(31))
+    _, _, anti, _ = run_all(f"class Huge:\n{body}\n")
+    assert [m.name for m in anti.matches] == ["god_class"]
+
+def test_engine_visits_each_node_once():
+    tree = ast.parse(SAMPLE)
+    seen = []
+    engine = DetectionEngine()
+    engine.register(ast.Name, lambda node, eng: seen.append(node))
+    engine.run(tree)
+    assert len(seen) == len([n for n in ast.walk(tree) if isinstance(n, ast.Name)])
+
+@pytest.mark.asyncio
+async def test_private_detectors_match_fused_pass():
+    detector = PatternDetector()
+    tree = ast.parse(SAMPLE)
+    smells = await detector._detect_code_smells(tree)
+    metrics = await detector._calculate_metrics(tree)
+    assert [m.name for m in smells] == ["too_many_parameters"]
+    assert metrics["class_count"] == 3
@@ -0,0 +1,50 @@
+"""Tests for packing small files into batched prompts."""
+import json
+from code_analyzer.utils.prompt_batcher import (
+    BatchItem, batch_limits, build_batch_prompt, pack_items, parse_batch_response
+)
+
+
+def items_of(*sizes):
+    # tokens = chars / 4 + 20 section overhead
+    return [BatchItem(n, f"f{n}.py", "x" * ((size - 20) * 4)) for n, size in enumerate(sizes)]
+
+
+def test_first_fit_decreasing_respects_budget_and_count():
+    batches = pack_items(items_of(60, 50, 40, 30, 30, 25, 150), budget=100)
+    sizes = [[item.tokens for item in batch] for batch in batches]
+    assert sizes == [[150], [60, 40], [50, 30], [30, 25]]
+    assert sorted(i.index for batch in batches for i in batch) == list(range(7))
+
+    limited = pack_items(items_of(21, 21, 21, 21, 21), budget=1000, max_items=2)
+    assert [len(batch) for batch in limited] == [2, 2, 1]
+
+
+def test_prompt_sections_round_trip_through_response():
+    items = items_of(30, 30)
+    ids, prompt = build_batch_prompt(items)
+    assert len(set(ids)) == 2
+    for section_id, item in zip(ids, items):
+        assert f"=== FILE {section_id}: {item.file} ===" in prompt
+        assert f"=== END FILE {section_id} ===" in prompt
+
+    response = json.dumps({"results": [
+        {"id": ids[1], "analysis": "second"},
+        {"id": ids[0], "analysis": "  "},
+        {"id": "other-0", "analysis": "stray"},
+    ]})
+    assert parse_batch_response(f"```json\n{response}\n```", ids) == {ids[1]: "second"}
+
+
+def test_malformed_responses_parse_to_nothing():
+    for text in ["not json", "[]", '{"results": {}}', '{"results": ["x"]}', ""]:
+        assert parse_batch_response(text, ["a-0"]) == {}
+
+
+def test_limits_come_from_config():
+    config = {
+        "model_tiers": {"fast": {"batch_token_budget": 1234}},
+        "analysis_phases": {"initial_scan": {"batch_size": 7}}
+    }
+    assert batch_limits(config, "fast") == (1234, 7)
+    assert batch_limits({}, "depth") == (8000, 50)
@@ -0,0 +1,46 @@
+"""Tests for hot-table indexes and query plans."""
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+from alembic import command
+from alembic.config import Config
+from code_analyzer.models.base import Base
+from code_analyzer.models.db_manager import DatabaseManager
+from code_analyzer.cli.commands import db as db_commands
+
+@pytest.fixture
+def db_manager(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    db = DatabaseManager()
+    db.session = sessionmaker(bind=engine)()
+    yield db
+    db.session.close()
+
+def test_hot_queries_use_indexes(db_manager):
+    plans = db_manager.explain_hot_queries()
+    for name, steps in plans.items():
+        scans = [s for s in steps if s.startswith("SCAN") or s.startswith("SEARCH")]
+        assert scans and all("INDEX" in s or "PRIMARY KEY" in s for s in scans), (name, steps)
+    assert any("idx_log_entries_timestamp" in s for s in plans["dashboard.recent_logs"])
+    assert any("idx_crew_outputs_crew_name_timestamp" in s for s in plans["manager.crew_outputs"])
+
+def test_explain_command_flags_full_scans(db_manager, monkeypatch):
+    monkeypatch.setattr(db_commands, "DatabaseManager", lambda: db_manager)
+    db_manager.session.execute(text("DROP INDEX idx_log_entries_timestamp"))
+    result = CliRunner().invoke(db_commands.db, ["explain"])
+    assert result.exit_code == 0
+    assert "dashboard.recent_logs" in result.output
+    assert "⚠️ SCAN log_entries" in result.output
+
+def test_migration_adds_indexes(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    monkeypatch.setenv("DATABASE_URL", url)
+    config = Config("alembic.ini")
+    command.upgrade(config, "head")
+    indexes = {i["name"] for i in inspect(create_engine(url)).get_indexes("crew_outputs")}
+    assert "idx_crew_outputs_crew_name_timestamp" in indexes
+    command.downgrade(config, "initial_setup")
+    indexes = {i["name"] for i in inspect(create_engine(url)).get_indexes("crew_outputs")}
+    assert "idx_crew_outputs_crew_name_timestamp" not in indexes
@@ -0,0 +1,102 @@
+"""Tests for the shared token-bucket rate limiter."""
+import json
+import multiprocessing
+import pytest
+from code_analyzer.utils.rate_limits import RateLimit, TokenBucketLimiter, limits_from_config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_limiter(tmp_path, clock, **limits):
+    return TokenBucketLimiter(limits, path=tmp_path / "limits.db", clock=clock)
+
+
+def test_limits_cover_every_configured_provider():
+    with open("configs/ai_models.json") as f:
+        limits = limits_from_config(json.load(f))
+    assert limits["openai/gpt-3.5-turbo"].tokens_per_minute == 3500
+    assert limits["anthropic/claude-instant"].tokens_per_minute == 4000
+    # Listed in two tiers: the strictest limit applies
+    assert limits["openai/gpt-4"].tokens_per_minute == 150
+    assert limits_from_config({"model_tiers": {"fast": {"providers": [
+        {"name": "x", "model": "m", "rate_limit": 30, "rate_limit_unit": "requests_per_minute"}
+    ]}}}) == {"x/m": RateLimit(requests_per_minute=30)}
+
+
+def test_buckets_refill_continuously(tmp_path, clock):
+    limiter = make_limiter(tmp_path, clock, m=RateLimit(requests_per_minute=6, tokens_per_minute=600))
+
+    assert limiter.try_acquire("m", tokens=500) == 0
+    # 100 tokens left; 300 more take 30s at 10 tokens/s
+    assert limiter.try_acquire("m", tokens=400) == pytest.approx(30)
+    clock.now += 30
+    assert limiter.try_acquire("m", tokens=400) == 0
+
+    # The request bucket refilled to 6 during the wait
+    for _ in range(5):
+        assert limiter.try_acquire("m") == 0
+    # Request bucket empty: one request refills every 10s
+    assert limiter.wait_time("m") == pytest.approx(10)
+    assert limiter.try_acquire("unlimited", tokens=10 ** 9) == 0
+
+
+def test_oversized_request_waits_for_full_bucket_then_goes_into_debt(tmp_path, clock):
+    limiter = make_limiter(tmp_path, clock, m=RateLimit(tokens_per_minute=60))
+    assert limiter.try_acquire("m", tokens=120) == 0
+    assert limiter.wait_time("m", tokens=1) == pytest.approx(61)
+
+    limiter.consume("m", 30)
+    assert limiter.wait_time("m", tokens=0) == pytest.approx(90)
+
+
+def test_instances_share_state_through_the_file(tmp_path, clock):
+    first = make_limiter(tmp_path, clock, m=RateLimit(requests_per_minute=2))
+    second = make_limiter(tmp_path, clock, m=RateLimit(requests_per_minute=2))
+    assert first.try_acquire("m") == 0
+    assert second.try_acquire("m") == 0
+    assert first.try_acquire("m") > 0
+
+
+def _acquire_all(path, attempts):
+    limiter = TokenBucketLimiter({"m": RateLimit(requests_per_minute=20)}, path=path)
+    return sum(limiter.try_acquire("m") == 0 for _ in range(attempts))
+
+
+def test_parallel_processes_never_overshoot(tmp_path):
+    path = tmp_path / "limits.db"
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        admitted = pool.starmap(_acquire_all, [(path, 15)] * 4)
+    # 20 in the initial burst, plus at most a little refill while running
+    assert 20 <= sum(admitted) <= 22
+
+
+@pytest.mark.asyncio
+async def test_crew_rate_limiter_waits_on_shared_bucket(tmp_path, clock, monkeypatch):
+    # Imported here so spawned workers above don't load the crews package
+    from code_analyzer.crews.rate_limiter import RateLimiter
+    limiter = make_limiter(tmp_path, clock)
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    monkeypatch.setattr("asyncio.sleep", fake_sleep)
+    crew_limiter = RateLimiter("crew", calls_per_minute=2, limiter=limiter)
+    for _ in range(3):
+        await crew_limiter.wait()
+
+    assert sleeps == [pytest.approx(30)]
+    crew_limiter.track_usage(50)
+    assert crew_limiter.get_usage()["total_tokens"] == 50
@@ -0,0 +1,39 @@
+"""Tests for the background resource sampler."""
+import time
+from code_analyzer.utils.resource_monitor import ResourceMonitor, ResourceSampler
+
+def test_percentiles_over_window():
+    sampler = ResourceSampler(interval=1, window_seconds=100)
+    now = time.monotonic()
+    for i in range(1, 101):
+        sampler.record({"timestamp": now, "cpu_percent": float(i), "memory_mb": 10.0, "open_fds": 3})
+    assert sampler.percentile("cpu_percent", 50) == 50.0
+    assert sampler.percentile("cpu_percent", 95) == 95.0
+    assert sampler.snapshot()["cpu_percent"] == 100.0
+
+def test_window_is_bounded_and_time_filtered():
+    sampler = ResourceSampler(interval=1, window_seconds=5)
+    now = time.monotonic()
+    for i in range(10):
+        sampler.record({"timestamp": now - 100 + i, "cpu_percent": 1.0, "memory_mb": 1.0, "open_fds": 1})
+    assert len(sampler.window()) == 5
+    assert sampler.window(seconds=10) == []
+    # Without recent samples the latest snapshot is used
+    assert sampler.percentile("cpu_percent", 95, seconds=10) == 1.0
+
+def test_check_resources_does_not_block():
+    sampler = ResourceSampler(interval=0.01)
+    monitor = ResourceMonitor(sampler=sampler)
+    sampler.start()
+    try:
+        time.sleep(0.1)
+        start = time.perf_counter()
+        for _ in range(1000):
+            readings = monitor.check_resources()
+        assert time.perf_counter() - start < 0.1
+        assert readings["memory_mb"] > 0
+        assert readings["open_fds"] > 0
+        assert len(sampler.window()) > 1
+    finally:
+        sampler.stop()
+    assert not sampler.running
@@ -0,0 +1,30 @@
+"""Tests for the SQLite connection profile."""
+from sqlalchemy import create_engine, text
+from code_analyzer.models.sqlite_profile import apply_sqlite_profile, load_profile
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+def test_profile_applied_on_connect(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    apply_sqlite_profile(engine)
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "busy_timeout") == 5000
+    assert pragma(engine, "temp_store") == 2  # MEMORY
+    engine.dispose()
+
+def test_environment_and_overrides(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_SYNCHRONOUS", "FULL")
+    assert load_profile({"busy_timeout": 100})["synchronous"] == "FULL"
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    apply_sqlite_profile(engine, {"busy_timeout": 100})
+    assert pragma(engine, "synchronous") == 2  # FULL
+    assert pragma(engine, "busy_timeout") == 100
+    engine.dispose()
+
+def test_profile_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("SQLITE_PROFILE", "off")
+    assert load_profile() == {}